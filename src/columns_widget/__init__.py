@@ -9,19 +9,14 @@ import logging
 from tilematch_tools.core import BoardFactory
 from tilematch_tools.core.game_factory import Game, GameFactory
 
-from .columns import ColumnsGameState, ColumnsGameLoop
-from .game_model import ColumnsBoard, ColumnsScoring
+from .columns import ColumnsGameState, CompactFallerGameState, ColumnsGameLoop
+from .game_model import TRACER, ColumnsBoard, CompactColumnsBoard, ColumnsFaller, CompactFaller, ColumnsScoring, FallerQueue, MATCHERS
 from .game_view import ColumnsView
 
 LOGGER = logging.getLogger(__name__)
-LOG_HANDLER = logging.StreamHandler()
-LOG_FORMAT = logging.Formatter('[%(asctime)s|%(name)s|%(levelname)s] - %(message)s')
+LOG_FORMAT = '[%(asctime)s|%(name)s|%(levelname)s] - %(message)s'
 
-LOGGER.setLevel(logging.INFO)
-LOG_HANDLER.setLevel(logging.INFO)
-
-LOG_HANDLER.setFormatter(LOG_FORMAT)
-LOGGER.addHandler(LOG_HANDLER)
+LOGGER.addHandler(logging.NullHandler())
 
 __version__ = (0, 0, 1)
 
@@ -32,9 +27,65 @@ class ColumnsGame(Game):
 
 class ColumnsGameFactory(GameFactory):
     @staticmethod
-    def create_game() -> ColumnsGame:
-        board = BoardFactory.create_board(ColumnsBoard, ColumnsBoard.COLUMNS_BOARD_WIDTH, ColumnsBoard.COLUMNS_BOARD_HEIGHT)
+    def create_state(
+            compact: bool = False,
+            matcher: str = 'dirty',
+            seed: int = None,
+            lookahead: int = 1,
+            width: int = ColumnsBoard.COLUMNS_BOARD_WIDTH,
+            height: int = ColumnsBoard.COLUMNS_BOARD_HEIGHT
+            ) -> ColumnsGameState:
+        """
+            Create the state of a new game of columns
+            :arg compact: store the board and the falling faller as color codes rather than tile objects
+            :arg matcher: name of the match backend, one of MATCHERS
+            :arg seed: seed of the game's fallers, chosen at random if not given
+            :arg lookahead: number of upcoming fallers to keep ready to preview
+            :arg width: number of columns on the board
+            :arg height: number of rows on the board
+            :arg type: bool
+            :arg type: str
+            :arg type: int
+            :arg type: int
+            :arg type: int
+            :arg type: int
+            :returns: a fresh game state
+            :rtype: ColumnsGameState
+        """
+        board_type = CompactColumnsBoard if compact else ColumnsBoard
+        board = BoardFactory.create_board(board_type, width, height)
         score = ColumnsScoring()
-        state = ColumnsGameState(board, score)
+        faller_type = CompactFaller if compact else ColumnsFaller
+        fallers = FallerQueue(seed, lookahead, width, faller_type=faller_type, height=height)
+        state_type = CompactFallerGameState if compact else ColumnsGameState
+        return state_type(board, score, MATCHERS[matcher], fallers)
+
+    @staticmethod
+    def create_game(
+            compact: bool = False,
+            matcher: str = 'dirty',
+            seed: int = None,
+            lookahead: int = 1,
+            width: int = ColumnsBoard.COLUMNS_BOARD_WIDTH,
+            height: int = ColumnsBoard.COLUMNS_BOARD_HEIGHT
+            ) -> ColumnsGame:
+        """
+            Create a new game of columns
+            :arg compact: store the board and the falling faller as color codes rather than tile objects
+            :arg matcher: name of the match backend, one of MATCHERS
+            :arg seed: seed of the game's fallers, chosen at random if not given
+            :arg lookahead: number of upcoming fallers to preview
+            :arg width: number of columns on the board
+            :arg height: number of rows on the board
+            :arg type: bool
+            :arg type: str
+            :arg type: int
+            :arg type: int
+            :arg type: int
+            :arg type: int
+            :returns: a game ready to be hosted by the game engine
+            :rtype: ColumnsGame
+        """
+        state = ColumnsGameFactory.create_state(compact, matcher, seed, lookahead, width, height)
         return ColumnsGame(state, ColumnsGameLoop, ColumnsView, ColumnsGame.TICK)
  
@@ -0,0 +1,168 @@
+"""
+    :module_name: batch
+    :module_summary: run many seeded headless games across processes and aggregate their results
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+import csv
+import json
+import math
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from . import ColumnsGameFactory
+from .game_model import ColumnsBoard
+from .headless import HeadlessGameLoop, random_input_source
+
+GameResult = namedtuple('GameResult', ['seed', 'points', 'fallers', 'matches', 'chain_depth', 'ticks'])
+
+
+def play_game(
+        seed: int,
+        compact: bool = False,
+        matcher: str = 'dirty',
+        max_ticks: int = None,
+        random_inputs: bool = False,
+        width: int = ColumnsBoard.COLUMNS_BOARD_WIDTH,
+        height: int = ColumnsBoard.COLUMNS_BOARD_HEIGHT
+        ) -> GameResult:
+    """
+        Play one seeded game headlessly
+        :arg seed: seed of the game, the same seed always plays the same game
+        :arg compact: store the board and the falling faller as color codes rather than tile objects
+        :arg matcher: name of the match backend
+        :arg max_ticks: optional limit on the number of ticks to run
+        :arg random_inputs: give the game one random input per tick
+        :arg width: number of columns on the board
+        :arg height: number of rows on the board
+        :arg type: int
+        :arg type: bool
+        :arg type: str
+        :arg type: int
+        :arg type: bool
+        :arg type: int
+        :arg type: int
+        :returns: the results of the game
+        :rtype: GameResult
+    """
+    state = ColumnsGameFactory.create_state(compact, matcher, seed, width=width, height=height)
+    source = random_input_source(-seed - 1) if random_inputs else None
+    loop = HeadlessGameLoop(state, input_source=source)
+    loop.run(max_ticks)
+    return GameResult(seed, state.points, state.fallers_placed, loop.matches, loop.longest_chain, loop.ticks)
+
+
+def run_batch(seeds, workers: int = None, **options):
+    """
+        Play a seeded game for every seed, spread across a pool of processes
+        :arg seeds: seeds of the games to play
+        :arg workers: number of processes to use, defaults to one per cpu. 1 plays every game in this process
+        :arg options: options passed along to play_game
+        :arg type: iterable of int
+        :arg type: int
+        :arg type: dict
+        :returns: results of each game in the order of the seeds given
+        :rtype: generator of GameResult
+    """
+    play = partial(play_game, **options)
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(play, seeds)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(play, seeds, chunksize=max(1, len(seeds) // (workers * 4)))
+
+
+class BatchSummary:
+    """
+        Class aggregating the results of many games into summary statistics
+    """
+    FIELDS = GameResult._fields[1:]
+
+    def __init__(self):
+        self._count = 0
+        self._totals = dict.fromkeys(self.FIELDS, 0)
+        self._squares = dict.fromkeys(self.FIELDS, 0)
+        self._lows = {}
+        self._highs = {}
+
+    def add(self, result: GameResult) -> None:
+        """
+            Include the result of a game in the summary
+            :arg result: the result to include
+            :arg type: GameResult
+            :returns: nothing
+            :rtype: None
+        """
+        self._count += 1
+        for field in self.FIELDS:
+            value = getattr(result, field)
+            self._totals[field] += value
+            self._squares[field] += value * value
+            self._lows[field] = min(self._lows.get(field, value), value)
+            self._highs[field] = max(self._highs.get(field, value), value)
+
+    @property
+    def count(self) -> int:
+        """
+            View of the number of games summarized
+            :rtype: int
+        """
+        return self._count
+
+    def statistics(self) -> dict:
+        """
+            Summary statistics of each result field
+            :returns: mean, stdev, min, max and total for each field
+            :rtype: dict
+        """
+        stats = {}
+        for field in self.FIELDS:
+            total = self._totals[field]
+            mean = total / self._count if self._count else 0.0
+            variance = self._squares[field] / self._count - mean * mean if self._count else 0.0
+            stats[field] = {
+                    'mean': mean,
+                    'stdev': math.sqrt(max(variance, 0.0)),
+                    'min': self._lows.get(field, 0),
+                    'max': self._highs.get(field, 0),
+                    'total': total
+                    }
+        return stats
+
+
+class ResultWriter:
+    """
+        Class streaming per-game results to a CSV or JSONL file
+    """
+
+    def __init__(self, stream, fmt: str = 'csv'):
+        """
+            :arg stream: text stream results are written to
+            :arg fmt: 'csv' or 'jsonl'
+            :arg type: file
+            :arg type: str
+        """
+        self._stream = stream
+        self._csv = None
+        if fmt == 'csv':
+            self._csv = csv.writer(stream)
+            self._csv.writerow(GameResult._fields)
+        elif fmt != 'jsonl':
+            raise ValueError(f'Unknown result format {fmt}')
+
+    def write(self, result: GameResult) -> None:
+        """
+            Write the result of a game
+            :arg result: the result to write
+            :arg type: GameResult
+            :returns: nothing
+            :rtype: None
+        """
+        if self._csv:
+            self._csv.writerow(result)
+        else:
+            self._stream.write(json.dumps(result._asdict()) + '\n')
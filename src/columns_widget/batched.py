@@ -0,0 +1,501 @@
+"""
+    :module_name: batched
+    :module_summary: many columns games stored as one NumPy array and stepped in lockstep
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+import logging
+
+try:
+    import numpy as np
+except ImportError as err:
+    raise ImportError('The batched columns backend needs numpy, install it with pip install numpy') from err
+
+from .game_model import ColumnsBoard, ColumnsColor, ColumnsScoring, CompactFaller, FallerQueue, \
+                        ThreeFoldNorth, ThreeFoldSouth, ThreeFoldEast, ThreeFoldWest, \
+                        ThreeFoldNorthEast, ThreeFoldNorthWest, ThreeFoldSouthEast, ThreeFoldSouthWest
+from .game_model.columns_tile import NULL_CODE
+from .game_model.faller_source import batch_draws
+from .game_model.match_rules import ThreeFoldMatch
+from .headless import ColumnsInput
+
+LOGGER = logging.getLogger(__name__)
+
+MATCH_RULES = (
+        ThreeFoldNorth,
+        ThreeFoldSouth,
+        ThreeFoldEast,
+        ThreeFoldWest,
+        ThreeFoldNorthWest,
+        ThreeFoldNorthEast,
+        ThreeFoldSouthWest,
+        ThreeFoldSouthEast
+        )
+
+# action codes given to step, 0 gives no input
+NO_INPUT = 0
+INPUT_CODES = {action: code for code, action in enumerate(ColumnsInput, 1)}
+HARD_DROP = INPUT_CODES[ColumnsInput.HARD_DROP]
+SHIFTS = {INPUT_CODES[ColumnsInput.SHIFT_LEFT]: -1, INPUT_CODES[ColumnsInput.SHIFT_RIGHT]: 1}
+ROTATIONS = {INPUT_CODES[ColumnsInput.ROTATE_UP]: -1, INPUT_CODES[ColumnsInput.ROTATE_DOWN]: 1}
+
+
+def match_axes(match_rules: tuple = MATCH_RULES) -> dict:
+    """
+        Group match rules by the line they scan along. A streak found by a rule from one end
+        is found by the rule scanning the opposite way from the other end
+        :arg match_rules: the match rule classes
+        :arg type: tuple
+        :returns: the number of rules scanning along each (dx, dy) line, dx and dy never both pointing back
+        :rtype: dict
+    """
+    axes = {}
+    for match_rule in match_rules:
+        dx, dy = match_rule().scan_delta
+        if dx < 0 or (dx == 0 and dy < 0):
+            dx, dy = -dx, -dy
+        axes[dx, dy] = axes.get((dx, dy), 0) + 1
+    return axes
+
+
+def _windows(shape: tuple, delta: (int, int), streak: int):
+    """
+        Helper method for slicing the cells each member of a streak along a line covers
+        :arg shape: (boards, rows, columns) of the cells
+        :arg delta: x and y step between members, x never negative
+        :arg streak: number of members in a streak
+        :returns: for each member, the (row slice, column slice) of the member of every streak start,
+            or nothing if the board is too small to hold a streak along the line
+        :rtype: list
+    """
+    dx, dy = delta
+    span = streak - 1
+    rows, cols = shape[1], shape[2]
+    y_low, y_high = max(0, -span * dy), rows - max(0, span * dy)
+    x_low, x_high = 0, cols - span * dx
+    if y_high <= y_low or x_high <= x_low:
+        return []
+    return [
+            (slice(y_low + i * dy, y_high + i * dy), slice(x_low + i * dx, x_high + i * dx))
+            for i in range(streak)
+            ]
+
+
+def find_matches(cells, match_rules: tuple = MATCH_RULES) -> tuple:
+    """
+        Find the matches on every board at once by comparing shifted views of the cells,
+        locating what ThreeFoldMatch rules locate
+        :arg cells: (boards, rows, columns) color codes, row 0 being the bottom
+        :arg match_rules: the match rule classes to check
+        :arg type: numpy.ndarray
+        :arg type: tuple
+        :returns: a mask of the cells in a match and the number of matches located on each board
+        :rtype: tuple
+    """
+    streak = ThreeFoldMatch.STREAK
+    matched = np.zeros(cells.shape, dtype=bool)
+    counts = np.zeros(cells.shape[0], dtype=np.int64)
+    for delta, rules in match_axes(match_rules).items():
+        windows = _windows(cells.shape, delta, streak)
+        if not windows:
+            continue
+        first = cells[(slice(None), *windows[0])]
+        starts = first != NULL_CODE
+        for rows, cols in windows[1:]:
+            starts &= cells[:, rows, cols] == first
+        counts += rules * starts.sum(axis=(1, 2))
+        for rows, cols in windows:
+            matched[:, rows, cols] |= starts
+    return matched, counts
+
+
+def collapse(cells) -> None:
+    """
+        Let every tile on every board fall as far as it can, as AbsoluteDescent does,
+        by stably moving the tiles of each column below its empty cells
+        :arg cells: (boards, rows, columns) color codes, row 0 being the bottom, changed in place
+        :arg type: numpy.ndarray
+        :returns: nothing
+        :rtype: None
+    """
+    order = np.argsort(cells == NULL_CODE, axis=1, kind='stable')
+    cells[...] = np.take_along_axis(cells, order, axis=1)
+
+
+class BatchedColumns:
+    """
+        Class representing many headless columns games held in NumPy arrays: the boards as one
+        (boards, rows, columns) array of color codes and each faller as a file, a row, a rotation and
+        three codes. Each step runs a tick of every game at once, with the rules of a
+        CompactFallerGameState driven by a HeadlessGameLoop, so game k plays what a HeadlessGameLoop
+        would play with the k-th seed and the same inputs
+    """
+
+    def __init__(
+            self,
+            seeds,
+            width: int = ColumnsBoard.COLUMNS_BOARD_WIDTH,
+            height: int = ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+            match_rules: tuple = MATCH_RULES,
+            scoring: ColumnsScoring = None
+            ):
+        """
+            :arg seeds: seed of the fallers of each game
+            :arg width: number of columns on every board
+            :arg height: number of rows on every board
+            :arg match_rules: the match rule classes to check
+            :arg scoring: scoring deciding the chain multiplier of matches, a ColumnsScoring if not given
+            :arg type: iterable of int
+            :arg type: int
+            :arg type: int
+            :arg type: tuple
+            :arg type: ColumnsScoring
+        """
+        seeds = list(seeds)
+        count = len(seeds)
+        self._width = width
+        self._height = height
+        self._match_rules = match_rules
+        self._scoring = scoring or ColumnsScoring()
+        self._seeds = seeds
+        self._batch = FallerQueue.BATCH
+        # draws of the batch each game's current faller comes from and of the batch after it, alternating slots
+        self._draws = np.zeros((count, 2, self._batch), dtype=np.int64)
+        self._drawn = np.zeros(count, dtype=np.int64)
+        self._cells = np.zeros((count, height, width), dtype=np.uint8)
+        self._active = np.zeros(count, dtype=bool)
+        self._files = np.zeros(count, dtype=np.int64)
+        self._rows = np.zeros(count, dtype=np.int64)
+        self._rotations = np.zeros(count, dtype=np.int64)
+        self._codes = np.zeros((count, CompactFaller.SIZE), dtype=np.uint8)
+        self._next_files = np.zeros(count, dtype=np.int64)
+        self._next_codes = np.zeros((count, CompactFaller.SIZE), dtype=np.uint8)
+        self._gameover = np.zeros(count, dtype=bool)
+        self._points = np.zeros(count, dtype=np.int64)
+        self._fallen = np.zeros(count, dtype=np.int64)
+        self._matches = np.zeros(count, dtype=np.int64)
+        self._longest_chain = np.zeros(count, dtype=np.int64)
+        self._ticks = np.zeros(count, dtype=np.int64)
+        self._match_points = ThreeFoldNorth().point_value * ThreeFoldMatch.STREAK
+        for game in range(count):
+            self._load_batch(game, 0)
+
+    @property
+    def cells(self):
+        """
+            View of the color code of every cell of every board, row 0 being the bottom
+            :rtype: numpy.ndarray of shape (boards, rows, columns)
+        """
+        return self._cells
+
+    @property
+    def size(self) -> int:
+        """
+            View of the number of games
+            :rtype: int
+        """
+        return len(self._seeds)
+
+    @property
+    def seeds(self) -> list:
+        """
+            View of the seed of the fallers of each game
+            :rtype: list of int
+        """
+        return self._seeds
+
+    @property
+    def active(self):
+        """
+            View of which games have a faller falling
+            :rtype: numpy.ndarray of bool
+        """
+        return self._active
+
+    @property
+    def faller_files(self):
+        """
+            View of the file of each game's faller
+            :rtype: numpy.ndarray of int
+        """
+        return self._files
+
+    @property
+    def faller_rows(self):
+        """
+            View of the row of the bottom member of each game's faller
+            :rtype: numpy.ndarray of int
+        """
+        return self._rows
+
+    @property
+    def faller_codes(self):
+        """
+            View of the color code of each member of each game's faller from the bottom up, as currently rotated
+            :rtype: numpy.ndarray of shape (boards, 3)
+        """
+        members = np.arange(CompactFaller.SIZE)
+        rotated = (members[None, :] + self._rotations[:, None]) % CompactFaller.SIZE
+        return np.take_along_axis(self._codes, rotated, axis=1)
+
+    @property
+    def next_files(self):
+        """
+            View of the file of the faller each game draws next, set once the game's current faller is drawn
+            :rtype: numpy.ndarray of int
+        """
+        return self._next_files
+
+    @property
+    def next_codes(self):
+        """
+            View of the color code of each member of the faller each game draws next, from the bottom up
+            :rtype: numpy.ndarray of shape (boards, 3)
+        """
+        return self._next_codes
+
+    @property
+    def gameover(self):
+        """
+            View of which games are over
+            :rtype: numpy.ndarray of bool
+        """
+        return self._gameover
+
+    @property
+    def points(self):
+        """
+            View of the points each game scored
+            :rtype: numpy.ndarray of int
+        """
+        return self._points
+
+    @property
+    def fallers_placed(self):
+        """
+            View of the number of fallers that landed in each game
+            :rtype: numpy.ndarray of int
+        """
+        return self._fallen
+
+    @property
+    def matches(self):
+        """
+            View of the number of matches cleared in each game
+            :rtype: numpy.ndarray of int
+        """
+        return self._matches
+
+    @property
+    def longest_chain(self):
+        """
+            View of the deepest chain resolved in each game
+            :rtype: numpy.ndarray of int
+        """
+        return self._longest_chain
+
+    @property
+    def ticks(self):
+        """
+            View of the number of ticks each game has run
+            :rtype: numpy.ndarray of int
+        """
+        return self._ticks
+
+    def step(self, actions = None):
+        """
+            Give every running game its input then run one tick of each, resolving any chain a landing caused
+            :arg actions: action code of each game, NO_INPUT or a value of INPUT_CODES, no input if not given
+            :arg type: array-like of int
+            :returns: which games are still running
+            :rtype: numpy.ndarray of bool
+        """
+        running = ~self._gameover
+        if actions is not None:
+            self._apply(np.asarray(actions) * running)
+
+        falling = running & self._active
+        can_fall = np.zeros_like(falling)
+        can_fall[falling] = self._can_hold(np.flatnonzero(falling), self._files[falling], self._rows[falling] - 1)
+        self._rows[can_fall] -= 1
+
+        self._land(np.flatnonzero(falling & ~can_fall))
+        self._spawn(np.flatnonzero(running & ~self._active & ~falling))
+
+        self._ticks[running] += 1
+        return ~self._gameover
+
+    def reset(self, games, seeds) -> None:
+        """
+            Start new games in place of others, reusing their arrays
+            :arg games: index of each game replaced
+            :arg seeds: seed of the fallers of each new game
+            :arg type: array-like of int
+            :arg type: iterable of int
+            :returns: nothing
+            :rtype: None
+        """
+        games = np.asarray(games, dtype=np.int64)
+        for game, seed in zip(games.tolist(), seeds):
+            self._seeds[game] = seed
+            self._load_batch(game, 0)
+        self._cells[games] = NULL_CODE
+        for counters in (self._active, self._gameover, self._rotations, self._next_files, self._next_codes, self._drawn,
+                         self._points, self._fallen, self._matches, self._longest_chain, self._ticks):
+            counters[games] = 0
+
+    def run(self, max_ticks: int = None, input_source = None) -> int:
+        """
+            Step every game until all of them are over
+            :arg max_ticks: optional limit on the number of steps
+            :arg input_source: optional callable taking this batch and returning the actions of the next step
+            :arg type: int
+            :arg type: callable
+            :returns: the number of steps run
+            :rtype: int
+        """
+        steps = 0
+        while (max_ticks is None or steps < max_ticks) and not self._gameover.all():
+            self.step(input_source(self) if input_source else None)
+            steps += 1
+        LOGGER.debug('Batched games stopped after %d steps', steps)
+        return steps
+
+    def _can_hold(self, games, files, rows):
+        """
+            Helper method for checking whether cells can hold a falling tile. Rows above the board are staged
+            and can always hold one
+            :arg games: index of the game of each cell
+            :arg files: file of each cell
+            :arg rows: row of each cell
+            :returns: whether each cell can hold a tile
+            :rtype: numpy.ndarray of bool
+        """
+        inside = (files >= 1) & (files <= self._width) & (rows >= 1)
+        on_board = inside & (rows <= self._height)
+        free = np.ones(len(games), dtype=bool)
+        free[on_board] = self._cells[games[on_board], rows[on_board] - 1, files[on_board] - 1] == NULL_CODE
+        return inside & free
+
+    def _apply(self, actions) -> None:
+        """
+            Helper method for moving the fallers the actions ask to, as CompactFallerGameState does
+            :arg actions: action code of each game, games without a faller ignore theirs
+            :returns: nothing
+            :rtype: None
+        """
+        actions = np.where(self._active, actions, NO_INPUT)
+        for code, step in ROTATIONS.items():
+            rotating = actions == code
+            self._rotations[rotating] = (self._rotations[rotating] + step) % CompactFaller.SIZE
+        for code, step in SHIFTS.items():
+            games = np.flatnonzero(actions == code)
+            files, rows = self._files[games] + step, self._rows[games]
+            allowed = np.ones(len(games), dtype=bool)
+            for member in range(CompactFaller.SIZE):
+                allowed &= self._can_hold(games, files, rows + member)
+            self._files[games[allowed]] += step
+        self._hard_drop(np.flatnonzero(actions == HARD_DROP))
+
+    def _hard_drop(self, games) -> None:
+        """
+            Helper method for moving fallers down onto the top tile of their file, so they land on this step's tick
+            :arg games: index of each game whose faller drops
+            :returns: nothing
+            :rtype: None
+        """
+        if not len(games):
+            return
+        filled = self._cells[games, :, self._files[games] - 1] != NULL_CODE
+        tops = np.where(filled.any(axis=1), self._height - np.argmax(filled[:, ::-1], axis=1), 0)
+        self._rows[games] = np.minimum(self._rows[games], tops + 1)
+
+    def _land(self, games) -> None:
+        """
+            Helper method for placing the fallers that cannot fall any further, then resolving their boards
+            :arg games: index of each game whose faller landed
+            :returns: nothing
+            :rtype: None
+        """
+        if not len(games):
+            return
+        codes = self.faller_codes[games]
+        for member in range(CompactFaller.SIZE):
+            rows = self._rows[games] + member
+            visible = rows <= self._height
+            self._cells[games[visible], rows[visible] - 1, self._files[games[visible]] - 1] = codes[visible, member]
+        self._gameover[games] = self._rows[games] + CompactFaller.SIZE - 1 > self._height
+        self._fallen[games] += 1
+        self._active[games] = False
+        self._resolve(games)
+
+    def _resolve(self, games) -> None:
+        """
+            Helper method for finding, clearing and collapsing matches on boards until none are left
+            :arg games: index of each game whose board may hold matches
+            :returns: nothing
+            :rtype: None
+        """
+        depth = 0
+        while len(games):
+            cells = self._cells[games]
+            matched, counts = find_matches(cells, self._match_rules)
+            found = counts > 0
+            games, cells, matched, counts = games[found], cells[found], matched[found], counts[found]
+            if not len(games):
+                break
+            depth += 1
+            cells[matched] = NULL_CODE
+            collapse(cells)
+            self._cells[games] = cells
+            self._points[games] += counts * self._match_points * self._scoring.chain_multiplier(depth)
+            self._matches[games] += counts
+            self._longest_chain[games] = np.maximum(self._longest_chain[games], depth)
+
+    def _spawn(self, games) -> None:
+        """
+            Helper method for drawing the next faller of games that have none, staged above the board.
+            Fallers are decoded from the drawn batches straight into the faller arrays, the sequence of a
+            seed being the one its FallerQueue draws
+            :arg games: index of each game drawing a faller
+            :returns: nothing
+            :rtype: None
+        """
+        if not len(games):
+            return
+        drawn = self._drawn[games]
+        following = drawn + 1
+        starting = following % self._batch == 0
+        for game, index in zip(games[starting].tolist(), following[starting].tolist()):
+            self._load_batch(game, index // self._batch)
+        self._files[games], self._codes[games] = self._decode(games, drawn)
+        self._next_files[games], self._next_codes[games] = self._decode(games, following)
+        self._drawn[games] = following
+        self._rows[games] = self._height + 1
+        self._rotations[games] = 0
+        self._active[games] = True
+
+    def _load_batch(self, game: int, number: int) -> None:
+        """
+            Helper method for drawing a batch of a game's fallers into its slot of the draws array
+            :arg game: index of the game
+            :arg number: number of the batch in the game's sequence
+            :returns: nothing
+            :rtype: None
+        """
+        self._draws[game, number % 2] = batch_draws(self._seeds[game], number, self._width, self._batch)
+
+    def _decode(self, games, indexes) -> tuple:
+        """
+            Helper method for decoding the descent file and color codes of fallers from their draws
+            :arg games: index of the game of each faller
+            :arg indexes: position of each faller in its game's sequence
+            :returns: the descent file of each faller and its color codes from the bottom up
+            :rtype: tuple of numpy.ndarray
+        """
+        colors = len(ColumnsColor)
+        draws = self._draws[games, (indexes // self._batch) % 2, indexes % self._batch]
+        draws, files = np.divmod(draws, self._width)
+        draws, bottom = np.divmod(draws, colors)
+        top, center = np.divmod(draws, colors)
+        return files + 1, np.stack((bottom, center, top), axis=1) + 1
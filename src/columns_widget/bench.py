@@ -0,0 +1,409 @@
+"""
+    :module_name: bench
+    :module_summary: benchmarks of columns hot paths, stored as JSON baselines and compared for regressions
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+import gc
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from collections import namedtuple
+from contextlib import contextmanager
+
+from tilematch_tools.core import BoardFactory
+from tilematch_tools.model import NullTile
+
+from . import ColumnsGameFactory, MATCHERS
+from .game_model import ColumnsTile, ColumnsColor, ColumnsFaller, CompactFaller, ColumnsBoard, CompactColumnsBoard
+from .headless import HeadlessGameLoop, INPUT_ACTIONS, ColumnsInput
+
+try:
+    from .batched import BatchedColumns
+except ImportError:
+    # numpy is optional, the batched backend is only benchmarked when it is installed
+    BatchedColumns = None
+
+# setup builds fresh state and returns the callable timed, so setup cost is never measured.
+# inner is the number of calls timed per round, the result is the time per call
+Benchmark = namedtuple('Benchmark', ['name', 'setup', 'inner'])
+
+# Change in median time for a benchmark between a baseline and a current run. ratio is current / baseline
+Comparison = namedtuple('Comparison', ['name', 'baseline', 'current', 'ratio'])
+
+BOARDS = ('empty', 'sparse', 'dense', 'pathological')
+
+
+def fill_board(board, kind: str, seed: int = 0) -> None:
+    """
+        Place tiles on a board to shape a benchmark
+        :arg board: the board to fill
+        :arg kind: one of BOARDS. sparse fills the bottom third at random, dense fills every cell at random
+            and pathological fills every cell with one color so every scan matches
+        :arg seed: seed of the colors placed
+        :arg type: ColumnsBoard
+        :arg type: str
+        :arg type: int
+        :returns: nothing
+        :rtype: None
+    """
+    rng = random.Random(seed)
+    colors = list(ColumnsColor)
+    rows = {'empty': 0, 'sparse': board.num_rows // 3, 'dense': board.num_rows, 'pathological': board.num_rows}[kind]
+    for y in range(1, rows + 1):
+        for x in range(1, board.num_cols + 1):
+            color = ColumnsColor.RED if kind == 'pathological' else rng.choice(colors)
+            board.place_tile(ColumnsTile(**{'position': (x, y), 'color': color}))
+
+
+def _state(options: dict, board: str = 'empty'):
+    state = ColumnsGameFactory.create_state(
+            options.get('compact', False),
+            options.get('matcher', 'dirty'),
+            0,
+            width=options.get('width', ColumnsBoard.COLUMNS_BOARD_WIDTH),
+            height=options.get('height', ColumnsBoard.COLUMNS_BOARD_HEIGHT)
+            )
+    fill_board(state.board, board)
+    return state
+
+
+def _find_matches(options: dict, board: str):
+    def setup():
+        loop = HeadlessGameLoop(_state(options, board))
+        return lambda: loop.find_matches(loop.state.match_rules)
+    return setup
+
+
+def _collapse_all(options: dict):
+    def setup():
+        state = _state(options, 'dense')
+        rng = random.Random(0)
+        for x in range(1, state.board.num_cols + 1):
+            state.clear_cells([(x, y) for y in range(1, state.board.num_rows + 1) if rng.random() < 0.3])
+        return state.collapse_all
+    return setup
+
+
+def _drop_faller(options: dict):
+    def setup():
+        state = _state(options)
+        state.cycle_fallers()
+        return state.drop_faller
+    return setup
+
+
+def _move(options: dict, action: ColumnsInput):
+    def setup():
+        state = _state(options)
+        state.cycle_fallers()
+        for _ in range(state.board.num_rows + 1 - state.board.num_rows // 2):
+            state.drop_faller()
+        move = INPUT_ACTIONS[action]
+        return lambda: move(state)
+    return setup
+
+
+def _create_faller(options: dict):
+    faller_type = CompactFaller if options.get('compact') else ColumnsFaller
+    width = options.get('width', ColumnsBoard.COLUMNS_BOARD_WIDTH)
+    def setup():
+        rng = random.Random(0)
+        return lambda: faller_type(rng, width=width)
+    return setup
+
+
+def _snapshot(options: dict, method: str):
+    def setup():
+        state = _state(options, 'sparse')
+        state.cycle_fallers()
+        return getattr(state, method)
+    return setup
+
+
+def _headless_game(options: dict):
+    def setup():
+        loop = HeadlessGameLoop(_state(options))
+        return loop.run
+    return setup
+
+
+def _batched_step(options: dict, games: int):
+    def setup():
+        batch = BatchedColumns(
+                range(games),
+                options.get('width', ColumnsBoard.COLUMNS_BOARD_WIDTH),
+                options.get('height', ColumnsBoard.COLUMNS_BOARD_HEIGHT)
+                )
+        batch.step()
+        return batch.step
+    return setup
+
+
+def benchmarks(
+        compact: bool = False,
+        matcher: str = None,
+        width: int = ColumnsBoard.COLUMNS_BOARD_WIDTH,
+        height: int = ColumnsBoard.COLUMNS_BOARD_HEIGHT
+        ) -> list:
+    """
+        Build the benchmark suite
+        :arg compact: benchmark states storing their board and faller as color codes
+        :arg matcher: name of the only match backend to benchmark, every backend if not given
+        :arg width: number of columns on the boards benchmarked
+        :arg height: number of rows on the boards benchmarked
+        :arg type: bool
+        :arg type: str
+        :arg type: int
+        :arg type: int
+        :returns: every benchmark in the suite
+        :rtype: list of Benchmark
+    """
+    options = {'compact': compact, 'width': width, 'height': height}
+    suite = []
+    for name in [matcher] if matcher else MATCHERS:
+        for board in BOARDS:
+            suite.append(Benchmark(f'find_matches[{name},{board}]', _find_matches({**options, 'matcher': name}, board), 1))
+    suite.extend([
+        Benchmark('collapse_all', _collapse_all(options), 1),
+        Benchmark('drop_faller', _drop_faller(options), 10),
+        *(Benchmark(f'move[{action}]', _move(options, action), 1) for action in ColumnsInput),
+        Benchmark('create_faller', _create_faller(options), 100),
+        Benchmark('snapshot', _snapshot(options, 'snapshot'), 100),
+        Benchmark('clone', _snapshot(options, 'clone'), 10),
+        Benchmark('headless_game', _headless_game(options), 1)
+        ])
+    if BatchedColumns is not None:
+        suite.append(Benchmark('batched_step[1024]', _batched_step(options, 1024), 10))
+    return suite
+
+
+def time_benchmark(benchmark: Benchmark, rounds: int = 30) -> dict:
+    """
+        Time a benchmark
+        :arg benchmark: the benchmark to time
+        :arg rounds: number of fresh setups timed
+        :arg type: Benchmark
+        :arg type: int
+        :returns: median, mean, min and stdev of the nanoseconds per call
+        :rtype: dict
+    """
+    samples = []
+    for _ in range(rounds):
+        run = benchmark.setup()
+        started = time.perf_counter_ns()
+        for _ in range(benchmark.inner):
+            run()
+        samples.append((time.perf_counter_ns() - started) / benchmark.inner)
+    return {
+            'median_ns': statistics.median(samples),
+            'mean_ns': statistics.fmean(samples),
+            'min_ns': min(samples),
+            'stdev_ns': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            'rounds': rounds
+            }
+
+
+def run_benchmarks(suite: list, rounds: int = 30, only: str = None) -> dict:
+    """
+        Time every benchmark of a suite
+        :arg suite: the benchmarks to time
+        :arg rounds: number of fresh setups timed per benchmark
+        :arg only: optional substring a benchmark name must contain to be timed
+        :arg type: list of Benchmark
+        :arg type: int
+        :arg type: str
+        :returns: a baseline holding the machine the suite ran on and the timings of each benchmark
+        :rtype: dict
+    """
+    return {
+            'machine': {'python': platform.python_version(), 'platform': platform.platform()},
+            'results': {
+                benchmark.name: time_benchmark(benchmark, rounds)
+                for benchmark in suite if not only or only in benchmark.name
+                }
+            }
+
+
+def save_baseline(baseline: dict, stream) -> None:
+    """
+        Write a baseline as JSON
+        :arg baseline: the result of run_benchmarks
+        :arg stream: text stream written to
+        :arg type: dict
+        :arg type: file
+        :returns: nothing
+        :rtype: None
+    """
+    json.dump(baseline, stream, indent=2, sort_keys=True)
+    stream.write('\n')
+
+
+def load_baseline(stream) -> dict:
+    """
+        Read a baseline written by save_baseline
+        :arg stream: text stream read from
+        :arg type: file
+        :returns: the baseline
+        :rtype: dict
+    """
+    return json.load(stream)
+
+
+def compare(baseline: dict, current: dict) -> list:
+    """
+        Compare the median time of each benchmark present in both runs
+        :arg baseline: the run compared against
+        :arg current: the run being checked
+        :arg type: dict
+        :arg type: dict
+        :returns: the change of each benchmark, in name order
+        :rtype: list of Comparison
+    """
+    before, after = baseline['results'], current['results']
+    return [
+            Comparison(name, before[name]['median_ns'], after[name]['median_ns'],
+                       after[name]['median_ns'] / before[name]['median_ns'])
+            for name in sorted(before.keys() & after.keys())
+            ]
+
+
+def regressions(comparisons: list, threshold: float = 0.10) -> list:
+    """
+        Pick out the benchmarks that slowed down by more than a threshold
+        :arg comparisons: the result of compare
+        :arg threshold: fraction a benchmark may slow down by before it is a regression
+        :arg type: list of Comparison
+        :arg type: float
+        :returns: the comparisons that regressed
+        :rtype: list of Comparison
+    """
+    return [comparison for comparison in comparisons if comparison.ratio > 1 + threshold]
+
+
+@contextmanager
+def counting_instances(*classes):
+    """
+        Count the instances of classes built while the context is open
+        :arg classes: the classes to count instances of
+        :arg type: type
+        :returns: a dict filled with the number of instances built of each class, by name
+        :rtype: dict
+    """
+    counts = dict.fromkeys((cls.__name__ for cls in classes), 0)
+    originals = {cls: cls.__dict__.get('__init__') for cls in classes}
+
+    def counted(cls, init):
+        def __init__(self, *args, **kwargs):
+            if type(self) is cls:
+                counts[cls.__name__] += 1
+            init(self, *args, **kwargs)
+        return __init__
+
+    for cls in classes:
+        cls.__init__ = counted(cls, cls.__init__)
+    try:
+        yield counts
+    finally:
+        for cls, original in originals.items():
+            if original is None:
+                del cls.__init__
+            else:
+                cls.__init__ = original
+
+
+def allocation_profile(
+        seeds,
+        compact: bool = False,
+        matcher: str = 'dirty',
+        width: int = ColumnsBoard.COLUMNS_BOARD_WIDTH,
+        height: int = ColumnsBoard.COLUMNS_BOARD_HEIGHT
+        ) -> dict:
+    """
+        Play seeded headless games, counting the tiles built and the garbage collections they cause
+        :arg seeds: seeds of the games to play
+        :arg compact: store the board as color codes rather than tile objects
+        :arg matcher: name of the match backend
+        :arg width: number of columns on the board
+        :arg height: number of rows on the board
+        :arg type: iterable of int
+        :arg type: bool
+        :arg type: str
+        :arg type: int
+        :arg type: int
+        :returns: per game averages of tiles built, tiles reused from the pool, collections and seconds collecting
+        :rtype: dict
+    """
+    collections = {'count': 0, 'seconds': 0.0, 'started': 0.0}
+
+    def collecting(phase, _info):
+        if phase == 'start':
+            collections['started'] = time.perf_counter()
+        else:
+            collections['count'] += 1
+            collections['seconds'] += time.perf_counter() - collections['started']
+
+    seeds = list(seeds)
+    reused = 0
+    gc.callbacks.append(collecting)
+    try:
+        with counting_instances(ColumnsTile, NullTile) as built:
+            for seed in seeds:
+                state = ColumnsGameFactory.create_state(compact, matcher, seed, width=width, height=height)
+                HeadlessGameLoop(state).run()
+                reused += state.fallers.pool.reused
+    finally:
+        gc.callbacks.remove(collecting)
+    games = max(len(seeds), 1)
+    return {
+            'columns_tiles_built': built['ColumnsTile'] / games,
+            'null_tiles_built': built['NullTile'] / games,
+            'tiles_reused': reused / games,
+            'gc_collections': collections['count'] / games,
+            'gc_seconds': collections['seconds'] / games
+            }
+
+
+def _bytes_each(build, count: int) -> float:
+    """
+        Helper method for measuring the memory held by objects, keeping every object built alive until measured
+        :arg build: callable building one object
+        :arg count: number of objects built
+        :returns: bytes allocated per object
+        :rtype: float
+    """
+    gc.collect()
+    started = tracemalloc.is_tracing()
+    if not started:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = [build() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    if not started:
+        tracemalloc.stop()
+    del built
+    return (after - before) / count
+
+
+def memory_profile(count: int = 100) -> dict:
+    """
+        Measure the memory held by boards, empty and full, of both storages, and by fallers
+        :arg count: number of each object built for the measure
+        :arg type: int
+        :returns: bytes per object of each kind measured
+        :rtype: dict
+    """
+    profile = {}
+    for board_type in (ColumnsBoard, CompactColumnsBoard):
+        for kind in ('empty', 'dense'):
+            def build(board_type=board_type, kind=kind):
+                board = BoardFactory.create_board(board_type, ColumnsBoard.COLUMNS_BOARD_WIDTH, ColumnsBoard.COLUMNS_BOARD_HEIGHT)
+                fill_board(board, kind)
+                return board
+            profile[f'{board_type.__name__}[{kind}]'] = _bytes_each(build, count)
+    for faller_type in (ColumnsFaller, CompactFaller):
+        profile[faller_type.__name__] = _bytes_each(lambda faller_type=faller_type: faller_type(descent_file=1, codes=(1, 2, 3)), count)
+    return profile
@@ -0,0 +1,313 @@
+"""
+    :module_name: bot
+    :module_summary: a bot placing each faller where a search of every reachable placement scores best
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+import logging
+import math
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .columns import ColumnsGameState
+from .headless import ColumnsInput, INPUT_ACTIONS
+
+LOGGER = logging.getLogger(__name__)
+
+Placement = namedtuple('Placement', ['column', 'rotation', 'value'])
+
+LOST = -math.inf
+
+
+def column_heights(state: ColumnsGameState) -> list:
+    """
+        Measure the number of tiles stacked in each column of a state's board, read from the board's height index
+        :arg state: the state measured
+        :arg type: ColumnsGameState
+        :returns: height of each column, leftmost first
+        :rtype: list of int
+    """
+    board = state.board
+    return [board.column_height(x) for x in range(1, board.num_cols + 1)]
+
+
+def points(state: ColumnsGameState) -> float:
+    """Heuristic rewarding the points scored"""
+    return state.points
+
+
+def aggregate_height(state: ColumnsGameState) -> float:
+    """Heuristic penalizing every tile stacked on the board"""
+    return -sum(column_heights(state))
+
+
+def max_height(state: ColumnsGameState) -> float:
+    """Heuristic penalizing the tallest column, which ends the game once it reaches the top"""
+    return -max(column_heights(state))
+
+
+def bumpiness(state: ColumnsGameState) -> float:
+    """Heuristic penalizing differences between the heights of neighboring columns"""
+    heights = column_heights(state)
+    return -sum(abs(left - right) for left, right in zip(heights, heights[1:]))
+
+
+def pairs(state: ColumnsGameState) -> float:
+    """Heuristic rewarding neighboring tiles of the same color, which are one tile away from a match"""
+    board = state.board
+    occupied = board.occupied
+    count = 0
+    for x, y in occupied:
+        color = board.tile_at(x, y).color
+        for dx, dy in ((1, 0), (0, 1), (1, 1), (1, -1)):
+            if (x + dx, y + dy) in occupied and board.tile_at(x + dx, y + dy).color == color:
+                count += 1
+    return count
+
+
+DEFAULT_HEURISTICS = (
+        (points, 1.0),
+        (aggregate_height, 0.5),
+        (max_height, 2.0),
+        (bumpiness, 0.5),
+        (pairs, 2.0)
+        )
+
+
+def evaluate(state: ColumnsGameState, heuristics: tuple) -> float:
+    """
+        Score a state as the weighted sum of heuristics
+        :arg state: the state scored
+        :arg heuristics: (heuristic, weight) of each heuristic, a heuristic takes a state and returns a float
+        :arg type: ColumnsGameState
+        :arg type: tuple
+        :returns: the score, higher is better
+        :rtype: float
+    """
+    return sum(weight * heuristic(state) for heuristic, weight in heuristics)
+
+
+def placements(state: ColumnsGameState) -> list:
+    """
+        List the placements to try for the active faller: every column with every rotation giving a distinct
+        order of colors. Whether a column is reachable is only known once the moves are tried
+        :arg state: the state whose active faller is placed
+        :arg type: ColumnsGameState
+        :returns: (column, rotation) of each placement, rotation being the number of downward rotations
+        :rtype: list
+    """
+    codes = state.active_faller.codes
+    rotations = []
+    orders = set()
+    for rotation in range(len(codes)):
+        order = codes[rotation:] + codes[:rotation]
+        if order not in orders:
+            orders.add(order)
+            rotations.append(rotation)
+    return [(column, rotation) for rotation in rotations for column in range(1, state.board.num_cols + 1)]
+
+
+def moves(state: ColumnsGameState, column: int, rotation: int) -> list:
+    """
+        The inputs that take the active faller to a placement
+        :arg state: the state whose active faller is placed
+        :arg column: column to place the faller in
+        :arg rotation: number of downward rotations
+        :arg type: ColumnsGameState
+        :arg type: int
+        :arg type: int
+        :returns: the inputs, to be given before the next tick
+        :rtype: list of ColumnsInput
+    """
+    shift = column - state.active_faller.descent_file
+    step = ColumnsInput.SHIFT_RIGHT if shift > 0 else ColumnsInput.SHIFT_LEFT
+    return [ColumnsInput.ROTATE_DOWN] * rotation + [step] * abs(shift)
+
+
+def land(state: ColumnsGameState, inputs: list) -> bool:
+    """
+        Give a state inputs then hard drop its active faller, land it and resolve the cascade it causes
+        :arg state: the state played, it is changed
+        :arg inputs: the inputs to give the active faller first
+        :arg type: ColumnsGameState
+        :arg type: list of ColumnsInput
+        :returns: false if an input could not be applied, so the placement is not reachable
+        :rtype: bool
+    """
+    for action in inputs:
+        if not INPUT_ACTIONS[action](state):
+            return False
+    state.hard_drop_faller()
+    while state.active_faller:
+        state.drop_faller()
+    state.resolve()
+    return True
+
+
+def search(state: ColumnsGameState, plies: int, heuristics: tuple) -> (float, int):
+    """
+        Find the best value of any placement of the active faller, looking plies fallers ahead
+        :arg state: the state searched, it is left unchanged
+        :arg plies: number of fallers placed, 1 only places the active faller
+        :arg heuristics: (heuristic, weight) of each heuristic scoring the states reached
+        :arg type: ColumnsGameState
+        :arg type: int
+        :arg type: tuple
+        :returns: the best value, LOST if every placement loses, and the number of states scored
+        :rtype: tuple
+    """
+    best, evaluations = LOST, 0
+    snapshot = state.snapshot()
+    for column, rotation in placements(state):
+        value, scored = branch(snapshot, column, rotation, plies, heuristics)
+        evaluations += scored
+        if value is not None:
+            best = max(best, value)
+    return best, evaluations
+
+
+def branch(snapshot: bytes, column: int, rotation: int, plies: int, heuristics: tuple) -> (float, int):
+    """
+        Value one placement of the active faller of a state snapshot. Takes a snapshot rather than a state
+        so branches can be shipped to other processes cheaply
+        :arg snapshot: snapshot of the state searched
+        :arg column: column to place the faller in
+        :arg rotation: number of downward rotations
+        :arg plies: number of fallers placed, 1 only places the active faller
+        :arg heuristics: (heuristic, weight) of each heuristic scoring the states reached
+        :arg type: bytes
+        :arg type: int
+        :arg type: int
+        :arg type: int
+        :arg type: tuple
+        :returns: the value of the placement, None if it is not reachable, and the number of states scored
+        :rtype: tuple
+    """
+    state = ColumnsGameState.restore(snapshot)
+    if not land(state, moves(state, column, rotation)):
+        return None, 0
+    if state.gameover():
+        return LOST, 0
+    if plies > 1:
+        state.cycle_fallers()
+        return search(state, plies - 1, heuristics)
+    return evaluate(state, heuristics), 1
+
+
+class PlacementBot:
+    """
+        Class choosing where to place each faller by searching every reachable placement,
+        spreading the branches of a search across processes.
+        Used as the input source of a HeadlessGameLoop, it gives every input needed to place
+        a new faller before the faller's first tick
+    """
+
+    def __init__(self, plies: int = 1, heuristics: tuple = DEFAULT_HEURISTICS, workers: int = 1):
+        """
+            :arg plies: number of fallers placed per search, 2 also places the next faller
+            :arg heuristics: (heuristic, weight) of each heuristic, heuristics must be module level
+                functions to be shipped to other processes
+            :arg workers: number of processes searching branches, 1 searches in this process
+            :arg type: int
+            :arg type: tuple
+            :arg type: int
+        """
+        self._plies = max(1, plies)
+        self._heuristics = tuple(heuristics)
+        self._workers = workers
+        self._executor = None
+        self._planned = None
+        self._evaluations = 0
+        self._seconds = 0.0
+        self._last_decision = 0.0
+
+    @property
+    def evaluations(self) -> int:
+        """
+            View of the number of states scored by every search so far
+            :rtype: int
+        """
+        return self._evaluations
+
+    @property
+    def rate(self) -> float:
+        """
+            View of the states scored per second of searching
+            :rtype: float
+        """
+        return self._evaluations / self._seconds if self._seconds else 0.0
+
+    @property
+    def last_decision(self) -> float:
+        """
+            View of the seconds taken by the last search
+            :rtype: float
+        """
+        return self._last_decision
+
+    def decide(self, state: ColumnsGameState) -> Placement or None:
+        """
+            Search every placement of a state's active faller
+            :arg state: the state searched, it is left unchanged
+            :arg type: ColumnsGameState
+            :returns: the best placement, the first one tried on ties, or None if no placement is reachable
+            :rtype: Placement
+        """
+        started = time.perf_counter()
+        candidates = placements(state)
+        evaluate_branch = partial(branch, state.snapshot(), plies=self._plies, heuristics=self._heuristics)
+        columns, rotations = zip(*candidates)
+        if self._workers == 1:
+            results = map(evaluate_branch, columns, rotations)
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._workers)
+            results = self._executor.map(evaluate_branch, columns, rotations)
+
+        best = None
+        for (column, rotation), (value, scored) in zip(candidates, results):
+            self._evaluations += scored
+            if value is not None and (best is None or value > best.value):
+                best = Placement(column, rotation, value)
+        self._last_decision = time.perf_counter() - started
+        self._seconds += self._last_decision
+        return best
+
+    def __call__(self, loop) -> list:
+        """
+            Give the inputs placing and hard dropping a faller the first time the loop's state has it active
+            :arg loop: the loop asking for inputs
+            :arg type: HeadlessGameLoop
+            :returns: the inputs for the next tick
+            :rtype: list of ColumnsInput
+        """
+        state = loop.state
+        if not state.active_faller or self._planned is state.active_faller:
+            return []
+        # the faller itself is remembered, a faller count would match the count of a new game played next
+        self._planned = state.active_faller
+        placement = self.decide(state)
+        if placement is None:
+            return []
+        LOGGER.debug(
+                'Placing faller %d in column %d with %d rotations', state.fallers.drawn, placement.column, placement.rotation
+                )
+        return moves(state, placement.column, placement.rotation) + [ColumnsInput.HARD_DROP]
+
+    def close(self) -> None:
+        """
+            Shut down the processes searching branches
+            :returns: nothing
+            :rtype: None
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
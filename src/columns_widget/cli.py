@@ -4,16 +4,223 @@
     :module_author: Nathan Mendoza (nathancm@uci.edu)
 """
 
+import logging
+import sys
+import time
+from functools import partial
+
 import click
 
-from . import ColumnsGameFactory
+from . import ColumnsGame, ColumnsGameFactory, MATCHERS, TRACER, LOG_FORMAT
+from .columns import ColumnsGameState
+from .game_model import ColumnsBoard
+from .game_view import ColumnsView
+from .headless import HeadlessGameLoop, random_input_source
+from .bot import PlacementBot
+from .recording import RECORDER
+from .replay import read_log, play_back, ReplayGameLoop
+from .batch import run_batch, BatchSummary, ResultWriter
+from . import bench as benchmarking
+from .metrics import METRICS
 
 from tilematch_tools import GameEngine
 
-@click.command()
-def columns():
+@click.group(invoke_without_command=True)
+@click.option('--compact', is_flag=True, help='Store the board and the falling faller as color codes instead of tile objects')
+@click.option('--matcher', type=click.Choice(list(MATCHERS)), default='dirty', help='Match backend')
+@click.option('--lookahead', default=1, show_default=True, help='Number of upcoming fallers to preview')
+@click.option('--width', type=click.IntRange(min=1), default=ColumnsBoard.COLUMNS_BOARD_WIDTH, show_default=True, help='Number of columns on the board')
+@click.option('--height', type=click.IntRange(min=1), default=ColumnsBoard.COLUMNS_BOARD_HEIGHT, show_default=True, help='Number of rows on the board')
+@click.option('-v', '--verbose', is_flag=True, help='Log game events to stderr')
+@click.option('--trace', default=0, metavar='N', help='Keep the last N traced game events and dump them to stderr at game over')
+@click.option('--metrics-file', type=click.Path(dir_okay=False), default=None, help='Keep this file up to date with Prometheus text metrics of each game')
+@click.option('--metrics-port', type=int, default=None, help='Serve Prometheus text metrics of each game on this port')
+@click.option('--record', type=click.Path(file_okay=False), default=None, help='Write a replay log of each game to this directory')
+@click.pass_context
+def columns(ctx, compact, matcher, lookahead, width, height, verbose, trace, metrics_file, metrics_port, record):
     """Entry point to columns"""
-    ge = GameEngine([ColumnsGameFactory.create_game()])
-    ge.run()
+    if verbose:
+        logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    if trace:
+        TRACER.enable(trace, sys.stderr)
+    if metrics_file or metrics_port is not None:
+        METRICS.enabled = True
+    if metrics_file:
+        METRICS.write_periodically(metrics_file)
+        ctx.call_on_close(lambda: METRICS.write_textfile(metrics_file))
+    if metrics_port is not None:
+        METRICS.serve(metrics_port)
+    if record:
+        RECORDER.enable(record)
+        ctx.call_on_close(RECORDER.close)
+    ctx.obj = {
+            'compact': compact,
+            'matcher': matcher,
+            'matcher_given': ctx.get_parameter_source('matcher') != click.core.ParameterSource.DEFAULT,
+            'width': width,
+            'height': height
+            }
+    if ctx.invoked_subcommand is None:
+        ge = GameEngine([
+            ColumnsGameFactory.create_game(compact=compact, matcher=matcher, lookahead=lookahead, width=width, height=height)
+            ])
+        ge.run()
+
+@columns.command()
+@click.option('--games', default=1, show_default=True, help='Number of games to play')
+@click.option('--seed', default=0, show_default=True, help='Seed of the first game, later games count up from it')
+@click.option('--max-ticks', default=None, type=int, help='Stop each game after this many ticks')
+@click.option('--random-inputs', is_flag=True, help='Give each game one random input per tick')
+@click.option('--bot', is_flag=True, help='Let a bot searching every placement place each faller')
+@click.option('--bot-plies', default=1, show_default=True, help='Number of fallers the bot places per search')
+@click.option('--bot-workers', default=1, show_default=True, help='Number of processes the bot searches with')
+@click.pass_obj
+def simulate(options, games, seed, max_ticks, random_inputs, bot, bot_plies, bot_workers):
+    """Play games headlessly as fast as possible"""
+    started = time.perf_counter()
+    with PlacementBot(bot_plies, workers=bot_workers) as placement_bot:
+        for game_seed in range(seed, seed + games):
+            state = ColumnsGameFactory.create_state(
+                    options['compact'], options['matcher'], game_seed, width=options['width'], height=options['height']
+                    )
+            source = random_input_source(-game_seed - 1) if random_inputs else None
+            loop = HeadlessGameLoop(state, input_source=placement_bot if bot else source)
+            loop.run(max_ticks)
+            click.echo(
+                    f'seed={game_seed} ticks={loop.ticks} points={state.points} '
+                    f'fallers={state.fallers_placed} matches={loop.matches}'
+                    )
+    elapsed = time.perf_counter() - started
+    click.echo(f'{games} games in {elapsed:.3f}s ({games / elapsed:.1f} games/s)')
+    if bot:
+        click.echo(f'bot scored {placement_bot.evaluations} states ({placement_bot.rate:.1f} evaluations/s)')
+
+@columns.command()
+@click.option('--games', default=100, show_default=True, help='Number of games to play')
+@click.option('--seed', default=0, show_default=True, help='Seed of the first game, later games count up from it')
+@click.option('--workers', default=None, type=int, help='Number of processes, defaults to one per cpu')
+@click.option('--max-ticks', default=None, type=int, help='Stop each game after this many ticks')
+@click.option('--random-inputs', is_flag=True, help='Give each game one random input per tick')
+@click.option('--output', type=click.File('w'), default=None, help='Stream per-game results to this file')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default='csv', show_default=True, help='Per-game result format')
+@click.pass_obj
+def batch(options, games, seed, workers, max_ticks, random_inputs, output, fmt):
+    """Play many seeded games across processes and summarize the results"""
+    started = time.perf_counter()
+    summary = BatchSummary()
+    writer = ResultWriter(output, fmt) if output else None
+    for result in run_batch(
+            range(seed, seed + games),
+            workers,
+            compact=options['compact'],
+            matcher=options['matcher'],
+            width=options['width'],
+            height=options['height'],
+            max_ticks=max_ticks,
+            random_inputs=random_inputs
+            ):
+        summary.add(result)
+        if writer:
+            writer.write(result)
+    elapsed = time.perf_counter() - started
+    click.echo(f'{summary.count} games in {elapsed:.3f}s ({summary.count / elapsed:.1f} games/s)')
+    for field, stats in summary.statistics().items():
+        click.echo(
+                f'{field:>12}: mean={stats["mean"]:.2f} stdev={stats["stdev"]:.2f} '
+                f'min={stats["min"]} max={stats["max"]} total={stats["total"]}'
+                )
+
+@columns.command()
+@click.argument('log', type=click.File('rb'))
+@click.option('--realtime', is_flag=True, help='Watch the game in a window at its own pace instead')
+def replay(log, realtime):
+    """Play a replay log back and report the state it finishes in"""
+    game_log = read_log(log)
+    if realtime:
+        state = ColumnsGameState.restore(game_log.snapshot)
+        loop = partial(ReplayGameLoop, events=game_log.events, phased=game_log.phased)
+        GameEngine([ColumnsGame(state, loop, ColumnsView, ColumnsGame.TICK)]).run()
+        return
+    started = time.perf_counter()
+    loop = play_back(game_log)
+    elapsed = time.perf_counter() - started
+    state = loop.state
+    click.echo(
+            f'seed={state.fallers.seed} ticks={loop.ticks} points={state.points} '
+            f'fallers={state.fallers_placed} matches={loop.matches} gameover={state.gameover()}'
+            )
+    click.echo(f'played back in {elapsed:.3f}s')
+
+@columns.group()
+def bench():
+    """Time the hot paths of columns and compare against stored baselines"""
+
+@bench.command('run')
+@click.option('--rounds', default=30, show_default=True, help='Number of fresh setups timed per benchmark')
+@click.option('--only', default=None, help='Only time benchmarks whose name contains this')
+@click.option('--output', type=click.File('w'), default=None, help='Write the timings to this JSON baseline')
+@click.pass_obj
+def bench_run(options, rounds, only, output):
+    """Time every benchmark"""
+    suite = benchmarking.benchmarks(
+            options['compact'],
+            options['matcher'] if options['matcher_given'] else None,
+            options['width'],
+            options['height']
+            )
+    baseline = benchmarking.run_benchmarks(suite, rounds, only)
+    for name, timing in baseline['results'].items():
+        click.echo(f'{name:<40} median={timing["median_ns"] / 1000:>12.2f}us stdev={timing["stdev_ns"] / 1000:.2f}us')
+    if output:
+        benchmarking.save_baseline(baseline, output)
+
+@bench.command('alloc')
+@click.option('--games', default=20, show_default=True, help='Number of games to play')
+@click.option('--seed', default=0, show_default=True, help='Seed of the first game, later games count up from it')
+@click.pass_obj
+def bench_alloc(options, games, seed):
+    """Count the tiles built and garbage collections made per game"""
+    profile = benchmarking.allocation_profile(
+            range(seed, seed + games), options['compact'], options['matcher'], options['width'], options['height']
+            )
+    for name, value in profile.items():
+        click.echo(f'{name:<20} {value:>12.4f} per game')
+
+@bench.command('memory')
+@click.option('--count', default=100, show_default=True, help='Number of each object built for the measure')
+def bench_memory(count):
+    """Report the bytes held per board and per faller"""
+    for name, size in benchmarking.memory_profile(count).items():
+        click.echo(f'{name:<30} {size:>10.0f} bytes')
+
+@bench.command('env')
+@click.option('--envs', default=1024, show_default=True, help='Number of games stepped together')
+@click.option('--steps', default=1000, show_default=True, help='Number of steps taken')
+@click.option('--seed', default=0, show_default=True, help='Seed of the first game, later games count up from it')
+@click.pass_obj
+def bench_env(options, envs, steps, seed):
+    """Step the vectorized environment with random actions and report its steps per second"""
+    try:
+        from .env import ColumnsVectorEnv
+    except ImportError as err:
+        raise click.ClickException(str(err)) from err
+    env = ColumnsVectorEnv(envs, seed, options['width'], options['height'])
+    env.reset()
+    for _ in range(steps):
+        env.step(env.sample_actions())
+    env.close()
+    click.echo(f'{env.steps} steps over {env.episodes} finished episodes at {env.steps_per_second:.1f} steps/s')
 
-    
+@bench.command('compare')
+@click.argument('baseline', type=click.File('r'))
+@click.argument('current', type=click.File('r'))
+@click.option('--threshold', default=0.10, show_default=True, help='Fraction a benchmark may slow down by before it is a regression')
+def bench_compare(baseline, current, threshold):
+    """Compare two baselines, failing if any benchmark regressed"""
+    comparisons = benchmarking.compare(benchmarking.load_baseline(baseline), benchmarking.load_baseline(current))
+    regressed = benchmarking.regressions(comparisons, threshold)
+    for comparison in comparisons:
+        flag = 'REGRESSION' if comparison in regressed else ''
+        click.echo(f'{comparison.name:<40} {comparison.ratio - 1:>+8.1%} {flag}')
+    if regressed:
+        raise click.ClickException(f'{len(regressed)} benchmark(s) regressed by more than {threshold:.0%}')
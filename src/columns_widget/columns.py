@@ -4,44 +4,75 @@
     :module_author: Nathan Mendoza (nathancm@uci.edu)
 """
 import logging
-import time
+import struct
 
-from tilematch_tools import GameLoop, GameState, NullTile, BoardFactory
-from tilematch_tools.model.exceptions import InvalidBoardPositionError
+from tilematch_tools import GameLoop, GameState, BoardFactory
 
 from .game_model import ColumnsColor, ColumnsTile, ColumnsFaller, \
-                        ColumnsScoring, ColumnsBoard, \
-                        SingleStepDescent, AbsoluteDescent, \
+                        ColumnsScoring, ChainScoring, ColumnsBoard, CompactColumnsBoard, \
+                        ColumnGravity, \
                         ThreeFoldNorth, ThreeFoldEast, ThreeFoldSouth, ThreeFoldWest, \
                         ThreeFoldNorthEast, ThreeFoldNorthWest, \
                         ThreeFoldSouthEast, ThreeFoldSouthWest, \
-                        FallerShiftRight, FallerShiftLeft, \
-                        FallerShuffleUp, FallerShuffleDown
-from .game_view import ColumnsView, ShiftFallerLeft, ShiftFallerRight, RotateFallerUp, RotateFallerDown
+                        FallerMovementRule, FallerShiftRight, FallerShiftLeft, \
+                        FallerShuffleUp, FallerShuffleDown, FallerHardDrop, FallerDescent, \
+                        DirtyRegionMatcher, MATCHERS, FallerQueue, CompactFaller, \
+                        Resolution, ResolutionStep, ColumnsPhase, TRACER, TraceKind, null_tile
+from .game_model.columns_tile import NULL_CODE, COLOR_CODES, CODE_COLORS
+from .metrics import METRICS
+from .recording import RECORDER
+from .game_view import ColumnsView, ShiftFallerLeft, ShiftFallerRight, RotateFallerUp, RotateFallerDown, HardDropFaller
 
 
 LOGGER = logging.getLogger(__name__)
 
 
+SNAPSHOT_VERSION = 3
+# version, flags, matcher, phase, chain depth, columns, rows, points, fallers placed, cells cleared
+SNAPSHOT_HEADER = struct.Struct('<5B2H3I')
+# fallers drawn, lookahead, batch size, width, seed length
+SNAPSHOT_QUEUE = struct.Struct('<IBHHB')
+# descent file then the color code of each member from the bottom up
+SNAPSHOT_DRAW = struct.Struct('<H3B')
+# descent file, the row of each member from the bottom up, then the color code of each member
+SNAPSHOT_FALLER = struct.Struct('<4H3B')
+SNAPSHOT_CELL = struct.Struct('<2H')
+
+COMPACT_BOARD, COMPACT_FALLER, GAME_OVER, HAS_FALLER, CHAIN_SCORING = 1, 2, 4, 8, 16
+
+
 class ColumnsGameState(GameState):
     """
         Columns game state logic
     """
+    FALLER_TYPE = ColumnsFaller
 
-    def __init__(self, board: ColumnsBoard, score: ColumnsScoring):
+    def __init__(self, board: ColumnsBoard, score: ColumnsScoring, matcher = DirtyRegionMatcher, fallers: FallerQueue = None):
         LOGGER.info('New columns game state')
         super().__init__(board, score)
+        self._scoring = score
+        self._matcher = matcher(board)
+        self._match_points = {}
+        self._points = 0
+        self._fallers = fallers or FallerQueue(width=board.num_cols, faller_type=self.FALLER_TYPE, height=board.num_rows)
         self._active_faller = None
-        self._next_faller = ColumnsFaller()
-        self._fallen = []
+        self._prev_faller = None
+        self._fallen = 0
+        self._gameover = False
+        self._phase = ColumnsPhase.FALLING
+        self._chain_depth = 0
+        self._match_cells = {}
+        self._cleared = []
+        self._collapsed = ()
+        self._located = (None, ())
+        self._landing = (None, None, None, 0)
     
     def gameover(self):
-        if self.prev_faller:
-            return any(
-                tile.position.y == ColumnsFaller.STAGED
-                for tile in self.prev_faller.members
-            )
-        return False
+        """
+            Determine whether the last faller to land was left partly staged above the board.
+            Decided when the faller lands, as its tiles may be cleared and reused afterwards
+        """
+        return self._gameover
 
 
 
@@ -59,7 +90,89 @@ class ColumnsGameState(GameState):
             Return a reference to the next faller
             :rtype: ColumnsFaller
         """
-        return self._next_faller
+        return self._fallers.peek()
+
+    @property
+    def upcoming_fallers(self) -> tuple:
+        """
+            Return the fallers queued up after the active faller, soonest first
+            :rtype: tuple of ColumnsFaller
+        """
+        return self._fallers.upcoming
+
+    @property
+    def floating(self) -> tuple:
+        """
+            Return the cells of the active faller that are shown on the board but not placed on it.
+            Tile fallers are placed on the board as they move, so none float
+            :rtype: tuple of ((x, y), color)
+        """
+        return ()
+
+    @property
+    def landing_preview(self) -> tuple:
+        """
+            Return the cells of the board the active faller would land on if dropped straight down, other than
+            those it already covers, for drawing where it lands. Found in constant time from the column heights
+            :rtype: tuple of ((x, y), color)
+        """
+        faller = self._active_faller
+        if not faller:
+            return ()
+        covered = faller.positions
+        return tuple(
+                (position, color)
+                for position, color in zip(self._landing_positions(), faller.colors)
+                if position[1] <= self.board.num_rows and position not in covered
+                )
+
+    def landing_row(self) -> int:
+        """
+            Find the row the bottom member of the active faller lands on if it falls straight down, in constant
+            time. The board is settled whenever a faller is active, so the faller lands on the topmost tile of its file.
+            The row is remembered until the board version, the faller or its file changes
+            :returns: the row the bottom member lands on, 0 without an active faller
+            :rtype: int
+        """
+        faller = self._active_faller
+        if not faller:
+            return 0
+        version, descent_file = self.board.version, faller.descent_file
+        cached_version, cached_faller, cached_file, row = self._landing
+        if version != cached_version or faller is not cached_faller or descent_file != cached_file:
+            row = self._stack_height(faller) + 1
+            self._landing = (version, faller, descent_file, row)
+        return row
+
+    def _stack_height(self, faller) -> int:
+        """
+            Helper method for finding the topmost tile under a faller. Tile fallers are placed on the board
+            as they move, and their members on the board are the topmost tiles of their file
+            :arg faller: the faller falling
+            :returns: the row of the topmost tile under the faller, 0 if there is none
+            :rtype: int
+        """
+        rows = self.board.num_rows
+        return self.board.column_height(faller.descent_file) - sum(1 for _, y in faller.positions if y <= rows)
+
+    def _landing_positions(self) -> tuple:
+        """
+            Helper method for finding where each member of the active faller lands. Tile fallers stage every member
+            left above the board on the row above it
+            :returns: position of each member once landed, from the bottom up
+            :rtype: tuple
+        """
+        faller = self._active_faller
+        row, staged = self.landing_row(), self.board.num_rows + 1
+        return tuple((faller.descent_file, min(row + member, staged)) for member in range(faller.size))
+
+    @property
+    def fallers(self) -> FallerQueue:
+        """
+            Return the queue this state draws fallers from
+            :rtype: FallerQueue
+        """
+        return self._fallers
 
     @property
     def prev_faller(self) -> ColumnsFaller or None:
@@ -67,7 +180,59 @@ class ColumnsGameState(GameState):
             Return a reference to the last faller that has fallen
             :rtype: ColumnsFaller if at least one faller has fallen or None
         """
-        return self._fallen[-1] if self._fallen else None
+        return self._prev_faller
+
+    @property
+    def fallers_placed(self) -> int:
+        """
+            Return the number of fallers that have fallen
+            :rtype: int
+        """
+        return self._fallen
+
+    @property
+    def points(self) -> int:
+        """
+            Return the points awarded for the matches found by this state
+            :rtype: int
+        """
+        return self._points
+
+    @property
+    def phase(self) -> ColumnsPhase:
+        """
+            Return the phase the game is in
+            :rtype: ColumnsPhase
+        """
+        return self._phase
+
+    @phase.setter
+    def phase(self, phase: ColumnsPhase) -> None:
+        self._phase = phase
+
+    @property
+    def cleared(self) -> tuple:
+        """
+            Return the cells whose tiles were cleared since the board last collapsed
+            :rtype: tuple
+        """
+        return tuple(self._cleared)
+
+    @property
+    def collapsed(self) -> tuple:
+        """
+            Return the cells tiles fell into when the board last collapsed
+            :rtype: tuple
+        """
+        return self._collapsed
+
+    @property
+    def chain_depth(self) -> int:
+        """
+            Return the number of passes of matches cleared one at a time since the last landing
+            :rtype: int
+        """
+        return self._chain_depth
 
     @property
     def match_rules(self):
@@ -82,79 +247,462 @@ class ColumnsGameState(GameState):
                 ThreeFoldSouthEast
                 ]
 
-    def shift_faller_left(self):
+    def find_matches(self, match_rules) -> list:
+        """
+            Find the matches currently on the board using this state's matcher
+            :arg match_rules: the match rule classes to check
+            :arg type: list
+            :returns: the matches found, ordered by rule then x then y
+            :rtype: list of MatchFound
+        """
+        return self._found(self._locate(match_rules))
+
+    def _locate(self, match_rules) -> list:
+        """
+            Helper method for locating matches, the board is only scanned again once its version or the rules change
+            :arg match_rules: the match rule classes to check
+            :arg type: list
+            :returns: (rule, x, y) of each match
+            :rtype: list
+        """
+        key = (self.board.version, tuple(match_rules))
+        if key != self._located[0]:
+            self._located = (key, self._matcher.locate(match_rules))
+        return self._located[1]
+
+    def _found(self, located: list) -> list:
+        """
+            Helper method for describing located matches, remembering the points each is worth
+            :arg located: (rule, x, y) of each match
+            :arg type: list
+            :returns: the matches described
+            :rtype: list of MatchFound
+        """
+        matches = []
+        self._match_points = {}
+        self._match_cells = {}
+        for rule, x, y in located:
+            match = rule.found(self.board, x, y)
+            self._match_points[id(match)] = (match, rule.point_value * rule.STREAK)
+            self._match_cells[id(match)] = (match, rule.cells(x, y))
+            matches.append(match)
+        return matches
+
+    def resolve(self, match_rules = None) -> Resolution:
+        """
+            Find, clear and collapse matches until the board has none left
+            :arg match_rules: the match rule classes to check, this state's rules if not given
+            :arg type: list
+            :returns: a record of every pass made, for scoring and animating the chain
+            :rtype: Resolution
+        """
+        match_rules = match_rules or self.match_rules
+        resolution = Resolution()
+        located = self._locate(match_rules)
+        while located:
+            depth = resolution.chain_depth + 1
+            matches = self._found(located)
+            cleared = sorted({cell for rule, x, y in located for cell in rule.cells(x, y)})
+            points = sum(rule.point_value * rule.STREAK for rule, _, _ in located) * self._scoring.chain_multiplier(depth)
+
+            self.clear_cells(cleared)
+            self._match_points = {}
+            self._match_cells = {}
+            self._award(points)
+
+            resolution.add(ResolutionStep(depth, tuple(matches), tuple(cleared), tuple(self.collapse_all()), points))
+            located = self._locate(match_rules)
+        return resolution
+
+    def clear_cells(self, cells) -> None:
+        """
+            Remove the tiles at the given positions from the board, remembering the cells cleared
+            :arg cells: (x, y) of each tile to remove
+            :arg type: iterable
+            :returns: nothing
+            :rtype: None
+        """
+        cells = tuple(cells)
+        if TRACER.enabled:
+            TRACER.record(TraceKind.CLEAR, cells)
+        for x, y in cells:
+            self._fallers.pool.release(self.board.tile_at(x, y))
+            self.board.place_tile(null_tile(x, y))
+        self._cleared.extend(cells)
+
+    def clear_match(self, match) -> None:
+        """
+            Remove the tiles of a match from the board, remembering the cells cleared
+            :arg match: the match to clear
+            :arg type: MatchFound
+            :returns: nothing
+            :rtype: None
+        """
+        _, cells = self._match_cells.pop(id(match), (match, ()))
+        cells = [cell for cell in cells if cell not in self._cleared]
+        released = [self.board.tile_at(x, y) for x, y in cells]
+        super().clear_match(match)
+        self._cleared.extend(cells)
+        for tile in released:
+            self._fallers.pool.release(tile)
+
+    def adjust_score(self, match) -> None:
+        """
+            Award the points for a match, keeping a tally of points for matches found by this state
+            :arg match: the match to award points for
+            :arg type: MatchFound
+            :returns: nothing
+            :rtype: None
+        """
+        super().adjust_score(match)
+        _, points = self._match_points.pop(id(match), (match, 0))
+        self._points += points
+
+    def award_matches(self, matches) -> None:
+        """
+            Award the points for every match cleared in one pass at once, multiplied for the pass's depth in the chain
+            started by the last landing
+            :arg matches: the matches cleared, found by this state
+            :arg type: list of MatchFound
+            :returns: nothing
+            :rtype: None
+        """
+        self._chain_depth += 1
+        points = sum(self._match_points.pop(id(match), (match, 0))[1] for match in matches)
+        self._award(points * self._scoring.chain_multiplier(self._chain_depth))
+
+    def _award(self, points: int) -> None:
+        """
+            Helper method for awarding the points of a pass in a single call to the scoring
+            :arg points: the points to award
+            :arg type: int
+            :returns: nothing
+            :rtype: None
+        """
+        self._scoring.award_points(points)
+        self._points += points
+
+    def shift_faller_left(self) -> bool:
         if not self._active_faller:
-            return
+            return False
 
-        FallerShiftLeft().move(self.board, self._active_faller)
+        return FallerShiftLeft().move(self.board, self._active_faller)
 
-    def shift_faller_right(self):
+    def shift_faller_right(self) -> bool:
         if not self._active_faller:
-            return
+            return False
 
-        FallerShiftRight().move(self.board, self._active_faller)
+        return FallerShiftRight().move(self.board, self._active_faller)
 
-    def rotate_faller_up(self):
+    def rotate_faller_up(self) -> bool:
         if not self._active_faller:
-            return
+            return False
 
-        FallerShuffleUp().move(self.board, self._active_faller, self.board, self._active_faller) # list twice for after move callback
+        return FallerShuffleUp().move(self.board, self._active_faller, self.board, self._active_faller) # list twice for after move callback
 
-    def rotate_faller_down(self):
+    def rotate_faller_down(self) -> bool:
         if not self._active_faller:
-            return
+            return False
+
+        return FallerShuffleDown().move(self.board, self._active_faller, self.board, self._active_faller) #list twice for after move callback
+
+    def hard_drop_faller(self) -> bool:
+        """
+            Drop the active faller straight down to where it lands, it lands on the next tick
+            :returns: true if the faller moved
+            :rtype: bool
+        """
+        if not self._active_faller:
+            return False
 
-        FallerShuffleDown().move(self.board, self._active_faller, self.board, self._active_faller) #list twice for after move callback
+        landing = self._landing_positions()
+        if landing == self._active_faller.positions:
+            return False
+        return FallerHardDrop(tuple(y for _, y in landing)).move(self.board, self._active_faller)
 
     def cycle_fallers(self) -> None:
-        LOGGER.info('Cycling fallers')
+        if TRACER.enabled:
+            TRACER.record(TraceKind.FALLER_CYCLE, self._fallen, self._fallers.drawn)
         if self._active_faller:
-            self._fallen.append(self._active_faller)
+            self._gameover = any(y > self.board.num_rows for _, y in self._active_faller.positions)
+            self._prev_faller = self._active_faller
+            self._fallen += 1
+            self._chain_depth = 0
             self._active_faller = None
         else:
-            self._active_faller = self._next_faller
-            self._next_faller = ColumnsFaller()
+            self._active_faller = self._fallers.pop()
 
     def drop_faller(self) -> None:
         if self.faller_can_fall():
-            for tile in self._active_faller.members:
-                SingleStepDescent().move(self.board, tile)
+            FallerDescent().move(self.board, self._active_faller)
         else:
             self.cycle_fallers()
 
     def faller_can_fall(self) -> bool:
-        """Determine whether the faller is able to fall"""
+        """Determine whether the faller is able to fall, from the height of its file"""
         if self._active_faller:
-            try:
-                bottom_of_faller = self._active_faller.members[0].position
-                return isinstance(self.board.tile_at(bottom_of_faller.x, bottom_of_faller.y - 1), NullTile)
-            except InvalidBoardPositionError:
-                LOGGER.error('Faller is at the bottom of the board')
-                return False
+            return self._active_faller.positions[0][1] > self.landing_row()
         return False
 
-    def collapse_all(self):
-        for tile in self.board:
-            AbsoluteDescent().move(self.board, tile)
+    def collapse_all(self) -> list:
+        """
+            Let every tile on the board fall as far as it can. Only the columns cells were cleared from
+            since the last collapse are swept, the others are already settled
+            :returns: the ((x, from_y), (x, to_y)) of each tile moved
+            :rtype: list
+        """
+        moved = ColumnGravity().apply(self.board, {x for x, _ in self._cleared})
+        self._cleared = []
+        self._collapsed = tuple(to for _, to in moved)
+        if TRACER.enabled:
+            TRACER.record(TraceKind.COLLAPSE, tuple(moved))
+        return moved
+
+    def snapshot(self) -> bytes:
+        """
+            Serialize this state to a compact byte string: the color code of every cell, the active faller,
+            the faller queue's seed, position and upcoming fallers, the score and a summary of the fallers placed.
+            The queue's random state is fully described by its seed and the number of fallers it generated
+            :returns: a snapshot that restore turns back into an equivalent state
+            :rtype: bytes
+        """
+        board, faller, fallers = self.board, self._active_faller, self._fallers
+        flags = GAME_OVER if self._gameover else 0
+        if isinstance(board, CompactColumnsBoard):
+            flags |= COMPACT_BOARD
+            cells = board.cells.tobytes()
+        else:
+            width = board.num_cols
+            cells = bytearray(width * board.num_rows)
+            for x, y in board.occupied:
+                cells[(y - 1) * width + (x - 1)] = COLOR_CODES[board.tile_at(x, y).color]
+        if self.FALLER_TYPE is CompactFaller:
+            flags |= COMPACT_FALLER
+        if faller:
+            flags |= HAS_FALLER
+        if isinstance(self._scoring, ChainScoring):
+            flags |= CHAIN_SCORING
+
+        seed = fallers.seed.to_bytes((fallers.seed.bit_length() + 8) // 8, 'little', signed=True)
+        parts = [
+                SNAPSHOT_HEADER.pack(
+                    SNAPSHOT_VERSION, flags, list(MATCHERS.values()).index(type(self._matcher)),
+                    list(ColumnsPhase).index(self._phase), self._chain_depth, board.num_cols, board.num_rows,
+                    self._points, self._fallen, len(self._cleared)
+                    ),
+                *(SNAPSHOT_CELL.pack(x, y) for x, y in self._cleared),
+                SNAPSHOT_QUEUE.pack(fallers.drawn, fallers.lookahead, fallers.batch, fallers.width, len(seed)),
+                seed,
+                *(SNAPSHOT_DRAW.pack(upcoming.descent_file, *upcoming.codes) for upcoming in fallers.upcoming)
+                ]
+        if faller:
+            parts.append(SNAPSHOT_FALLER.pack(faller.descent_file, *(y for _, y in faller.positions), *faller.codes))
+        parts.append(cells)
+        return b''.join(parts)
+
+    @staticmethod
+    def restore(snapshot: bytes) -> 'ColumnsGameState':
+        """
+            Build the state a snapshot was taken of
+            :arg snapshot: the result of snapshot
+            :arg type: bytes
+            :returns: a state equivalent to the one the snapshot was taken of, on its own board
+            :rtype: ColumnsGameState
+            :raises: ValueError if the snapshot was taken by another snapshot version or is truncated
+        """
+        try:
+            version, flags, matcher, phase, chain_depth, cols, rows, points, fallen, cleared = \
+                    SNAPSHOT_HEADER.unpack_from(snapshot)
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f'Snapshot version {version} is not supported')
+            offset = SNAPSHOT_HEADER.size
+            cleared = [SNAPSHOT_CELL.unpack_from(snapshot, offset + i * SNAPSHOT_CELL.size) for i in range(cleared)]
+            offset += len(cleared) * SNAPSHOT_CELL.size
+            drawn, lookahead, batch, width, seed_length = SNAPSHOT_QUEUE.unpack_from(snapshot, offset)
+            offset += SNAPSHOT_QUEUE.size
+            seed = int.from_bytes(snapshot[offset:offset + seed_length], 'little', signed=True)
+            offset += seed_length
+            upcoming = []
+            for _ in range(lookahead):
+                descent_file, *codes = SNAPSHOT_DRAW.unpack_from(snapshot, offset)
+                upcoming.append((descent_file, tuple(codes)))
+                offset += SNAPSHOT_DRAW.size
+            faller = None
+            if flags & HAS_FALLER:
+                faller = SNAPSHOT_FALLER.unpack_from(snapshot, offset)
+                offset += SNAPSHOT_FALLER.size
+        except struct.error as err:
+            raise ValueError('Snapshot is truncated') from err
+        cells = snapshot[offset:]
+        if len(cells) != cols * rows:
+            raise ValueError(f'Snapshot holds {len(cells)} cells for a {cols}x{rows} board')
+
+        state_type = CompactFallerGameState if flags & COMPACT_FALLER else ColumnsGameState
+        board = BoardFactory.create_board(CompactColumnsBoard if flags & COMPACT_BOARD else ColumnsBoard, cols, rows)
+        fallers = FallerQueue(seed, lookahead, width, batch, state_type.FALLER_TYPE, drawn, tuple(upcoming), rows)
+        scoring_type = ChainScoring if flags & CHAIN_SCORING else ColumnsScoring
+        state = state_type(board, scoring_type.with_points(points), list(MATCHERS.values())[matcher], fallers)
+        state._points = points
+        state._fallen = fallen
+        state._gameover = bool(flags & GAME_OVER)
+        state._phase = list(ColumnsPhase)[phase]
+        state._chain_depth = chain_depth
+        state._cleared = cleared
+
+        on_faller = ()
+        if faller:
+            descent_file, member_rows, codes = faller[0], faller[1:4], faller[4:]
+            if state_type.FALLER_TYPE is CompactFaller:
+                state._active_faller = CompactFaller(descent_file=descent_file, codes=codes, pool=fallers.pool, row=member_rows[0])
+            else:
+                state._active_faller = ColumnsFaller(descent_file=descent_file, codes=codes, pool=fallers.pool, rows=member_rows)
+                on_faller = {(descent_file, y) for y in member_rows}
+
+        if flags & COMPACT_BOARD:
+            board.load_cells(cells)
+            return state
+        for index, code in enumerate(cells):
+            y, x = divmod(index, cols)
+            if code != NULL_CODE and (x + 1, y + 1) not in on_faller:
+                board.place_tile(fallers.pool.acquire(x + 1, y + 1, CODE_COLORS[code]))
+        if on_faller:
+            FallerMovementRule.resit_faller(board, state._active_faller)
+        return state
+
+    def clone(self) -> 'ColumnsGameState':
+        """
+            Copy this state through a snapshot, sharing nothing with it
+            :returns: an equivalent state on its own board
+            :rtype: ColumnsGameState
+        """
+        return ColumnsGameState.restore(self.snapshot())
 
 
-class ColumnsGameLoop(GameLoop):
+class CompactFallerGameState(ColumnsGameState):
     """
-        Game loop logic for columns
+        Columns game state logic for fallers kept as CompactFaller values. Moving the active faller
+        only updates its integers, its tiles are placed on the board once it lands
     """
-    P1_BIND = {'up': 'w', 'down': 's', 'left': 'a', 'right': 'd'}
-    P2_BIND = {'up': 'i', 'down': 'k', 'left': 'j', 'right': 'l'}
+    FALLER_TYPE = CompactFaller
 
-    __count = 1
+    @property
+    def floating(self) -> tuple:
+        """
+            Return the cells of the active faller that are on the board, as the faller is not placed until it lands
+            :rtype: tuple of ((x, y), color)
+        """
+        if not self._active_faller:
+            return ()
+        return tuple(
+                (position, color)
+                for position, color in zip(self._active_faller.positions, self._active_faller.colors)
+                if position[1] <= self.board.num_rows
+                )
+
+    def _shift(self, step: int) -> bool:
+        """
+            Helper method for moving the active faller sideways if nothing is in the way
+            :arg step: files to move by, negative for left
+            :arg type: int
+            :returns: true if the faller moved
+            :rtype: bool
+        """
+        faller = self._active_faller
+        if not faller:
+            return False
+        moved = faller.can_shift(self.board, step)
+        if moved:
+            faller.shift(step)
+        if TRACER.enabled:
+            TRACER.record(TraceKind.MOVE if moved else TraceKind.REVERT, 'CompactFaller.shift', step, faller.positions)
+        return moved
+
+    def _rotate(self, step: int) -> bool:
+        """
+            Helper method for rotating the members of the active faller
+            :arg step: 1 moves the bottom member to the top, -1 moves the top member to the bottom
+            :arg type: int
+            :returns: true if the faller rotated
+            :rtype: bool
+        """
+        if not self._active_faller:
+            return False
+        self._active_faller.rotate(step)
+        if TRACER.enabled:
+            TRACER.record(TraceKind.MOVE, 'CompactFaller.rotate', step, self._active_faller.positions)
+        return True
 
-    def __init__(self, state, view, delay):
-        super().__init__(state, view, delay)
-        if ColumnsGameLoop.__count % 2 == 0:
-            self.bind_inputs(self.P2_BIND)
+    def _stack_height(self, faller) -> int:
+        """
+            Helper method for finding the topmost tile under a faller, which is not placed on the board until it lands
+            :arg faller: the faller falling
+            :returns: the row of the topmost tile under the faller, 0 if there is none
+            :rtype: int
+        """
+        return self.board.column_height(faller.descent_file)
+
+    def _landing_positions(self) -> tuple:
+        """
+            Helper method for finding where each member of the active faller lands
+            :returns: position of each member once landed, from the bottom up
+            :rtype: tuple
+        """
+        faller, row = self._active_faller, self.landing_row()
+        return tuple((faller.descent_file, row + member) for member in range(faller.SIZE))
+
+    def shift_faller_left(self) -> bool:
+        return self._shift(-1)
+
+    def shift_faller_right(self) -> bool:
+        return self._shift(1)
+
+    def rotate_faller_up(self) -> bool:
+        return self._rotate(-1)
+
+    def rotate_faller_down(self) -> bool:
+        return self._rotate(1)
+
+    def hard_drop_faller(self) -> bool:
+        faller = self._active_faller
+        if not faller:
+            return False
+        row = self.landing_row()
+        moved = row != faller.row
+        if moved:
+            faller.drop_to(row)
+        if TRACER.enabled:
+            TRACER.record(TraceKind.MOVE if moved else TraceKind.REVERT, 'CompactFaller.drop_to', row, faller.positions)
+        return moved
+
+    def cycle_fallers(self) -> None:
+        if TRACER.enabled:
+            TRACER.record(TraceKind.FALLER_CYCLE, self._fallen, self._fallers.drawn)
+        if self._active_faller:
+            self._gameover = self._active_faller.land(self.board)
+            self._prev_faller = self._active_faller
+            self._fallen += 1
+            self._chain_depth = 0
+            self._active_faller = None
         else:
-            self.bind_inputs(self.P1_BIND)
-        ColumnsGameLoop.__count += 1
+            self._active_faller = self._fallers.pop()
+
+    def drop_faller(self) -> None:
+        if self.faller_can_fall():
+            self._active_faller.fall()
+        else:
+            self.cycle_fallers()
 
+    def faller_can_fall(self) -> bool:
+        """Determine whether the faller is able to fall, from the height of its file"""
+        if self._active_faller:
+            return self._active_faller.row > self.landing_row()
+        return False
+
+
+class ColumnsLoopLogic:
+    """
+        Game loop logic for columns, shared by every loop that drives a ColumnsGameState
+    """
 
     def tick(self):
         self.state.drop_faller()
@@ -162,28 +710,82 @@ class ColumnsGameLoop(GameLoop):
     def find_matches(self, match_rules):
         if self.state.active_faller:
             return []
-        return [
-            match_rule().check_match(self.state.board, x, y)
-            for match_rule in match_rules
-            for x in range(1, self.state.board.num_cols + 1)
-            for y in range(1, self.state.board.num_rows + 1)
-            if match_rule().check_match(self.state.board, x, y) is not None
-        ]
+        return self.state.find_matches(match_rules)
 
     def clear_matches(self, matches):
         for match in matches:
-            self._state.clear_match(match)
-            self._state.adjust_score(match)
-
+            self.state.clear_match(match)
+        if matches:
+            self.state.award_matches(matches)
 
     def clean_up_state(self):
         self.state.collapse_all()
-        time.sleep(1)
+
+    def resolve(self) -> Resolution:
+        return self.state.resolve()
+
+
+class PhasedLoopLogic(ColumnsLoopLogic):
+    """
+        Game loop logic for columns that spreads clearing and collapsing matches across ticks of
+        the loop's own timer instead of blocking, so the view can show each phase and other games
+        hosted alongside keep running.
+        A landing that makes matches clears them and enters the clearing phase, the next tick
+        collapses the board and enters the collapsing phase, where any chained matches are cleared
+        in turn. The faller only moves again once a collapse finds no match
+    """
+
+    def tick(self):
+        if self.state.phase == ColumnsPhase.CLEARING:
+            self.state.collapse_all()
+            self.state.phase = ColumnsPhase.COLLAPSING
+            return
+        if self.state.phase == ColumnsPhase.FALLING:
+            super().tick()
+
+    def find_matches(self, match_rules):
+        if self.state.phase == ColumnsPhase.CLEARING:
+            return []
+        matches = super().find_matches(match_rules)
+        if not matches and self.state.phase == ColumnsPhase.COLLAPSING:
+            self.state.phase = ColumnsPhase.FALLING
+        return matches
+
+    def clear_matches(self, matches):
+        super().clear_matches(matches)
+        if matches:
+            self.state.phase = ColumnsPhase.CLEARING
+
+    def clean_up_state(self):
+        """Collapsing waits for the next tick"""
+
+
+class ColumnsGameLoop(PhasedLoopLogic, GameLoop):
+    """
+        Game loop logic for columns
+    """
+    P1_BIND = {'up': 'w', 'down': 's', 'left': 'a', 'right': 'd', 'drop': 'e'}
+    P2_BIND = {'up': 'i', 'down': 'k', 'left': 'j', 'right': 'l', 'drop': 'o'}
+
+    __count = 1
+
+    def __init__(self, state, view, delay):
+        super().__init__(state, view, delay)
+        if METRICS.enabled:
+            METRICS.track(self)
+        if RECORDER.enabled:
+            RECORDER.record(self, phased=True)
+        if ColumnsGameLoop.__count % 2 == 0:
+            self.bind_inputs(self.P2_BIND)
+        else:
+            self.bind_inputs(self.P1_BIND)
+        ColumnsGameLoop.__count += 1
 
     
-    def bind_inputs(self, bindings = {'up': 'w', 'down': 's', 'left': 'a', 'right': 'd'}):
+    def bind_inputs(self, bindings = {'up': 'w', 'down': 's', 'left': 'a', 'right': 'd', 'drop': 'e'}):
         self.view.bind_key(f'<KeyRelease-{bindings["left"]}>', ShiftFallerLeft(self.state))
         self.view.bind_key(f'<KeyRelease-{bindings["right"]}>', ShiftFallerRight(self.state))
         self.view.bind_key(f'<KeyRelease-{bindings["up"]}>', RotateFallerUp(self.state))
         self.view.bind_key(f'<KeyRelease-{bindings["down"]}>', RotateFallerDown(self.state))
+        self.view.bind_key(f'<KeyRelease-{bindings["drop"]}>', HardDropFaller(self.state))
 
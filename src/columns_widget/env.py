@@ -0,0 +1,232 @@
+"""
+    :module_name: env
+    :module_summary: a gym-style environment stepping many headless columns games at once
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+import logging
+import time
+
+from .batched import np, BatchedColumns, INPUT_CODES, NO_INPUT
+from .game_model import ColumnsBoard, ColumnsScoring
+from .headless import ColumnsInput
+
+LOGGER = logging.getLogger(__name__)
+
+# action of each index of the action space
+ACTIONS = (
+        NO_INPUT,
+        INPUT_CODES[ColumnsInput.SHIFT_LEFT],
+        INPUT_CODES[ColumnsInput.SHIFT_RIGHT],
+        INPUT_CODES[ColumnsInput.ROTATE_UP],
+        INPUT_CODES[ColumnsInput.ROTATE_DOWN],
+        INPUT_CODES[ColumnsInput.HARD_DROP]
+        )
+ACTION_NAMES = ('noop', 'shift_left', 'shift_right', 'rotate_up', 'rotate_down', 'hard_drop')
+# columns of the faller observation
+FALLER_FIELDS = ('file', 'row', 'bottom', 'middle', 'top', 'next_file', 'next_bottom', 'next_middle', 'next_top')
+
+
+class ColumnsVectorEnv:
+    """
+        Many columns games behind a reset/step API. Every game plays on its own seed, a game that ends is
+        started again on the next unused seed within the same step, reusing its arrays
+    """
+
+    def __init__(
+            self,
+            num_envs: int,
+            seed: int = 0,
+            width: int = ColumnsBoard.COLUMNS_BOARD_WIDTH,
+            height: int = ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+            max_episode_ticks: int = None,
+            scoring: ColumnsScoring = None
+            ):
+        """
+            :arg num_envs: number of games stepped together
+            :arg seed: seed of the first game, later games count up from it
+            :arg width: number of columns on every board
+            :arg height: number of rows on every board
+            :arg max_episode_ticks: optional number of ticks after which a game is truncated and started again
+            :arg scoring: scoring rewarding matches, a ColumnsScoring if not given
+            :arg type: int
+            :arg type: int
+            :arg type: int
+            :arg type: int
+            :arg type: int
+            :arg type: ColumnsScoring
+        """
+        if num_envs < 1:
+            raise ValueError(f'An environment needs at least one game, not {num_envs}')
+        self._num_envs = num_envs
+        self._width = width
+        self._height = height
+        self._max_episode_ticks = max_episode_ticks
+        self._scoring = scoring
+        self._actions = np.array(ACTIONS, dtype=np.uint8)
+        self._faller = np.zeros((num_envs, len(FALLER_FIELDS)), dtype=np.int16)
+        self._rewards = np.zeros(num_envs, dtype=np.int64)
+        self._last_points = np.zeros(num_envs, dtype=np.int64)
+        self._seeds = np.zeros(num_envs, dtype=np.int64)
+        self._batch = None
+        self._observations = None
+        self._next_seed = seed
+        self._episodes = 0
+        self._steps = 0
+        self._seconds = 0.0
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def num_envs(self) -> int:
+        """
+            View of the number of games stepped together
+            :rtype: int
+        """
+        return self._num_envs
+
+    @property
+    def action_count(self) -> int:
+        """
+            View of the number of actions, each action is an index of ACTIONS
+            :rtype: int
+        """
+        return len(ACTIONS)
+
+    @property
+    def observation_shapes(self) -> dict:
+        """
+            View of the shape of each observation array
+            :rtype: dict
+        """
+        return {'board': (self._num_envs, self._height, self._width), 'faller': self._faller.shape}
+
+    @property
+    def batch(self) -> BatchedColumns:
+        """
+            View of the batched games behind the environment, None until reset
+            :rtype: BatchedColumns
+        """
+        return self._batch
+
+    @property
+    def episodes(self) -> int:
+        """
+            View of the number of games finished, by game over or truncation
+            :rtype: int
+        """
+        return self._episodes
+
+    @property
+    def steps(self) -> int:
+        """
+            View of the number of game steps taken, one per game per call to step
+            :rtype: int
+        """
+        return self._steps
+
+    @property
+    def steps_per_second(self) -> float:
+        """
+            View of the game steps taken per second spent in step
+            :rtype: float
+        """
+        return self._steps / self._seconds if self._seconds else 0.0
+
+    def sample_actions(self):
+        """
+            Draw a random action for every game
+            :returns: index into ACTIONS of the action of each game
+            :rtype: numpy.ndarray of int
+        """
+        return self._rng.integers(0, len(ACTIONS), size=self._num_envs)
+
+    def reset(self, seed: int = None) -> tuple:
+        """
+            Start every game again, the first step of each game draws its first faller
+            :arg seed: seed of the first game, later games count up from it, carries on from the last seed used if not given
+            :arg type: int
+            :returns: the observations and an info dict holding the seed of each game
+            :rtype: tuple
+        """
+        if seed is not None:
+            self._next_seed = seed
+        seeds = range(self._next_seed, self._next_seed + self._num_envs)
+        self._next_seed += self._num_envs
+        self._batch = BatchedColumns(seeds, self._width, self._height, scoring=self._scoring)
+        self._seeds[:] = seeds
+        self._observations = {'board': self._batch.cells, 'faller': self._faller}
+        self._last_points[:] = 0
+        self._observe()
+        return self._observations, {'seeds': self._seeds.copy()}
+
+    def step(self, actions) -> tuple:
+        """
+            Give every game its action and run one tick of each, starting finished games again
+            :arg actions: index into ACTIONS of the action of each game
+            :arg type: array-like of int
+            :returns: the observations, the points each game scored, which games ended, which games were
+                      truncated and an info dict holding the points, ticks and seed of each finished game.
+                      The observation arrays are updated in place by the next step
+            :rtype: tuple
+        """
+        if self._batch is None:
+            raise RuntimeError('Reset the environment before stepping it')
+        started = time.perf_counter()
+        batch = self._batch
+        batch.step(self._actions[actions])
+        np.subtract(batch.points, self._last_points, out=self._rewards)
+        terminated = batch.gameover.copy()
+        truncated = ~terminated & (batch.ticks >= self._max_episode_ticks) if self._max_episode_ticks \
+                else np.zeros_like(terminated)
+        info = {}
+        finished = np.flatnonzero(terminated | truncated)
+        if len(finished):
+            info = self._restart(finished)
+        self._last_points[:] = batch.points
+        self._observe()
+        self._steps += self._num_envs
+        self._seconds += time.perf_counter() - started
+        return self._observations, self._rewards, terminated, truncated, info
+
+    def close(self) -> None:
+        """
+            Report the pace the environment stepped at
+            :returns: nothing
+            :rtype: None
+        """
+        LOGGER.info('%d steps over %d episodes at %.1f steps/s', self._steps, self._episodes, self.steps_per_second)
+
+    def _restart(self, games) -> dict:
+        """
+            Helper method for starting finished games again on fresh seeds, their first tick draws their first faller
+            :arg games: index of each finished game
+            :returns: the points, ticks and seed of each finished game
+            :rtype: dict
+        """
+        batch = self._batch
+        info = {
+                'finished': games,
+                'episode_points': batch.points[games],
+                'episode_ticks': batch.ticks[games],
+                'episode_seeds': self._seeds[games],
+                }
+        seeds = range(self._next_seed, self._next_seed + len(games))
+        self._next_seed += len(games)
+        self._episodes += len(games)
+        batch.reset(games, seeds)
+        self._seeds[games] = seeds
+        return info
+
+    def _observe(self) -> None:
+        """
+            Helper method for writing the faller of every game into the faller observation
+            :returns: nothing
+            :rtype: None
+        """
+        batch = self._batch
+        faller = self._faller
+        faller[:, 0] = np.where(batch.active, batch.faller_files, 0)
+        faller[:, 1] = np.where(batch.active, batch.faller_rows, 0)
+        faller[:, 2:5] = np.where(batch.active[:, None], batch.faller_codes, 0)
+        faller[:, 5] = batch.next_files
+        faller[:, 6:9] = batch.next_codes
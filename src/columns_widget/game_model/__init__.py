@@ -4,10 +4,16 @@
     :module_author: Nathan Mendoza (nathancm@uci.edu)
 """
 
+from .tracing import TRACER, Tracer, TraceKind, TraceEvent
 from .columns_tile import ColumnsColor, ColumnsTile, ColumnsFaller
+from .tile_pool import null_tile, TilePool, NULL_COLOR
 from .columns_board import ColumnsBoard
-from .columns_scoring import ColumnsScoring
-from .tile_movements import SingleStepDescent, AbsoluteDescent
+from .compact_board import CompactColumnsBoard
+from .compact_faller import CompactFaller
+from .faller_source import FallerQueue
+from .columns_scoring import ColumnsScoring, ChainScoring
+from .resolution import Resolution, ResolutionStep, ColumnsPhase
+from .tile_movements import SingleStepDescent, AbsoluteDescent, ColumnGravity
 from .match_rules import (
         ThreeFoldNorth,
         ThreeFoldEast,
@@ -18,10 +24,13 @@ from .match_rules import (
         ThreeFoldSouthWest,
         ThreeFoldNorthWest
         )
+from .matchers import FullScanMatcher, DirtyRegionMatcher, BitboardMatcher, MATCHERS
 from .faller_movements import (
         FallerMovementRule,
         FallerShiftRight,
         FallerShiftLeft,
         FallerShuffleUp,
-        FallerShuffleDown
+        FallerShuffleDown,
+        FallerHardDrop,
+        FallerDescent
         )
@@ -0,0 +1,98 @@
+"""
+    :module_name: bitboard
+    :module_summary: bitboard helpers for finding streaks of one color on a columns board
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+# Cells are numbered row by row starting at the bottom left, with one always
+# empty guard column after each row so streaks cannot wrap around an edge
+
+def cell_bit(x: int, y: int, width: int) -> int:
+    """
+        Bit index of a board position
+        :arg x: x coordinate of the position
+        :arg y: y coordinate of the position
+        :arg width: number of columns on the board
+        :arg type: int
+        :arg type: int
+        :arg type: int
+        :returns: index of the position's bit
+        :rtype: int
+    """
+    return (y - 1) * (width + 1) + (x - 1)
+
+def keyed_boards(cells, width: int, height: int) -> dict:
+    """
+        Build one bitboard per key from the cells holding that key. Bits are set in a byte buffer per key
+        and turned into an int once, so building a board costs one pass over its cells whatever its size
+        :arg cells: (key, x, y) of each cell holding a key
+        :arg width: number of columns on the board
+        :arg height: number of rows on the board
+        :arg type: iterable of tuple
+        :arg type: int
+        :arg type: int
+        :returns: bitboard of each key present
+        :rtype: dict
+    """
+    size = (height * (width + 1) + 7) // 8
+    buffers = {}
+    for key, x, y in cells:
+        if key not in buffers:
+            buffers[key] = bytearray(size)
+        bit = cell_bit(x, y, width)
+        buffers[key][bit >> 3] |= 1 << (bit & 7)
+    return {key: int.from_bytes(buffer, 'little') for key, buffer in buffers.items()}
+
+def code_boards(codes, width: int) -> dict:
+    """
+        Build one bitboard per color from a flat sequence of color codes
+        :arg codes: color code of each cell, row by row starting at the bottom, 0 for empty cells
+        :arg width: number of columns on the board
+        :arg type: sequence of int
+        :arg type: int
+        :returns: bitboard of each color code present
+        :rtype: dict
+    """
+    return keyed_boards(
+            ((code, index % width + 1, index // width + 1) for index, code in enumerate(codes) if code),
+            width,
+            len(codes) // width
+            )
+
+def streak_starts(bits: int, width: int, delta: (int, int), streak: int) -> int:
+    """
+        Find the cells that start a streak of set bits in the given direction
+        :arg bits: bitboard of a single color
+        :arg width: number of columns on the board
+        :arg delta: x and y step taken between members of a streak
+        :arg streak: number of members in a streak
+        :arg type: int
+        :arg type: int
+        :arg type: tuple
+        :arg type: int
+        :returns: bitboard of the cells starting a streak
+        :rtype: int
+    """
+    shift = delta[1] * (width + 1) + delta[0]
+    starts = bits
+    for i in range(1, streak):
+        step = shift * i
+        starts &= bits >> step if step > 0 else bits << -step
+    return starts
+
+def positions(bits: int, width: int):
+    """
+        Iterate over the board positions of the set bits of a bitboard
+        :arg bits: the bitboard
+        :arg width: number of columns on the board
+        :arg type: int
+        :arg type: int
+        :returns: (x, y) of each set bit, in bit order
+        :rtype: generator
+    """
+    stride = width + 1
+    while bits:
+        low = bits & -bits
+        row, col = divmod(low.bit_length() - 1, stride)
+        yield col + 1, row + 1
+        bits ^= low
@@ -4,7 +4,9 @@
     :module_author: Nathan Mendoza (nathancm@uci.edu)
 """
 
-from tilematch_tools.model import GameBoard
+from tilematch_tools.model import GameBoard, Tile, NullTile
+
+from .tile_pool import null_tile
 
 class ColumnsBoard(GameBoard):
     """
@@ -12,3 +14,109 @@ class ColumnsBoard(GameBoard):
     """
     COLUMNS_BOARD_HEIGHT = 13
     COLUMNS_BOARD_WIDTH = 7
+
+    def __init__(self, *args, **kwargs):
+        self._trackers = []
+        self._occupied = set()
+        self._heights = {}
+        self._version = 0
+        super().__init__(*args, **kwargs)
+
+    def track_changes(self) -> set:
+        """
+            Register a new change tracker on this board
+            :returns: a set that collects the (x, y) position of every tile placed from now on
+            :rtype: set
+        """
+        tracker = set()
+        self._trackers.append(tracker)
+        return tracker
+
+    def place_tile(self, tile: Tile) -> None:
+        """
+            Place a tile on the board, keeping the occupancy and height indexes, the version and every change tracker up to date
+            :arg tile: the tile to place
+            :arg type: Tile
+            :returns: nothing
+            :rtype: None
+        """
+        super().place_tile(tile)
+        self._version += 1
+        x, y = tile.position.x, tile.position.y
+        held = (x, y) in self._occupied
+        if isinstance(tile, NullTile):
+            if held:
+                self._occupied.discard((x, y))
+                self._heights[x] -= 1
+        elif not held:
+            self._occupied.add((x, y))
+            self._heights[x] = self._heights.get(x, 0) + 1
+        self._record_change(x, y)
+
+    @property
+    def version(self) -> int:
+        """
+            View of the version of the board, which grows whenever a cell may have changed
+            :rtype: int
+        """
+        return self._version
+
+    @property
+    def occupied(self) -> set:
+        """
+            View of the positions holding a tile
+            :rtype: set
+        """
+        return self._occupied
+
+    def column_height(self, x: int) -> int:
+        """
+            Get the number of tiles in a column, kept up to date as tiles are placed.
+            Once the column is settled this is the row of its topmost tile
+            :arg x: the column
+            :arg type: int
+            :returns: the number of tiles in the column
+            :rtype: int
+        """
+        return self._heights.get(x, 0)
+
+    def can_hold(self, x: int, y: int) -> bool:
+        """
+            Determine whether a falling tile can move to a position, without raising.
+            Positions above a column are staged and can always hold a tile
+            :arg x: x coordinate of the position
+            :arg y: y coordinate of the position
+            :arg type: int
+            :arg type: int
+            :returns: true if the position is staged or a free cell of the board
+            :rtype: bool
+        """
+        if not (1 <= x <= self.num_cols and 1 <= y):
+            return False
+        return y > self.num_rows or (x, y) not in self._occupied
+
+    def compact_column(self, x: int) -> (int, list):
+        """
+            Let every tile in a column fall as far as it can, in a single sweep up the column
+            :arg x: the column to compact
+            :arg type: int
+            :returns: the height of the compacted column and the ((x, from_y), (x, to_y)) of each tile moved
+            :rtype: tuple
+        """
+        moves = []
+        landing = 1
+        for y in range(1, self.num_rows + 1):
+            tile = self.tile_at(x, y)
+            if isinstance(tile, NullTile):
+                continue
+            if y != landing:
+                tile.position = (x, landing)
+                self.place_tile(tile)
+                self.place_tile(null_tile(x, y))
+                moves.append(((x, y), (x, landing)))
+            landing += 1
+        return landing - 1, moves
+
+    def _record_change(self, x: int, y: int) -> None:
+        for tracker in self._trackers:
+            tracker.add((x, y))
@@ -9,6 +9,30 @@ from tilematch_tools.model import Scoring, MatchCondition
 class ColumnsScoring(Scoring):
     """Class representing the columns scoring system"""
 
+    @classmethod
+    def with_points(cls, points: int):
+        """
+            Build a scoring that has already awarded some points, for resuming a game
+            :arg points: the points already awarded
+            :arg type: int
+            :returns: the scoring
+            :rtype: ColumnsScoring
+        """
+        scoring = cls()
+        scoring.award_points(points)
+        return scoring
+
+    def award_points(self, points: int) -> None:
+        """
+            Award points that are not tied to a single match, such as every match of a chain pass together
+            :arg points: the points to award
+            :arg type: int
+            :returns: nothing
+            :rtype: None
+        """
+        if points:
+            self.award_for_match(MatchCondition.MatchFound(points, []))
+
     def award_for_match(self, match: MatchCondition.MatchFound):
         """
             award the points specified by a given match condition to the score
@@ -18,3 +42,27 @@ class ColumnsScoring(Scoring):
             :rtype: None
         """
         super().award_for_match(match)
+
+    def chain_multiplier(self, depth: int) -> int:
+        """
+            The number of times matches cleared at a given depth of a chain are awarded
+            :arg depth: position in the chain of the pass clearing the matches, starting at 1
+            :arg type: int
+            :returns: multiplier of the match points, columns awards every depth once
+            :rtype: int
+        """
+        return 1
+
+
+class ChainScoring(ColumnsScoring):
+    """Columns scoring that rewards chains, each pass of a chain is worth its depth times its points"""
+
+    def chain_multiplier(self, depth: int) -> int:
+        """
+            The number of times matches cleared at a given depth of a chain are awarded
+            :arg depth: position in the chain of the pass clearing the matches, starting at 1
+            :arg type: int
+            :returns: multiplier of the match points, the depth itself so each pass of a chain is worth more
+            :rtype: int
+        """
+        return depth
@@ -9,7 +9,6 @@ import logging
 from enum import StrEnum
 
 from tilematch_tools.model import Tile, MovementRule
-from tilematch_tools.core import TileBuilder
 
 from .columns_board import ColumnsBoard
 
@@ -25,54 +24,85 @@ class ColumnsColor(StrEnum):
     MAGENTA = "#b71ceb"
 
 
+NULL_CODE = 0
+COLOR_CODES = {color: code for code, color in enumerate(ColumnsColor, 1)}
+CODE_COLORS = (None, *ColumnsColor)
+COLOR_CHARS = {color: color.name[0] for color in ColumnsColor}
+
+
 class ColumnsTile(Tile):
     """Class representing a colums tile"""
 
     def __repr__(self):
         """Sane string representation"""
-        if self.color == ColumnsColor.RED:
-            return 'R'
-        if self.color == ColumnsColor.ORANGE:
-            return 'O'
-        if self.color == ColumnsColor.YELLOW:
-            return 'Y'
-        if self.color == ColumnsColor.GREEN:
-            return 'G'
-        if self.color == ColumnsColor.BLUE:
-            return 'B'
-        if self.color == ColumnsColor.MAGENTA:
-            return 'M'
-        return '?'
+        return COLOR_CHARS.get(self.color, '?')
 
 class ColumnsFaller:
-    """Class representing a falling tile group"""
+    """
+        Class representing a falling tile group. Members are staged on the row above the board
+        they fall onto and are only placed on it once they descend into its rows
+    """
+    __slots__ = ('_members', '_positions')
+    # staged row above a board of the default size
     STAGED = ColumnsBoard.COLUMNS_BOARD_HEIGHT + 1
 
-    def __init__(self):
-        self._descent_file = random.randint(1, ColumnsBoard.COLUMNS_BOARD_WIDTH)
-        self._members = self._random_set_of_three()
-
-    def _random_set_of_three(self) -> (ColumnsTile, ColumnsTile, ColumnsTile):
+    def __init__(
+            self,
+            rng = random,
+            descent_file: int = None,
+            codes: tuple = None,
+            pool = None,
+            row: int = STAGED,
+            width: int = ColumnsBoard.COLUMNS_BOARD_WIDTH,
+            rows: tuple = None
+            ):
+        """
+            :arg rng: source of randomness, the random module or a random.Random
+            :arg descent_file: file to fall down, chosen at random if not given
+            :arg codes: color codes of the members from the bottom up, chosen at random if not given
+            :arg pool: optional TilePool the members are taken from
+            :arg row: row the members are staged on, the row above the board they fall onto
+            :arg width: number of files of the board, the descent file is chosen from
+            :arg rows: optional row of each member from the bottom up, for a faller that has already fallen
+            :arg type: random.Random
+            :arg type: int
+            :arg type: tuple of int
+            :arg type: TilePool
+            :arg type: int
+            :arg type: int
+            :arg type: tuple of int
         """
-            Helper method for generating a random set of three tiles
-            :returns: random tile set
+        descent_file = descent_file or rng.randint(1, width)
+        self._positions = None
+        if codes is None:
+            codes = self._random_codes(rng)
+        rows = rows or (row,) * len(codes)
+        self._members = [self._columns_tile(CODE_COLORS[code], descent_file, y, pool) for code, y in zip(codes, rows)]
+
+    @staticmethod
+    def _random_codes(rng) -> tuple:
+        """
+            Helper method for choosing the color codes of a random set of three tiles
+            :arg rng: source of randomness, the random module or a random.Random
+            :returns: three color codes
             :rtype: tuple
         """
-        return [
-                self._random_columns_tile()
-                for _ in range(3)
-                ]
+        return tuple(rng.randint(1, len(ColumnsColor)) for _ in range(3))
 
-    def _random_columns_tile(self) -> ColumnsTile:
+    @staticmethod
+    def _columns_tile(color: ColumnsColor, descent_file: int, row: int, pool) -> ColumnsTile:
         """
-            Helper method for generating a random columns tile
-            :returns: random tile
+            Helper method for getting a staged member tile, from the pool if one is given
+            :arg color: color of the tile
+            :arg descent_file: file the tile is staged in
+            :arg row: row the tile is staged on
+            :arg pool: the TilePool to take the tile from or None
+            :returns: the tile
             :rtype: ColumnsTile
         """
-        return TileBuilder() \
-                .add_position(self._descent_file, self.STAGED) \
-                .add_color(random.choice(list(ColumnsColor))) \
-                .construct(tile_type=ColumnsTile)
+        if pool:
+            return pool.acquire(descent_file, row, color)
+        return ColumnsTile(**{'position': (descent_file, row), 'color': color})
 
     @property
     def members(self):
@@ -83,6 +113,22 @@ class ColumnsFaller:
         """
         return self._members
 
+    @property
+    def colors(self) -> tuple:
+        """
+            View of the color of each member from the bottom up
+            :rtype: tuple of ColumnsColor
+        """
+        return tuple(member.color for member in self._members)
+
+    @property
+    def codes(self) -> tuple:
+        """
+            View of the color code of each member from the bottom up
+            :rtype: tuple of int
+        """
+        return tuple(COLOR_CODES[member.color] for member in self._members)
+
     @property
     def size(self):
         """
@@ -95,19 +141,29 @@ class ColumnsFaller:
     @property
     def positions(self) -> tuple:
         """
-            View of the positions of tiles in faller
+            View of the positions of tiles in faller, cached until a FallerMovementRule moves the faller
             :returns: collection of tile positions
             :rtype: tuple
         """
-        return tuple(
-                (member.position.x, member.position.y) for member in self._members
-                )
+        if self._positions is None:
+            self._positions = tuple(
+                    (member.position.x, member.position.y) for member in self._members
+                    )
+        return self._positions
+
+    def moved(self) -> None:
+        """
+            Forget the cached positions of the members, called by FallerMovementRule whenever it moves them
+            :returns: nothing
+            :rtype: None
+        """
+        self._positions = None
 
     @property
     def descent_file(self) -> int:
         """
-            View of the descent file is faller is on
+            View of the descent file is faller is on, followed from its members as they shift
             :returns: faller's descent file
             :rtype: int
         """
-        return self._descent_file
+        return self._members[0].position.x
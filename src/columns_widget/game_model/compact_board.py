@@ -0,0 +1,211 @@
+"""
+    :module_name: compact_board
+    :module_summary: array backed game board for columns tile matching game
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+from array import array
+
+from tilematch_tools.model import Tile, NullTile
+from tilematch_tools.model.exceptions import IllegalTileMovementException, InvalidBoardPositionError
+
+from .columns_board import ColumnsBoard
+from .columns_tile import ColumnsTile, NULL_CODE, COLOR_CODES, CODE_COLORS
+from .tile_pool import null_tile
+
+class CompactColumnsBoard(ColumnsBoard):
+    """
+        Class representing a columns gameboard whose cells are stored as one byte color codes.
+        Tiles returned by tile_at and iteration are views built on demand, so the board
+        holds no tile objects of its own
+    """
+
+    def __init__(self, num_cols: int, num_rows: int):
+        # the flat code array replaces the tile grid kept by GameBoard
+        # pylint: disable=super-init-not-called
+        self._num_cols = num_cols
+        self._num_rows = num_rows
+        self._cells = array('B', bytes(num_cols * num_rows))
+        self._heights = [0] * (num_cols + 1)
+        self._version = 0
+        self._trackers = []
+
+    @property
+    def num_cols(self) -> int:
+        """
+            View of the number of columns on the board
+            :returns: board width
+            :rtype: int
+        """
+        return self._num_cols
+
+    @property
+    def num_rows(self) -> int:
+        """
+            View of the number of rows on the board
+            :returns: board height
+            :rtype: int
+        """
+        return self._num_rows
+
+    @property
+    def cells(self) -> array:
+        """
+            View of the color codes stored on the board, row by row starting at the bottom
+            :returns: one color code per cell, NULL_CODE for empty cells
+            :rtype: array
+        """
+        return self._cells
+
+    @property
+    def occupied(self) -> set:
+        """
+            View of the positions holding a tile
+            :rtype: set
+        """
+        width = self._num_cols
+        return {
+                (index % width + 1, index // width + 1)
+                for index, code in enumerate(self._cells) if code != NULL_CODE
+                }
+
+    def load_cells(self, codes: bytes) -> None:
+        """
+            Replace the color code of every cell at once and notify every change tracker
+            :arg codes: one color code per cell, in the order of cells
+            :arg type: bytes
+            :returns: nothing
+            :rtype: None
+            :raises: ValueError if there is not one code per cell
+        """
+        if len(codes) != len(self._cells):
+            raise ValueError(f'{len(codes)} codes given for {len(self._cells)} cells')
+        self._cells[:] = array('B', codes)
+        self._version += 1
+        width = self._num_cols
+        for x in range(1, width + 1):
+            self._heights[x] = sum(1 for code in self._cells[x - 1::width] if code != NULL_CODE)
+        for y in range(1, self._num_rows + 1):
+            for x in range(1, self._num_cols + 1):
+                self._record_change(x, y)
+
+    def _index(self, x: int, y: int) -> int:
+        """
+            Helper method for translating a board position to an index in the code array
+            :arg x: x coordinate of the position
+            :arg y: y coordinate of the position
+            :arg type: int
+            :arg type: int
+            :returns: index of the position in the code array
+            :rtype: int
+            :raises: InvalidBoardPositionError if the position is not on the board
+        """
+        if not (1 <= x <= self._num_cols and 1 <= y <= self._num_rows):
+            raise InvalidBoardPositionError(f'({x}, {y}) is not a position on the board')
+        return (y - 1) * self._num_cols + (x - 1)
+
+    def column_height(self, x: int) -> int:
+        """
+            Get the number of tiles in a column, kept up to date as cells change.
+            Once the column is settled this is the row of its topmost tile
+            :arg x: the column
+            :arg type: int
+            :returns: the number of tiles in the column
+            :rtype: int
+        """
+        return self._heights[x]
+
+    def can_hold(self, x: int, y: int) -> bool:
+        """
+            Determine whether a falling tile can move to a position, without raising.
+            Positions above a column are staged and can always hold a tile
+            :arg x: x coordinate of the position
+            :arg y: y coordinate of the position
+            :arg type: int
+            :arg type: int
+            :returns: true if the position is staged or a free cell of the board
+            :rtype: bool
+        """
+        if not (1 <= x <= self._num_cols and 1 <= y):
+            return False
+        return y > self._num_rows or self._cells[(y - 1) * self._num_cols + (x - 1)] == NULL_CODE
+
+    def tile_at(self, x: int, y: int) -> Tile:
+        """
+            Get the tile at the specified position
+            :arg x: x coordinate of the tile
+            :arg y: y coordinate of the tile
+            :arg type: int
+            :arg type: int
+            :returns: a view of the tile at the position
+            :rtype: ColumnsTile or NullTile
+            :raises: InvalidBoardPositionError if the position is not on the board
+        """
+        code = self._cells[self._index(x, y)]
+        if code == NULL_CODE:
+            return null_tile(x, y)
+        return ColumnsTile(**{'position': (x, y), 'color': CODE_COLORS[code]})
+
+    def place_tile(self, tile: Tile) -> None:
+        """
+            Record the color of a tile at the tile's position, growing the version and notifying every change tracker
+            :arg tile: the tile to place
+            :arg type: Tile
+            :returns: nothing
+            :rtype: None
+            :raises: InvalidBoardPositionError if the tile's position is not on the board
+            :raises: IllegalTileMovementException if the position is already occupied
+        """
+        x, y = tile.position.x, tile.position.y
+        index = self._index(x, y)
+        self._version += 1
+        if isinstance(tile, NullTile):
+            if self._cells[index] != NULL_CODE:
+                self._cells[index] = NULL_CODE
+                self._heights[x] -= 1
+        elif self._cells[index] != NULL_CODE:
+            raise IllegalTileMovementException(
+                    f'({tile.position.x}, {tile.position.y}) is already occupied'
+                    )
+        else:
+            try:
+                self._cells[index] = COLOR_CODES[tile.color]
+            except KeyError as err:
+                raise ValueError(f'{tile.color} is not a columns color') from err
+            self._heights[x] += 1
+        self._record_change(x, y)
+
+    def compact_column(self, x: int) -> (int, list):
+        """
+            Let every tile in a column fall as far as it can, in a single sweep over the code array
+            :arg x: the column to compact
+            :arg type: int
+            :returns: the height of the compacted column and the ((x, from_y), (x, to_y)) of each tile moved
+            :rtype: tuple
+        """
+        cells = self._cells
+        width = self._num_cols
+        moves = []
+        landing = self._index(x, 1)
+        for index in range(landing, len(cells), width):
+            code = cells[index]
+            if code == NULL_CODE:
+                continue
+            if index != landing:
+                cells[landing] = code
+                cells[index] = NULL_CODE
+                origin = (x, index // width + 1)
+                destination = (x, landing // width + 1)
+                self._record_change(*origin)
+                self._record_change(*destination)
+                moves.append((origin, destination))
+            landing += width
+        if moves:
+            self._version += 1
+        return landing // width, moves
+
+    def __iter__(self):
+        """Iterate over views of every tile, row by row starting at the bottom"""
+        for y in range(1, self._num_rows + 1):
+            for x in range(1, self._num_cols + 1):
+                yield self.tile_at(x, y)
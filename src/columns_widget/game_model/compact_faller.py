@@ -0,0 +1,197 @@
+"""
+    :module_name: compact_faller
+    :module_summary: value type columns faller that stays off the board until it lands
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+import random
+
+from .columns_board import ColumnsBoard
+from .columns_tile import ColumnsTile, ColumnsFaller, CODE_COLORS
+
+class CompactFaller:
+    """
+        Class representing a falling tile group as plain integers: the file it falls down, the row of
+        its bottom member, a rotation offset and the color code of each member.
+        Shifting, rotating and falling only update those integers, the board is left untouched
+        until the faller lands and its tiles are placed
+    """
+    __slots__ = ('_descent_file', '_row', '_rotation', '_codes', '_pool')
+    SIZE = 3
+    STAGED = ColumnsFaller.STAGED
+
+    def __init__(
+            self,
+            rng = random,
+            descent_file: int = None,
+            codes: tuple = None,
+            pool = None,
+            row: int = STAGED,
+            width: int = ColumnsBoard.COLUMNS_BOARD_WIDTH
+            ):
+        """
+            :arg rng: source of randomness, the random module or a random.Random
+            :arg descent_file: file to fall down, chosen at random if not given
+            :arg codes: color codes of the members from the bottom up, chosen at random if not given
+            :arg pool: optional TilePool the tiles placed on landing are taken from
+            :arg row: row of the bottom member, the row above the board it falls onto when staged
+            :arg width: number of files of the board, the descent file is chosen from
+            :arg type: random.Random
+            :arg type: int
+            :arg type: tuple of int
+            :arg type: TilePool
+            :arg type: int
+            :arg type: int
+        """
+        self._descent_file = descent_file or rng.randint(1, width)
+        self._row = row
+        self._rotation = 0
+        self._codes = tuple(codes) if codes is not None else ColumnsFaller._random_codes(rng)
+        self._pool = pool
+
+    @property
+    def descent_file(self) -> int:
+        """
+            View of the file the faller is on
+            :rtype: int
+        """
+        return self._descent_file
+
+    @property
+    def row(self) -> int:
+        """
+            View of the row of the bottom member
+            :rtype: int
+        """
+        return self._row
+
+    @property
+    def rotation(self) -> int:
+        """
+            View of how many times the members have been rotated downward, modulo the faller size
+            :rtype: int
+        """
+        return self._rotation
+
+    @property
+    def size(self) -> int:
+        """
+            View of faller size property
+            :returns: # of members
+            :rtype: int
+        """
+        return self.SIZE
+
+    def code_at(self, member: int) -> int:
+        """
+            Get the color code of a member
+            :arg member: index of the member, 0 being the bottom
+            :arg type: int
+            :returns: the member's color code
+            :rtype: int
+        """
+        return self._codes[(member + self._rotation) % self.SIZE]
+
+    @property
+    def codes(self) -> tuple:
+        """
+            View of the color code of each member from the bottom up, as currently rotated
+            :rtype: tuple of int
+        """
+        return tuple(self.code_at(member) for member in range(self.SIZE))
+
+    @property
+    def colors(self) -> tuple:
+        """
+            View of the color of each member from the bottom up, as currently rotated
+            :rtype: tuple of ColumnsColor
+        """
+        return tuple(CODE_COLORS[code] for code in self.codes)
+
+    @property
+    def positions(self) -> tuple:
+        """
+            View of the position of each member from the bottom up
+            :rtype: tuple
+        """
+        return tuple((self._descent_file, self._row + member) for member in range(self.SIZE))
+
+    def can_shift(self, board: ColumnsBoard, step: int) -> bool:
+        """
+            Determine whether the faller can move sideways, without side effects
+            :arg board: the board the faller falls onto
+            :arg step: files to move by, negative for left
+            :arg type: ColumnsBoard
+            :arg type: int
+            :returns: true if every member's destination can hold it
+            :rtype: bool
+        """
+        x, y = self._descent_file + step, self._row
+        return board.can_hold(x, y) and board.can_hold(x, y + 1) and board.can_hold(x, y + 2)
+
+    def shift(self, step: int) -> None:
+        """
+            Move the faller sideways, to be called once can_shift allows it
+            :arg step: files to move by, negative for left
+            :arg type: int
+            :returns: nothing
+            :rtype: None
+        """
+        self._descent_file += step
+
+    def rotate(self, step: int) -> None:
+        """
+            Rotate the members of the faller, a rotation never needs room on the board
+            :arg step: 1 moves the bottom member to the top, -1 moves the top member to the bottom
+            :arg type: int
+            :returns: nothing
+            :rtype: None
+        """
+        self._rotation = (self._rotation + step) % self.SIZE
+
+    def can_fall(self, board: ColumnsBoard) -> bool:
+        """
+            Determine whether the faller can descend one level, without side effects
+            :arg board: the board the faller falls onto
+            :arg type: ColumnsBoard
+            :returns: true if the position below the bottom member can hold it
+            :rtype: bool
+        """
+        return board.can_hold(self._descent_file, self._row - 1)
+
+    def fall(self) -> None:
+        """
+            Descend one level, to be called once can_fall allows it
+            :returns: nothing
+            :rtype: None
+        """
+        self._row -= 1
+
+    def drop_to(self, row: int) -> None:
+        """
+            Descend straight to a row, to be called with a row the faller can fall to
+            :arg row: the row of the bottom member once dropped
+            :arg type: int
+            :returns: nothing
+            :rtype: None
+        """
+        self._row = row
+
+    def land(self, board: ColumnsBoard) -> bool:
+        """
+            Place the tiles of the members that are on the board
+            :arg board: the board the faller landed on
+            :arg type: ColumnsBoard
+            :returns: true if a member was left above the board
+            :rtype: bool
+        """
+        for member in range(self.SIZE):
+            y = self._row + member
+            if y > board.num_rows:
+                return True
+            color = CODE_COLORS[self.code_at(member)]
+            if self._pool:
+                board.place_tile(self._pool.acquire(self._descent_file, y, color))
+            else:
+                board.place_tile(ColumnsTile(**{'position': (self._descent_file, y), 'color': color}))
+        return False
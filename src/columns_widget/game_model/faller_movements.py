@@ -8,9 +8,10 @@ import logging
 from abc import abstractmethod
 
 from .columns_tile import ColumnsTile, ColumnsFaller, ColumnsColor
+from .tracing import TRACER, TraceKind
+from .tile_pool import null_tile
 
-from tilematch_tools.model import MovementRule, NullTile, GameBoard
-from tilematch_tools.model.exceptions import IllegalTileMovementException, InvalidBoardPositionError
+from tilematch_tools.model import MovementRule, GameBoard
 
 LOGGER = logging.getLogger(__name__)
 
@@ -31,52 +32,71 @@ class FallerMovementRule(MovementRule):
             :rtype: None
         """
         for tile in faller.members:
-            if tile.position.y != ColumnsFaller.STAGED:
+            if tile.position.y <= board.num_rows:
                 board.place_tile(tile)
 
     def __init__(self, callback = None):
         self._after = callback
         self._faller_origins = None
 
-    def move(self, board: GameBoard, faller: ColumnsFaller, *callback_args) -> None:
+    def destinations(self, faller: ColumnsFaller) -> tuple:
         """
-            Apply this movement rule to the given faller on the specific gameboard
+            Positions the members of a faller would move to under this movement rule
+            :arg faller: the faller to be moved
+            :arg type: ColumnsFaller
+            :returns: position of each member, in member order
+            :rtype: tuple
+        """
+        return faller.positions
+
+    def can_apply(self, board: GameBoard, faller: ColumnsFaller) -> bool:
+        """
+            Determine whether this movement rule can be applied to the given faller, without side effects.
+            A member may move onto a cell the faller itself occupies, as the faller moves as one
+            :arg board: gameboard the move would be made on
+            :arg faller: faller to be moved
+            :arg type: ColumnsBoard
+            :arg type: ColumnsFaller
+            :returns: true if every member can move to its destination
+            :rtype: bool
+        """
+        occupied = faller.positions
+        return all(
+                position in occupied or board.can_hold(*position)
+                for position in self.destinations(faller)
+                )
+
+    def move(self, board: GameBoard, faller: ColumnsFaller, *callback_args) -> bool:
+        """
+            Apply this movement rule to the given faller on the specific gameboard if it can be applied
             Then calls the callback if one exists
             :arg board: gameboard the move will be made on
             :arg faller: faller to be moved
             :arg *callback_args: additional arguments to be passed to the callback
-            :arg type: GameBoard
+            :arg type: ColumnsBoard
             :arg type: Tile
             :arg type: tuple
+            :returns: true if the move was applied, false if it could not be and nothing changed
+            :rtype: bool
         """
-        self._faller_origins = faller.positions
-        try:
-            LOGGER.info(
-                    'Attempting to move faller on descent file %d', 
-                    faller.descent_file
-                    )
+        applied = self.can_apply(board, faller)
+        if applied:
+            self._faller_origins = faller.positions
             self.apply(board, faller)
-        except (IllegalTileMovementException, InvalidBoardPositionError):
-            LOGGER.error('Could not apply movement rule %s. Reverting tile state', str(self))
-            self.revert(board, faller)
-        else:
-            for i, tile in enumerate(faller.members):
-                LOGGER.info(
-                        'faller successfully moved from (%d, %d) -> (%d, %d)',
-                        self._faller_origins[i][0],
-                        self._faller_origins[i][1],
-                        tile.position.x,
-                        tile.position.y
-                        )
+            faller.moved()
+            if TRACER.enabled:
+                TRACER.record(TraceKind.MOVE, type(self).__name__, self._faller_origins, faller.positions)
             self._mark_null(board)
-        finally:
-            if self._after:
-                self._after(*callback_args)
-    
+        elif TRACER.enabled:
+            TRACER.record(TraceKind.REVERT, type(self).__name__, faller.positions)
+        if self._after:
+            self._after(*callback_args)
+        return applied
+
     @abstractmethod
     def apply(self, board: GameBoard, faller: ColumnsFaller) -> None:
         """
-            Logic for executing this tile movement. Should raise exception if cannot be completed
+            Logic for executing this tile movement, only called by move once can_apply allows it
             :arg board: gameboard move will be executed on
             :arg faller: faller to be moved by this movement rule (really a collection of tiles)
             :arg type: GameBoard
@@ -88,7 +108,8 @@ class FallerMovementRule(MovementRule):
 
     def revert(self, board: GameBoard, faller: ColumnsFaller) -> None:
         """
-            Reverts this movement rule by restoring faller original position
+            Reverts this movement rule by restoring faller original position.
+            move checks can_apply first so never needs this, it is kept for callers applying rules directly
             :arg board: gameboard on which move will be reverted
             :arg faller: faller which will be un-moved
             :arg type: GameBoard
@@ -96,27 +117,17 @@ class FallerMovementRule(MovementRule):
             :returns: Nothing
             :rtype: None
         """
+        faller.moved()
+        if TRACER.enabled:
+            TRACER.record(TraceKind.REVERT, type(self).__name__, faller.positions, self._faller_origins)
         for i, tile in enumerate(faller.members):
-            LOGGER.info(
-                    'Reverting faller member %d to position (%d, %d)',
-                    i,
-                    self._faller_origins[i][0],
-                    self._faller_origins[i][1]
-            )
             tile.position = (self._faller_origins[i][0], self._faller_origins[i][1])
+        faller.moved()
 
     def _mark_null(self, board: GameBoard) -> None:
         for x, y in self._faller_origins:
-            LOGGER.info('Marking (%d, %d) with a null tile', x, y)
-            if y != ColumnsFaller.STAGED:
-                board.place_tile(
-                    NullTile(
-                        **{
-                            'position': (x, y),
-                            'color': '#D3D3D3'
-                        }
-                    )
-                )
+            if y <= board.num_rows:
+                board.place_tile(null_tile(x, y))
 
  
 
@@ -124,6 +135,16 @@ class FallerShiftRight(FallerMovementRule):
     """
         Class that specfies how a ColumnsFaller shifts right
     """
+    def destinations(self, faller: ColumnsFaller) -> tuple:
+        """
+            Positions the members of a faller would move to under this movement rule
+            :arg faller: the faller to be moved
+            :arg type: ColumnsFaller
+            :returns: position of each member, in member order
+            :rtype: tuple
+        """
+        return tuple((x + 1, y) for x, y in faller.positions)
+
     def apply(self, board: GameBoard, faller: ColumnsFaller) -> None:
         """
             Logic for executing this tile movement. Should raise exception if cannot be completed
@@ -136,13 +157,23 @@ class FallerShiftRight(FallerMovementRule):
         """
         for tile in faller.members:
             tile.position = (tile.position.x + 1, tile.position.y)
-            if tile.position.y != ColumnsFaller.STAGED:
+            if tile.position.y <= board.num_rows:
                 board.place_tile(tile)
 
 class FallerShiftLeft(FallerMovementRule):
     """
         Class that specfies how a ColumnsFaller shifts right
     """
+    def destinations(self, faller: ColumnsFaller) -> tuple:
+        """
+            Positions the members of a faller would move to under this movement rule
+            :arg faller: the faller to be moved
+            :arg type: ColumnsFaller
+            :returns: position of each member, in member order
+            :rtype: tuple
+        """
+        return tuple((x - 1, y) for x, y in faller.positions)
+
     def apply(self, board: GameBoard, faller: ColumnsFaller) -> None:
         """
             Logic for executing this tile movement. Should raise exception if cannot be completed
@@ -155,7 +186,7 @@ class FallerShiftLeft(FallerMovementRule):
         """
         for tile in faller.members:
             tile.position = (tile.position.x - 1, tile.position.y)
-            if tile.position.y != ColumnsFaller.STAGED:
+            if tile.position.y <= board.num_rows:
                 board.place_tile(tile)
 
 class FallerShuffleUp(FallerMovementRule):
@@ -209,3 +240,74 @@ class FallerShuffleDown(FallerMovementRule):
 
         for tile, pos in zip(member_list, member_positions):
             tile.position = pos
+
+class FallerHardDrop(FallerMovementRule):
+    """
+        Class that specifies how a ColumnsFaller drops straight down to the rows it lands on
+    """
+
+    def __init__(self, rows: tuple):
+        """
+            :arg rows: the row each member drops to, in member order
+            :arg type: tuple of int
+        """
+        super().__init__()
+        self._rows = rows
+
+    def destinations(self, faller: ColumnsFaller) -> tuple:
+        """
+            Positions the members of a faller would move to under this movement rule
+            :arg faller: the faller to be moved
+            :arg type: ColumnsFaller
+            :returns: position of each member, in member order
+            :rtype: tuple
+        """
+        return tuple((x, row) for (x, _), row in zip(faller.positions, self._rows))
+
+    def apply(self, board: GameBoard, faller: ColumnsFaller) -> None:
+        """
+            Logic for executing this tile movement. The members leave the board before any of them is placed
+            again, as a member may drop onto a cell another member leaves
+            :arg board: gameboard move will be executed on
+            :arg faller: faller to be moved by this movement rule (really a collection of tiles)
+            :arg type: GameBoard
+            :arg type: ColumnsFaller
+            :raises: IllegalTileMovementException if the tile movement is illegal
+            :raises: InvalidBoardPositionError if the tile's new position is invalid
+        """
+        destinations = self.destinations(faller)
+        for x, y in faller.positions:
+            if y <= board.num_rows:
+                board.place_tile(null_tile(x, y))
+        for tile, position in zip(faller.members, destinations):
+            tile.position = position
+            if position[1] <= board.num_rows:
+                board.place_tile(tile)
+
+    def _mark_null(self, board: GameBoard) -> None:
+        """Cells left by the members were cleared by apply"""
+
+
+class FallerDescent(FallerHardDrop):
+    """
+        Class that specifies how a ColumnsFaller falls one row. Members staged above the board
+        enter it one at a time, each staying staged until the member below has made room
+    """
+
+    def __init__(self):
+        super().__init__(())
+
+    def destinations(self, faller: ColumnsFaller) -> tuple:
+        """
+            Positions the members of a faller would move to under this movement rule
+            :arg faller: the faller to be moved
+            :arg type: ColumnsFaller
+            :returns: position of each member, in member order
+            :rtype: tuple
+        """
+        destinations = []
+        below = 0
+        for x, y in faller.positions:
+            below = min(y, max(y - 1, below + 1))
+            destinations.append((x, below))
+        return tuple(destinations)
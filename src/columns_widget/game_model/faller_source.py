@@ -0,0 +1,215 @@
+"""
+    :module_name: faller_source
+    :module_summary: seeded source of pregenerated columns fallers
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+import random
+from collections import deque
+
+from .columns_board import ColumnsBoard
+from .columns_tile import ColumnsColor, ColumnsTile, ColumnsFaller
+from .tile_pool import TilePool
+
+
+def batch_draws(seed: int, number: int, width: int, size: int) -> list:
+    """
+        Draw the values of a batch of fallers, each value encoding a descent file then the color code
+        of each member from the bottom up
+        :arg seed: seed of the sequence of fallers
+        :arg number: number of the batch in the sequence
+        :arg width: number of files fallers can descend down
+        :arg size: number of fallers in the batch
+        :arg type: int
+        :arg type: int
+        :arg type: int
+        :arg type: int
+        :returns: one value per faller
+        :rtype: list of int
+    """
+    rng = random.Random(f'{seed}:{number}')
+    return rng.choices(range(width * len(ColumnsColor) ** 3), k=size)
+
+
+class FallerQueue:
+    """
+        Class representing the queue of fallers a game draws from.
+        Fallers are generated in batches, each from its own random.Random seeded by the queue's seed
+        and the batch number, so a seed always yields the same sequence of fallers
+    """
+    BATCH = 64
+
+    def __init__(
+            self,
+            seed: int = None,
+            lookahead: int = 1,
+            width: int = ColumnsBoard.COLUMNS_BOARD_WIDTH,
+            batch: int = BATCH,
+            faller_type: type = ColumnsFaller,
+            drawn: int = 0,
+            upcoming: tuple = None,
+            height: int = ColumnsBoard.COLUMNS_BOARD_HEIGHT
+            ):
+        """
+            :arg seed: seed of the sequence of fallers, chosen at random if not given
+            :arg lookahead: number of upcoming fallers kept ready to preview
+            :arg width: number of files fallers can descend down
+            :arg batch: number of fallers generated per batch
+            :arg faller_type: class of the fallers generated, ColumnsFaller or CompactFaller
+            :arg drawn: number of fallers already taken, to resume a queue with the same seed
+            :arg upcoming: descent file and color codes of each upcoming faller of the queue resumed
+            :arg height: number of rows of the board, fallers are staged on the row above it
+            :arg type: int
+            :arg type: int
+            :arg type: int
+            :arg type: int
+            :arg type: type
+            :arg type: int
+            :arg type: tuple
+            :arg type: int
+        """
+        self._seed = random.getrandbits(64) if seed is None else seed
+        self._lookahead = max(1, lookahead)
+        self._width = width
+        self._height = height
+        self._batch = batch
+        self._faller_type = faller_type
+        self._drawn = drawn
+        self._pending = deque()
+        self._pool = TilePool(ColumnsTile)
+        if upcoming:
+            # resuming only needs the batch the next faller comes from, which is regenerated when first drawn
+            self._batches, self._skip = divmod(drawn + len(upcoming), batch)
+            self._upcoming = deque(self._faller(descent_file, codes) for descent_file, codes in upcoming)
+        else:
+            self._batches, self._skip = 0, 0
+            self._upcoming = deque(self._generate() for _ in range(self._lookahead))
+
+    @property
+    def seed(self) -> int:
+        """
+            View of the seed of this queue
+            :rtype: int
+        """
+        return self._seed
+
+    @property
+    def drawn(self) -> int:
+        """
+            View of the number of fallers taken from this queue
+            :rtype: int
+        """
+        return self._drawn
+
+    @property
+    def lookahead(self) -> int:
+        """
+            View of the number of upcoming fallers kept ready
+            :rtype: int
+        """
+        return self._lookahead
+
+    @property
+    def width(self) -> int:
+        """
+            View of the number of files fallers can descend down
+            :rtype: int
+        """
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """
+            View of the number of rows of the board fallers are staged above
+            :rtype: int
+        """
+        return self._height
+
+    @property
+    def batch(self) -> int:
+        """
+            View of the number of fallers generated per batch
+            :rtype: int
+        """
+        return self._batch
+
+    @property
+    def faller_type(self) -> type:
+        """
+            View of the class of the fallers generated
+            :rtype: type
+        """
+        return self._faller_type
+
+    @property
+    def pool(self) -> TilePool:
+        """
+            View of the pool the members of new fallers are taken from
+            :rtype: TilePool
+        """
+        return self._pool
+
+    @property
+    def upcoming(self) -> tuple:
+        """
+            View of the next fallers to be drawn, soonest first
+            :rtype: tuple of ColumnsFaller
+        """
+        return tuple(self._upcoming)
+
+    def peek(self) -> ColumnsFaller:
+        """
+            View of the next faller to be drawn
+            :rtype: ColumnsFaller
+        """
+        return self._upcoming[0]
+
+    def pop(self) -> ColumnsFaller:
+        """
+            Draw the next faller from the queue
+            :returns: the next faller
+            :rtype: ColumnsFaller
+        """
+        self._upcoming.append(self._generate())
+        self._drawn += 1
+        return self._upcoming.popleft()
+
+    def _generate(self) -> ColumnsFaller:
+        """
+            Helper method for building the next faller, generating a new batch when needed
+            :returns: a new faller
+            :rtype: ColumnsFaller
+        """
+        if not self._pending:
+            self._pending.extend(self._draw_batch()[self._skip:])
+            self._skip = 0
+        return self._faller(*self._pending.popleft())
+
+    def _faller(self, descent_file: int, codes: tuple) -> ColumnsFaller:
+        """
+            Helper method for building a staged faller of this queue's faller class
+            :arg descent_file: file the faller descends down
+            :arg codes: color codes of the members from the bottom up
+            :arg type: int
+            :arg type: tuple of int
+            :returns: a new faller
+            :rtype: ColumnsFaller
+        """
+        return self._faller_type(descent_file=descent_file, codes=codes, pool=self._pool, row=self._height + 1)
+
+    def _draw_batch(self) -> list:
+        """
+            Helper method for generating a batch of fallers with one draw per faller
+            :returns: descent file and color codes of each faller in the batch
+            :rtype: list
+        """
+        draws = batch_draws(self._seed, self._batches, self._width, self._batch)
+        self._batches += 1
+        colors = len(ColumnsColor)
+        batch = []
+        for draw in draws:
+            draw, descent_file = divmod(draw, self._width)
+            draw, bottom = divmod(draw, colors)
+            top, center = divmod(draw, colors)
+            batch.append((descent_file + 1, (bottom + 1, center + 1, top + 1)))
+        return batch
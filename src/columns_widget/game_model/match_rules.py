@@ -11,6 +11,7 @@ from tilematch_tools.model.exceptions import InvalidBoardPositionError
 from tilematch_tools.model import GameBoard, NullTile
 
 from .columns_tile import ColumnsTile
+from .tracing import TRACER, TraceKind
 
 LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +19,74 @@ class ThreeFoldMatch(MatchCondition):
     """
         A generalized three match condition
     """
+    STREAK = 3
+
+    @property
+    def scan_delta(self) -> (int, int):
+        """
+            View of the direction this match condition scans in
+            :returns: x and y step taken between members of a streak
+            :rtype: tuple
+        """
+        return self._scan_delta.value
+
+    def cells(self, start_x: int, start_y: int) -> tuple:
+        """
+            Positions covered by a streak starting at the specified position
+            :arg start_x: x coordinate of the start of the streak
+            :arg start_y: y coordinate of the start of the streak
+            :arg type: int
+            :arg type: int
+            :returns: (x, y) position of each member of the streak
+            :rtype: tuple
+        """
+        dx, dy = self._scan_delta.value
+        return tuple(
+                (start_x + dx * i, start_y + dy * i)
+                for i in range(self.STREAK)
+                )
+
+    def matches_at(self, board: GameBoard, start_x: int, start_y: int) -> bool:
+        """
+            Check for a three-match like check_match does, without raising or building a result
+            :arg board: the board to check a match for
+            :arg start_x: the x position the match scan starts at
+            :arg start_y: the y position the match scan starts at
+            :arg type: GameBoard
+            :arg type: int
+            :arg type: int
+            :returns: true if check_match would find a match at the position, otherwise false
+            :rtype: bool
+        """
+        cells = self.cells(start_x, start_y)
+        if not all(1 <= x <= board.num_cols and 1 <= y <= board.num_rows for x, y in cells):
+            return False
+        matching_tiles = [board.tile_at(start_x, start_y)]
+        if isinstance(matching_tiles[0], NullTile):
+            return False
+        for x, y in cells[1:]:
+            tile = board.tile_at(x, y)
+            if not all(self._eq(prev, tile) for prev in matching_tiles):
+                return False
+            matching_tiles.append(tile)
+        return True
+
+    def found(self, board: GameBoard, start_x: int, start_y: int) -> MatchCondition.MatchFound:
+        """
+            Build the result describing a match known to start at the specified position
+            :arg board: the board the match was found on
+            :arg start_x: the x position the match starts at
+            :arg start_y: the y position the match starts at
+            :arg type: GameBoard
+            :arg type: int
+            :arg type: int
+            :returns: the same description check_match gives for the match
+            :rtype: MatchFound
+        """
+        matching_tiles = [board.tile_at(x, y) for x, y in self.cells(start_x, start_y)]
+        if TRACER.enabled:
+            TRACER.record(TraceKind.MATCH, type(self).__name__, start_x, start_y)
+        return MatchCondition.MatchFound(self.point_value * len(matching_tiles), matching_tiles)
 
     def _can_extend_match(
             self,
@@ -71,50 +140,23 @@ class ThreeFoldMatch(MatchCondition):
             :rtype: MatchFound or None
         """
         if isinstance(board.tile_at(start_x, start_y), NullTile):
-            LOGGER.info('No tile to match at (%d, %d)', start_x, start_y)
             return None
         matching_tiles = [board.tile_at(start_x, start_y)]
-        LOGGER.info(
-                'Checking for match starting at (%d, %d). Using %s as the scan delta',
-                start_x,
-                start_y,
-                str(self._scan_delta)
-                )
         try:
-            for i in range(1, 3):
-                LOGGER.info(
-                        'Checking if (%d, %d) can be added to the match',
-                        start_x + self._scan_delta.value[0] * i,
-                        start_y + self._scan_delta.value[1] * i
-                        )
-                if self._can_extend_match(start_x, start_y, board, matching_tiles, i):
-                    LOGGER.info(
-                            'Tile at (%d, %d) joined the match!', 
+            for i in range(1, self.STREAK):
+                if not self._can_extend_match(start_x, start_y, board, matching_tiles, i):
+                    return None
+                matching_tiles.append(
+                        board.tile_at(
                             start_x + self._scan_delta.value[0] * i,
                             start_y + self._scan_delta.value[1] * i
                             )
-                    matching_tiles.append(
-                            board.tile_at(
-                                start_x + self._scan_delta.value[0] * i,
-                                start_y + self._scan_delta.value[1] * i
-                                )
-                            )
-                else:
-                    LOGGER.info(
-                            'Tile at (%d, %d) broke the streak! Come on dude, WTF?!?',
-                            start_x + self._scan_delta.value[0] * i,
-                            start_x + self._scan_delta.value[1] * i
-                            )
-                    return None
+                        )
         except InvalidBoardPositionError:
-            LOGGER.info(
-                    'Matching sequence starting at (%d, %d) abruptly terminated',
-                    start_x,
-                    start_y
-                    )
             return None
         else:
-            LOGGER.info('Match of three discovered at (%d, %d)', start_x, start_y)
+            if TRACER.enabled:
+                TRACER.record(TraceKind.MATCH, type(self).__name__, start_x, start_y)
             return MatchCondition.MatchFound(self.point_value * len(matching_tiles), matching_tiles)
 
 class ThreeFoldNorth(ThreeFoldMatch):
@@ -0,0 +1,155 @@
+"""
+    :module_name: matchers
+    :module_summary: strategies for finding every match on a columns board
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+from tilematch_tools.model import MatchCondition
+
+from .columns_board import ColumnsBoard
+from .compact_board import CompactColumnsBoard
+from .bitboard import keyed_boards, code_boards, streak_starts, positions
+
+class FullScanMatcher:
+    """
+        Finds matches by checking every match rule at every position on the board
+    """
+
+    def __init__(self, board: ColumnsBoard):
+        self._board = board
+
+    def locate(self, match_rules: list) -> list:
+        """
+            Locate every match on the board
+            :arg match_rules: the match rule classes to check
+            :arg type: list
+            :returns: (rule, x, y) for each match, ordered by rule then x then y
+            :rtype: list
+        """
+        board = self._board
+        found = []
+        for match_rule in match_rules:
+            rule = match_rule()
+            found.extend(
+                    (rule, x, y)
+                    for x in range(1, board.num_cols + 1)
+                    for y in range(1, board.num_rows + 1)
+                    if rule.matches_at(board, x, y)
+                    )
+        return found
+
+    def find_matches(self, match_rules: list) -> [MatchCondition.MatchFound]:
+        """
+            Find every match on the board
+            :arg match_rules: the match rule classes to check
+            :arg type: list
+            :returns: the matches found, ordered by rule then x then y
+            :rtype: list of MatchFound
+        """
+        return [rule.found(self._board, x, y) for rule, x, y in self.locate(match_rules)]
+
+
+class DirtyRegionMatcher(FullScanMatcher):
+    """
+        Finds matches by only checking the streaks that pass through a cell changed since a rule last looked.
+        The cells of a match found stay to be looked at until it is cleared, so asking again finds it again
+    """
+
+    def __init__(self, board: ColumnsBoard):
+        super().__init__(board)
+        self._changed = board.track_changes()
+        self._pending = {}
+
+    @property
+    def changed(self) -> set:
+        """
+            View of the positions changed since the last search
+            :returns: (x, y) positions
+            :rtype: set
+        """
+        return self._changed
+
+    def locate(self, match_rules: list) -> list:
+        """
+            Locate every match passing through a cell each rule still has to look at
+            :arg match_rules: the match rule classes to check
+            :arg type: list
+            :returns: (rule, x, y) for each match, ordered by rule then x then y
+            :rtype: list
+        """
+        board = self._board
+        if self._changed:
+            for pending in self._pending.values():
+                pending |= self._changed
+            self._changed.clear()
+        found = []
+        for match_rule in match_rules:
+            pending = self._pending.get(match_rule)
+            if pending is None:
+                # only streaks through a tile can match, so the tiles on the board are all a new rule has to look at
+                pending = self._pending[match_rule] = set(board.occupied)
+            if not pending:
+                continue
+            rule = match_rule()
+            dx, dy = rule.scan_delta
+            starts = {
+                    (x - dx * i, y - dy * i)
+                    for x, y in pending
+                    for i in range(rule.STREAK)
+                    }
+            matches = [
+                    (rule, x, y)
+                    for x, y in sorted(starts)
+                    if rule.matches_at(board, x, y)
+                    ]
+            # no streak through the other cells matches this rule until one of them changes
+            pending.clear()
+            for _, x, y in matches:
+                pending.update(rule.cells(x, y))
+            found.extend(matches)
+        return found
+
+
+class BitboardMatcher(FullScanMatcher):
+    """
+        Finds matches by turning the board into one bitboard per color and
+        finding every streak with shift and mask operations
+    """
+
+    def _color_boards(self) -> dict:
+        """
+            Helper method for building the bitboard of each color on the board
+            :returns: bitboard of each color present
+            :rtype: dict
+        """
+        board = self._board
+        width = board.num_cols
+        if isinstance(board, CompactColumnsBoard):
+            return code_boards(board.cells, width)
+        return keyed_boards(((board.tile_at(x, y).color, x, y) for x, y in board.occupied), width, board.num_rows)
+
+    def locate(self, match_rules: list) -> list:
+        """
+            Locate every match on the board. Tiles match when they share a color
+            :arg match_rules: the match rule classes to check
+            :arg type: list
+            :returns: (rule, x, y) for each match, ordered by rule then x then y
+            :rtype: list
+        """
+        width = self._board.num_cols
+        color_boards = self._color_boards().values()
+        found = []
+        for match_rule in match_rules:
+            rule = match_rule()
+            starts = 0
+            for bits in color_boards:
+                starts |= streak_starts(bits, width, rule.scan_delta, rule.STREAK)
+            found.extend((rule, x, y) for x, y in sorted(positions(starts, width)))
+        return found
+
+
+MATCHERS = {
+        'full': FullScanMatcher,
+        'dirty': DirtyRegionMatcher,
+        'bitboard': BitboardMatcher
+        }
@@ -0,0 +1,83 @@
+"""
+    :module_name: resolution
+    :module_summary: record of the chain of clears caused by a landing
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+from collections import namedtuple
+from enum import StrEnum
+
+
+class ColumnsPhase(StrEnum):
+    """Enumeration of the phases a columns game moves through"""
+    FALLING = 'falling'
+    CLEARING = 'clearing'
+    COLLAPSING = 'collapsing'
+
+
+# One find, clear and collapse pass of a chain. depth counts passes from 1, matches holds the
+# MatchFound results cleared, cleared the (x, y) of each cleared cell, moved the
+# ((x, from_y), (x, to_y)) of each tile the collapse moved and points the points awarded
+ResolutionStep = namedtuple('ResolutionStep', ['depth', 'matches', 'cleared', 'moved', 'points'])
+
+
+class Resolution:
+    """
+        Class representing every pass made while resolving a board to a point with no matches
+    """
+
+    def __init__(self):
+        self._steps = []
+
+    def add(self, step: ResolutionStep) -> None:
+        """
+            Record a pass of the chain
+            :arg step: the pass to record
+            :arg type: ResolutionStep
+            :returns: nothing
+            :rtype: None
+        """
+        self._steps.append(step)
+
+    @property
+    def steps(self) -> tuple:
+        """
+            View of the passes made, in order
+            :rtype: tuple of ResolutionStep
+        """
+        return tuple(self._steps)
+
+    @property
+    def chain_depth(self) -> int:
+        """
+            View of the number of passes that cleared a match
+            :rtype: int
+        """
+        return len(self._steps)
+
+    @property
+    def match_count(self) -> int:
+        """
+            View of the number of matches cleared across every pass
+            :rtype: int
+        """
+        return sum(len(step.matches) for step in self._steps)
+
+    @property
+    def points(self) -> int:
+        """
+            View of the points awarded across every pass
+            :rtype: int
+        """
+        return sum(step.points for step in self._steps)
+
+    @property
+    def cleared(self) -> tuple:
+        """
+            View of every cell cleared across every pass, in the order they were cleared
+            :rtype: tuple
+        """
+        return tuple(cell for step in self._steps for cell in step.cleared)
+
+    def __bool__(self) -> bool:
+        return bool(self._steps)
@@ -8,7 +8,9 @@ import logging
 
 from tilematch_tools.model import MovementRule, GameBoard, Tile, NullTile
 from tilematch_tools.model.exceptions import IllegalTileMovementException
-from .columns_tile import ColumnsFaller
+from .columns_board import ColumnsBoard
+from .tracing import TRACER, TraceKind
+from .tile_pool import null_tile
 
 LOGGER = logging.getLogger(__name__)
 
@@ -29,20 +31,25 @@ class SingleStepDescent(MovementRule):
         tile_to_move.position = (tile_to_move.position.x, tile_to_move.position.y - 1)
         board.place_tile(tile_to_move)
 
+    def can_apply(self, board: ColumnsBoard, tile_to_move: Tile) -> bool:
+        """
+            Determine whether a tile can descend one level, without side effects
+            :arg board: gameboard the move would be made on
+            :arg tile_to_move: tile to be moved
+            :arg type: ColumnsBoard
+            :arg type: Tile
+            :returns: true if the position below the tile can hold it
+            :rtype: bool
+        """
+        return board.can_hold(tile_to_move.position.x, tile_to_move.position.y - 1)
+
     def _mark_null(self, board: GameBoard):
-        if self._origin_y == ColumnsFaller.STAGED:
-            LOGGER.info('Tile fell from y=%d, not marking the staged tile as null', ColumnsFaller.STAGED)
+        if TRACER.enabled:
+            TRACER.record(TraceKind.MOVE, type(self).__name__, (self._origin_x, self._origin_y), (self._origin_x, self._origin_y - 1))
+        if self._origin_y > board.num_rows:
             return
 
-        LOGGER.info('Marking (%d, %d) with a null tile', self._origin_x, self._origin_y)
-        board.place_tile(
-                NullTile(
-                    **{
-                        'position': (self._origin_x, self._origin_y),
-                        'color': '#D3D3D3'
-                    }
-                )
-        )
+        board.place_tile(null_tile(self._origin_x, self._origin_y))
 
 
 class AbsoluteDescent(MovementRule):
@@ -70,3 +77,41 @@ class AbsoluteDescent(MovementRule):
         else:
             LOGGER.error('Tile at (%d, %d is already as low as possible', tile_to_move.position.x, tile_to_move.position.y)
             raise IllegalTileMovementException(f'Tile at ({tile_to_move.position.x}, {tile_to_move.position.y}) is already as low as possible')
+
+
+class ColumnGravity:
+    """
+        Class that specifies that every tile on a board descends until blocked,
+        compacting each column in a single sweep instead of moving tile by tile
+    """
+
+    def __init__(self):
+        self._heights = []
+
+    @property
+    def heights(self) -> list:
+        """
+            View of the height of each column swept by the last sweep
+            :returns: number of tiles stacked in each column swept, leftmost first
+            :rtype: list
+        """
+        return self._heights
+
+    def apply(self, board: ColumnsBoard, columns = None) -> list:
+        """
+            Compact columns of the board
+            :arg board: gameboard to compact
+            :arg columns: the columns to compact, every column if not given. Only a column a tile
+                was removed from can hold a tile able to fall
+            :arg type: ColumnsBoard
+            :arg type: iterable of int
+            :returns: the ((x, from_y), (x, to_y)) of each tile moved
+            :rtype: list
+        """
+        moves = []
+        self._heights = []
+        for x in sorted(columns) if columns is not None else range(1, board.num_cols + 1):
+            height, column_moves = board.compact_column(x)
+            self._heights.append(height)
+            moves.extend(column_moves)
+        return moves
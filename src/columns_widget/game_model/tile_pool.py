@@ -0,0 +1,97 @@
+"""
+    :module_name: tile_pool
+    :module_summary: shared null tiles and pools of reusable tiles
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+from collections import defaultdict
+
+from tilematch_tools.model import NullTile, Tile
+
+NULL_COLOR = '#D3D3D3'
+
+_NULL_TILES = {}
+
+
+def null_tile(x: int, y: int) -> NullTile:
+    """
+        Get the shared null tile of a position, building it the first time the position is asked for.
+        Null tiles are never moved, so every board can hold the same null tile at a position
+        :arg x: x coordinate of the position
+        :arg y: y coordinate of the position
+        :arg type: int
+        :arg type: int
+        :returns: the null tile at the position
+        :rtype: NullTile
+    """
+    try:
+        return _NULL_TILES[x, y]
+    except KeyError:
+        return _NULL_TILES.setdefault((x, y), NullTile(**{'position': (x, y), 'color': NULL_COLOR}))
+
+
+class TilePool:
+    """
+        Class keeping tiles that left the board so new tiles of the same color can reuse them
+    """
+
+    def __init__(self, tile_type: type):
+        """
+            :arg tile_type: class of the tiles built when the pool has none to reuse
+            :arg type: type
+        """
+        self._tile_type = tile_type
+        self._free = defaultdict(list)
+        self._pooled = set()
+        self._built = 0
+        self._reused = 0
+
+    @property
+    def built(self) -> int:
+        """
+            View of the number of tiles built because none could be reused
+            :rtype: int
+        """
+        return self._built
+
+    @property
+    def reused(self) -> int:
+        """
+            View of the number of tiles handed out again after being released
+            :rtype: int
+        """
+        return self._reused
+
+    def acquire(self, x: int, y: int, color: str) -> Tile:
+        """
+            Get a tile of a color at a position, reusing a released tile of that color if there is one
+            :arg x: x coordinate of the tile
+            :arg y: y coordinate of the tile
+            :arg color: color of the tile
+            :arg type: int
+            :arg type: int
+            :arg type: str
+            :returns: the tile
+            :rtype: Tile
+        """
+        free = self._free[color]
+        if free:
+            tile = free.pop()
+            self._pooled.discard(id(tile))
+            tile.position = (x, y)
+            self._reused += 1
+            return tile
+        self._built += 1
+        return self._tile_type(**{'position': (x, y), 'color': color})
+
+    def release(self, tile: Tile) -> None:
+        """
+            Hand back a tile that is no longer on the board. Releasing a tile twice keeps one copy
+            :arg tile: the tile to release
+            :arg type: Tile
+            :returns: nothing
+            :rtype: None
+        """
+        if isinstance(tile, self._tile_type) and id(tile) not in self._pooled:
+            self._pooled.add(id(tile))
+            self._free[tile.color].append(tile)
@@ -0,0 +1,120 @@
+"""
+    :module_name: tracing
+    :module_summary: a ring buffer of typed game events that costs one attribute check when disabled
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+import sys
+from collections import deque, namedtuple
+from enum import Enum
+
+
+class TraceKind(Enum):
+    """Enumeration of the kinds of events a game can trace"""
+    MOVE = 'move'
+    REVERT = 'revert'
+    MATCH = 'match'
+    CLEAR = 'clear'
+    COLLAPSE = 'collapse'
+    FALLER_CYCLE = 'faller_cycle'
+
+
+# seq numbers events in the order they were recorded, data holds the event's raw arguments
+# which are only formatted when the trace is dumped
+TraceEvent = namedtuple('TraceEvent', ['seq', 'kind', 'data'])
+
+
+class Tracer:
+    """
+        Class recording the most recent game events into a fixed size ring buffer.
+        Call sites check enabled before recording, so a disabled tracer costs one attribute lookup
+    """
+    CAPACITY = 4096
+
+    def __init__(self, capacity: int = CAPACITY):
+        """
+            :arg capacity: number of most recent events kept
+            :arg type: int
+        """
+        self.enabled = False
+        self._events = deque(maxlen=capacity)
+        self._seq = 0
+        self._sink = None
+
+    @property
+    def capacity(self) -> int:
+        """
+            View of the number of most recent events kept
+            :rtype: int
+        """
+        return self._events.maxlen
+
+    @property
+    def events(self) -> tuple:
+        """
+            View of the events kept, oldest first
+            :rtype: tuple of TraceEvent
+        """
+        return tuple(self._events)
+
+    def enable(self, capacity: int = None, sink = None) -> None:
+        """
+            Start recording events, discarding any kept so far
+            :arg capacity: number of most recent events kept, unchanged if not given
+            :arg sink: optional text stream the trace is dumped to when a game ends
+            :arg type: int
+            :arg type: file
+            :returns: nothing
+            :rtype: None
+        """
+        self._events = deque(maxlen=capacity or self.capacity)
+        self._seq = 0
+        self._sink = sink
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+            Stop recording events, keeping those recorded for inspection
+            :returns: nothing
+            :rtype: None
+        """
+        self.enabled = False
+        self._sink = None
+
+    def record(self, kind: TraceKind, *data) -> None:
+        """
+            Record an event, evicting the oldest event when full
+            :arg kind: the kind of event
+            :arg data: the raw values describing the event
+            :arg type: TraceKind
+            :arg type: tuple
+            :returns: nothing
+            :rtype: None
+        """
+        self._events.append(TraceEvent(self._seq, kind, data))
+        self._seq += 1
+
+    def dump(self, stream = None) -> None:
+        """
+            Write the events kept, oldest first, one per line
+            :arg stream: text stream to write to, stderr if not given
+            :arg type: file
+            :returns: nothing
+            :rtype: None
+        """
+        stream = stream or sys.stderr
+        for event in self._events:
+            stream.write(f'{event.seq:>8} {event.kind.value:<12} {" ".join(map(str, event.data))}\n')
+        stream.flush()
+
+    def game_over(self) -> None:
+        """
+            Dump the trace to the sink given when enabled, if any
+            :returns: nothing
+            :rtype: None
+        """
+        if self.enabled and self._sink:
+            self.dump(self._sink)
+
+
+TRACER = Tracer()
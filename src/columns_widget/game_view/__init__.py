@@ -10,18 +10,124 @@ from tilematch_tools import GameView, GameState, GameEvent, GameInfo
 from tilematch_tools.view.board_view import BoundingBox
 from tilematch_tools.model import TileColor
 
+from ..game_model import ColumnsPhase
+
+FALLER_OUTLINE = 'black'
+CLEARING_FILL = 'white'
+COLLAPSED_OUTLINE = 'white'
+
+def phase_cells(state: GameState) -> dict:
+    """
+        Find the cells drawn differently for the phase a game is in: the cells cleared while clearing,
+        and the cells tiles fell into while collapsing
+        :arg state: the game to draw
+        :arg type: ColumnsGameState
+        :returns: fill and outline of each cell drawn for the phase
+        :rtype: dict
+    """
+    if state.phase == ColumnsPhase.CLEARING:
+        return {cell: (CLEARING_FILL, FALLER_OUTLINE) for cell in state.cleared}
+    if state.phase == ColumnsPhase.COLLAPSING:
+        board = state.board
+        return {(x, y): (board.tile_at(x, y).color, COLLAPSED_OUTLINE) for x, y in state.collapsed}
+    return {}
+
+def phase_text(state: GameState) -> str:
+    """
+        Describe the phase a game is in, with the depth of the chain being cleared
+        :arg state: the game to describe
+        :arg type: ColumnsGameState
+        :returns: the text shown, empty while the faller falls
+        :rtype: str
+    """
+    if state.phase == ColumnsPhase.FALLING:
+        return ''
+    text = state.phase.value.capitalize()
+    return f'{text} x{state.chain_depth}' if state.chain_depth > 1 else text
+
+class CanvasCells:
+    """
+        Class tracking the fill and outline last drawn for each item of a canvas,
+        so an item is only reconfigured when what it shows changes
+    """
+
+    def __init__(self, canvas: tk.Canvas):
+        self._canvas = canvas
+        self._items = {}
+        self._drawn = {}
+        self._calls = 0
+
+    @property
+    def calls(self) -> int:
+        """
+            View of the number of canvas calls made since the current frame started
+            :rtype: int
+        """
+        return self._calls
+
+    def start_frame(self) -> None:
+        """
+            Start counting canvas calls for a new frame
+            :returns: nothing
+            :rtype: None
+        """
+        self._calls = 0
+
+    def create(self, key, box: BoundingBox, fill: str, outline: str = 'black') -> None:
+        """
+            Create the rectangle item shown for a key
+            :arg key: the key the item is painted by
+            :arg box: the bounds of the rectangle
+            :arg fill: the initial fill color
+            :arg outline: the initial outline color
+            :arg type: hashable
+            :arg type: BoundingBox
+            :arg type: str
+            :arg type: str
+            :returns: nothing
+            :rtype: None
+        """
+        self._items[key] = self._canvas.create_rectangle(
+                box.start_x, box.start_y, box.end_x, box.end_y, fill=fill, outline=outline, width=1
+                )
+        self._drawn[key] = (fill, outline)
+        self._calls += 1
+
+    def paint(self, key, fill: str, outline: str) -> bool:
+        """
+            Show new colors on the item of a key if they differ from those last drawn
+            :arg key: the key of the item to paint
+            :arg fill: the fill color to show
+            :arg outline: the outline color to show
+            :arg type: hashable
+            :arg type: str
+            :arg type: str
+            :returns: true if the canvas was reconfigured
+            :rtype: bool
+        """
+        if self._drawn[key] == (fill, outline):
+            return False
+        self._canvas.itemconfig(self._items[key], fill=fill, outline=outline, width=1)
+        self._drawn[key] = (fill, outline)
+        self._calls += 1
+        return True
+
+
 class ColumnsNextFallerView(GameInfo):
     top = BoundingBox(0, 0, 30, 30)
     center = BoundingBox(0, 30, 30, 60)
     bottom = BoundingBox(0, 60, 30, 90)
-    def __init__(self, parent, game_to_watch: GameState, **options):
+    spacing = 40
+    def __init__(self, parent, game_to_watch: GameState, previews: int = 1, **options):
         self._watching = game_to_watch
-        self._tiles = {}
+        self._previews = previews
+        self._cells = None
+        self._shown = ()
         super().__init__(parent, **options)
 
     def create_widgets(self):
         self._next_label = tk.Label(self, text='Next: ', font=self.font, width=10, anchor=tk.N)
-        self._next_display = tk.Canvas(self, width=30, height=90) # enough for three tiles stacked on top of each other
+        self._next_display = tk.Canvas(self, width=self.spacing * (self._previews - 1) + 30, height=90) # three tiles stacked per preview
         self._init_display()
 
     def place_widgets(self):
@@ -29,72 +135,163 @@ class ColumnsNextFallerView(GameInfo):
         self._next_display.grid(column=0, row=1)
 
     def _init_display(self):
-        self._tiles['top'] = self._next_display.create_rectangle(
-                self.top.start_x, 
-                self.top.start_y, 
-                self.top.end_x,
-                self.top.end_y, 
-                fill=TileColor.LIGHT_GRAY, 
-                width=1
-            )
-
-        self._tiles['center'] = self._next_display.create_rectangle(
-                self.center.start_x, 
-                self.center.start_y, 
-                self.center.end_x,
-                self.center.end_y, 
-                fill=TileColor.LIGHT_GRAY, 
-                width=1
-            )
-        self._tiles['bottom'] = self._next_display.create_rectangle(
-                self.bottom.start_x, 
-                self.bottom.start_y, 
-                self.bottom.end_x,
-                self.bottom.end_y, 
-                fill=TileColor.LIGHT_GRAY, 
-                width=1
-            )
+        self._cells = CanvasCells(self._next_display)
+        for preview in range(self._previews):
+            offset = preview * self.spacing
+            for position, box in (('top', self.top), ('center', self.center), ('bottom', self.bottom)):
+                self._cells.create(
+                        (preview, position),
+                        BoundingBox(box.start_x + offset, box.start_y, box.end_x + offset, box.end_y),
+                        TileColor.LIGHT_GRAY
+                        )
+
+    @property
+    def canvas_calls(self) -> int:
+        """
+            View of the number of canvas calls made by the last update
+            :rtype: int
+        """
+        return self._cells.calls
 
     def update(self):
-        self._next_display.itemconfig(
-                self._tiles['bottom'],
-                fill=self.watching.members[0].color,
-                outline=self.watching.members[0].border,
-                width=1
-            )
-            
-        self._next_display.itemconfig(
-                self._tiles['center'],
-                fill=self.watching.members[1].color,
-                outline=self.watching.members[1].border,
-                width=1
-            )
-
-        self._next_display.itemconfig(
-                self._tiles['top'],
-                fill=self.watching.members[2].color,
-                outline=self.watching.members[2].border,
-                width=1
-            )
+        self._cells.start_frame()
+        upcoming = self._watching.upcoming_fallers[:self._previews]
+        if upcoming == self._shown:
+            return
+        self._shown = upcoming
+
+        for preview, faller in enumerate(upcoming):
+            for position, color in zip(('bottom', 'center', 'top'), faller.colors):
+                self._cells.paint((preview, position), color, FALLER_OUTLINE)
 
     @property
     def watching(self):
         return self._watching.next_faller
 
+class ColumnsBoardView(GameInfo):
+    """
+        Class drawing a columns board, reconfiguring only the cells the board reports as changed
+        whose color or border differs from what was last drawn.
+        Cells of a faller that is not placed on the board are drawn over the board, and redrawn
+        from the board once the faller leaves them. The cells the faller would land on are outlined
+        in its colors the same way, as are the cells being cleared or collapsed into
+    """
+    size = 30
+
+    def __init__(self, parent, game_to_watch: GameState, **options):
+        self._watching = game_to_watch
+        self._changed = game_to_watch.board.track_changes()
+        self._floating = {}
+        self._landing = {}
+        self._phased = {}
+        self._cells = None
+        super().__init__(parent, **options)
+
+    def create_widgets(self):
+        board = self._watching.board
+        self._display = tk.Canvas(self, width=self.size * board.num_cols, height=self.size * board.num_rows)
+        self._cells = CanvasCells(self._display)
+        for x in range(1, board.num_cols + 1):
+            for y in range(1, board.num_rows + 1):
+                left, top = (x - 1) * self.size, (board.num_rows - y) * self.size
+                self._cells.create((x, y), BoundingBox(left, top, left + self.size, top + self.size), TileColor.LIGHT_GRAY)
+                self._changed.add((x, y))
+
+    def place_widgets(self):
+        self._display.grid(column=0, row=0)
+
+    @property
+    def canvas_calls(self) -> int:
+        """
+            View of the number of canvas calls made by the last update
+            :rtype: int
+        """
+        return self._cells.calls
+
+    def update(self):
+        self._cells.start_frame()
+        board = self._watching.board
+        floating = dict(self._watching.floating)
+        landing = dict(self._watching.landing_preview)
+        phased = phase_cells(self._watching)
+        for x, y in self._changed.union(self._floating, floating, self._landing, landing, self._phased, phased):
+            if (x, y) in phased:
+                self._cells.paint((x, y), *phased[x, y])
+            elif (x, y) in floating:
+                self._cells.paint((x, y), floating[x, y], FALLER_OUTLINE)
+            elif (x, y) in landing:
+                self._cells.paint((x, y), TileColor.LIGHT_GRAY, landing[x, y])
+            elif 0 < x <= board.num_cols and 0 < y <= board.num_rows:
+                tile = board.tile_at(x, y)
+                self._cells.paint((x, y), tile.color, tile.border)
+        self._changed.clear()
+        self._floating = floating
+        self._landing = landing
+        self._phased = phased
+
+
+class ColumnsPhaseView(GameInfo):
+    """
+        Class showing the phase a columns game is in while its matches are cleared and collapsed
+    """
+
+    def __init__(self, parent, game_to_watch: GameState, **options):
+        self._watching = game_to_watch
+        self._shown = None
+        super().__init__(parent, **options)
+
+    def create_widgets(self):
+        self._phase_label = tk.Label(self, text='', font=self.font, width=14, anchor=tk.N)
+
+    def place_widgets(self):
+        self._phase_label.grid(column=0, row=0)
+
+    def update(self):
+        text = phase_text(self._watching)
+        if text != self._shown:
+            self._phase_label.configure(text=text)
+            self._shown = text
+
+
 class ColumnsView(GameView):
     """Class representing the columns view"""
     def __init__(self, parent, game_state: GameState):
         super().__init__(parent, game_state, 'Columns')
+        self._add_board_view()
         self._add_next_view()
+        self._add_phase_view()
+
+    @property
+    def canvas_calls(self) -> int:
+        """
+            View of the number of canvas calls made by the last update of each columns widget
+            :rtype: int
+        """
+        return sum(
+                widget.canvas_calls for widget in self._game_widgets.values() if hasattr(widget, 'canvas_calls')
+                )
 
     @property
     def watching(self):
         return self._game
 
+    def _add_board_view(self):
+        replaced = self._game_widgets.get('board')
+        placement = {'column': 0, 'row': 1}
+        if replaced is not None:
+            placement = {key: replaced.grid_info()[key] for key in ('column', 'row', 'rowspan', 'columnspan')}
+            replaced.destroy()
+        self._game_widgets['board'] = ColumnsBoardView(self, self.watching)
+        self._game_widgets['board'].grid(**placement)
+
     def _add_next_view(self):
-        self._game_widgets['next'] = ColumnsNextFallerView(self, self.watching)
+        self._game_widgets['next'] = ColumnsNextFallerView(self, self.watching, len(self.watching.upcoming_fallers))
         self._game_widgets['next'].grid(column=6, row=2, padx=30)
 
+    def _add_phase_view(self):
+        self._game_widgets['phase'] = ColumnsPhaseView(self, self.watching)
+        self._game_widgets['phase'].grid(column=6, row=3, padx=30)
+
 class ShiftFallerLeft(GameEvent):
     def __call__(self, event):
         self.listener.shift_faller_left()
@@ -110,3 +307,7 @@ class RotateFallerUp(GameEvent):
 class RotateFallerDown(GameEvent):
     def __call__(self, event):
         self.listener.rotate_faller_down()
+
+class HardDropFaller(GameEvent):
+    def __call__(self, event):
+        self.listener.hard_drop_faller()
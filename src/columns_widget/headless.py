@@ -0,0 +1,227 @@
+"""
+    :module_name: headless
+    :module_summary: a driver running columns without a view or wall clock
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+import logging
+import random
+from operator import methodcaller
+from collections import deque
+from enum import StrEnum
+
+from . import ColumnsGame
+from .columns import ColumnsGameState, ColumnsLoopLogic, PhasedLoopLogic, ColumnsPhase
+from .game_model import TRACER
+from .metrics import METRICS
+from .recording import RECORDER
+
+LOGGER = logging.getLogger(__name__)
+
+class ColumnsInput(StrEnum):
+    """Enumeration of the inputs a player can give a columns game"""
+    SHIFT_LEFT = 'left'
+    SHIFT_RIGHT = 'right'
+    ROTATE_UP = 'up'
+    ROTATE_DOWN = 'down'
+    HARD_DROP = 'drop'
+
+
+INPUT_ACTIONS = {
+        ColumnsInput.SHIFT_LEFT: methodcaller('shift_faller_left'),
+        ColumnsInput.SHIFT_RIGHT: methodcaller('shift_faller_right'),
+        ColumnsInput.ROTATE_UP: methodcaller('rotate_faller_up'),
+        ColumnsInput.ROTATE_DOWN: methodcaller('rotate_faller_down'),
+        ColumnsInput.HARD_DROP: methodcaller('hard_drop_faller')
+        }
+
+
+def random_input_source(seed: int):
+    """
+        Build an input source that gives one random input per tick
+        :arg seed: seed of the inputs chosen
+        :arg type: int
+        :returns: an input source for HeadlessGameLoop
+        :rtype: callable
+    """
+    choose = random.Random(seed).choice
+    inputs = list(ColumnsInput)
+    return lambda loop: (choose(inputs),)
+
+
+class VirtualClock:
+    """Class representing a clock that only moves when told to"""
+
+    def __init__(self, start: int = 0):
+        self._now = start
+
+    @property
+    def now(self) -> int:
+        """
+            View of the current time
+            :returns: nanoseconds since the clock started
+            :rtype: int
+        """
+        return self._now
+
+    def advance(self, delay: int) -> None:
+        """
+            Move the clock forward
+            :arg delay: nanoseconds to move forward by
+            :arg type: int
+            :returns: nothing
+            :rtype: None
+        """
+        self._now += delay
+
+
+class HeadlessGameLoop(ColumnsLoopLogic):
+    """
+        Game loop logic for columns driven programmatically on a virtual clock.
+        Each step runs one tick worth of game logic as fast as possible
+    """
+
+    def __init__(self, state: ColumnsGameState, delay: int = ColumnsGame.TICK, input_source = None):
+        """
+            :arg state: the game state to drive
+            :arg delay: virtual nanoseconds that pass per tick
+            :arg input_source: optional callable taking this loop and returning the inputs for the next tick
+            :arg type: ColumnsGameState
+            :arg type: int
+            :arg type: callable
+        """
+        self._state = state
+        self._delay = delay
+        self._input_source = input_source
+        self._inputs = deque()
+        self._clock = VirtualClock()
+        self._ticks = 0
+        self._matches = 0
+        self._longest_chain = 0
+        if METRICS.enabled:
+            METRICS.track(self)
+        if RECORDER.enabled:
+            RECORDER.record(self, isinstance(self, PhasedLoopLogic))
+
+    @property
+    def state(self) -> ColumnsGameState:
+        """
+            View of the game state being driven
+            :rtype: ColumnsGameState
+        """
+        return self._state
+
+    @property
+    def clock(self) -> VirtualClock:
+        """
+            View of the virtual clock of this loop
+            :rtype: VirtualClock
+        """
+        return self._clock
+
+    @property
+    def ticks(self) -> int:
+        """
+            View of the number of ticks run so far
+            :rtype: int
+        """
+        return self._ticks
+
+    @property
+    def matches(self) -> int:
+        """
+            View of the number of matches cleared so far
+            :rtype: int
+        """
+        return self._matches
+
+    @property
+    def longest_chain(self) -> int:
+        """
+            View of the deepest chain resolved after a faller landed
+            :rtype: int
+        """
+        return self._longest_chain
+
+    def press(self, *inputs: ColumnsInput) -> None:
+        """
+            Queue inputs to be applied at the start of the next step
+            :arg inputs: the inputs to give
+            :arg type: ColumnsInput
+            :returns: nothing
+            :rtype: None
+        """
+        self._inputs.extend(inputs)
+
+    def step(self) -> bool:
+        """
+            Apply the queued inputs then run one tick of game logic, resolving any chain a landing caused
+            :returns: false once the game is over, otherwise true
+            :rtype: bool
+        """
+        if self._state.gameover():
+            return False
+        if self._input_source:
+            self._inputs.extend(self._input_source(self))
+        while self._inputs:
+            INPUT_ACTIONS[self._inputs.popleft()](self._state)
+
+        self.tick()
+        self._settle()
+
+        self._ticks += 1
+        self._clock.advance(self._delay)
+        return not self._state.gameover()
+
+    def _settle(self) -> None:
+        """
+            Helper method for resolving any chain the tick's landing caused
+            :returns: nothing
+            :rtype: None
+        """
+        if not self._state.active_faller:
+            resolution = self.resolve()
+            self._matches += resolution.match_count
+            self._longest_chain = max(self._longest_chain, resolution.chain_depth)
+
+    def run(self, max_ticks: int = None) -> int:
+        """
+            Step the game until it is over
+            :arg max_ticks: optional limit on the number of ticks to run
+            :arg type: int
+            :returns: the number of ticks run
+            :rtype: int
+        """
+        while (max_ticks is None or self._ticks < max_ticks) and self.step():
+            pass
+        LOGGER.debug('Headless game stopped after %d ticks', self._ticks)
+        if self._state.gameover():
+            TRACER.game_over()
+        return self._ticks
+
+
+class PhasedHeadlessGameLoop(PhasedLoopLogic, HeadlessGameLoop):
+    """
+        Headless game loop logic that spreads clearing and collapsing across ticks like ColumnsGameLoop,
+        so games played in a view play the same when driven headlessly
+    """
+
+    def __init__(self, state: ColumnsGameState, delay: int = ColumnsGame.TICK, input_source = None):
+        self._chain = 0
+        super().__init__(state, delay, input_source)
+
+    def _settle(self) -> None:
+        """
+            Helper method for running the match phases that follow each tick of a ColumnsGameLoop
+            :returns: nothing
+            :rtype: None
+        """
+        matches = self.find_matches(self._state.match_rules)
+        self.clear_matches(matches)
+        self.clean_up_state()
+        if matches:
+            self._chain += 1
+            self._matches += len(matches)
+            self._longest_chain = max(self._longest_chain, self._chain)
+        elif self._state.phase == ColumnsPhase.FALLING:
+            self._chain = 0
@@ -0,0 +1,319 @@
+"""
+    :module_name: metrics
+    :module_summary: per-phase timing histograms and board operation counts of columns games, exported as Prometheus text
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+import bisect
+import logging
+import os
+import tempfile
+import threading
+import time
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LOGGER = logging.getLogger(__name__)
+
+# seconds, from a tenth of a millisecond up to a whole tick
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+LOOP_PHASES = ('tick', 'find_matches', 'clear_matches', 'clean_up_state', 'resolve')
+BOARD_OPERATIONS = ('tile_at', 'place_tile')
+FALLER_MOVES = ('shift_faller_left', 'shift_faller_right', 'rotate_faller_up', 'rotate_faller_down', 'hard_drop_faller')
+
+
+class Histogram:
+    """
+        Class counting observations into buckets of increasing upper bounds
+    """
+
+    def __init__(self, buckets: tuple = BUCKETS):
+        """
+            :arg buckets: upper bound of each bucket, in increasing order
+            :arg type: tuple
+        """
+        self._bounds = tuple(buckets)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+            Count an observation in the first bucket whose bound is not below it
+            :arg value: the observation
+            :arg type: float
+            :returns: nothing
+            :rtype: None
+        """
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self._sum += value
+
+    @property
+    def count(self) -> int:
+        """
+            View of the number of observations
+            :rtype: int
+        """
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        """
+            View of the total of every observation
+            :rtype: float
+        """
+        return self._sum
+
+    @property
+    def buckets(self) -> tuple:
+        """
+            View of the cumulative count of observations at or below each bound, ending with infinity
+            :rtype: tuple of (float, int)
+        """
+        cumulative, total = [], 0
+        for bound, count in zip((*self._bounds, float('inf')), self._counts):
+            total += count
+            cumulative.append((bound, total))
+        return tuple(cumulative)
+
+
+class GameMetrics:
+    """
+        Class holding the phase timings and board operation counts of one game.
+        Instrumenting wraps methods on the instrumented instances only, so games that are not
+        instrumented pay nothing
+    """
+
+    def __init__(self, game: str):
+        """
+            :arg game: name of the game, used as the game label when exported
+            :arg type: str
+        """
+        self._game = game
+        self._phases = {}
+        self._operations = dict.fromkeys((*BOARD_OPERATIONS, 'rejected_move'), 0)
+
+    @property
+    def game(self) -> str:
+        """
+            View of the name of the game measured
+            :rtype: str
+        """
+        return self._game
+
+    @property
+    def phases(self) -> dict:
+        """
+            View of the timing histogram of each phase measured
+            :rtype: dict of str to Histogram
+        """
+        return dict(self._phases)
+
+    @property
+    def operations(self) -> dict:
+        """
+            View of the number of times each board operation was made
+            :rtype: dict of str to int
+        """
+        return dict(self._operations)
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """
+            Record the time a phase took
+            :arg phase: name of the phase
+            :arg seconds: time the phase took
+            :arg type: str
+            :arg type: float
+            :returns: nothing
+            :rtype: None
+        """
+        if phase not in self._phases:
+            self._phases[phase] = Histogram()
+        self._phases[phase].observe(seconds)
+
+    def count(self, operation: str, times: int = 1) -> None:
+        """
+            Record board operations
+            :arg operation: name of the operation
+            :arg times: number of operations made
+            :arg type: str
+            :arg type: int
+            :returns: nothing
+            :rtype: None
+        """
+        self._operations[operation] = self._operations.get(operation, 0) + times
+
+    def instrument(self, loop) -> None:
+        """
+            Time the phases of a game loop, count the operations made on its board and,
+            if it has a view, time each widget of the view updating
+            :arg loop: the loop to instrument
+            :arg type: ColumnsLoopLogic
+            :returns: nothing
+            :rtype: None
+        """
+        for phase in LOOP_PHASES:
+            setattr(loop, phase, self._timed(phase, getattr(loop, phase)))
+
+        state = loop.state
+        for operation in BOARD_OPERATIONS:
+            setattr(state.board, operation, self._counted(operation, getattr(state.board, operation)))
+        for move in FALLER_MOVES:
+            setattr(state, move, self._rejections_counted(state, getattr(state, move)))
+
+        for name, widget in getattr(getattr(loop, 'view', None), '_game_widgets', {}).items():
+            widget.update = self._timed(f'view_update:{name}', widget.update)
+
+    def _timed(self, phase: str, method):
+        @wraps(method)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.observe(phase, time.perf_counter() - started)
+        return timed
+
+    def _counted(self, operation: str, method):
+        operations = self._operations
+        @wraps(method)
+        def counted(*args, **kwargs):
+            operations[operation] += 1
+            return method(*args, **kwargs)
+        return counted
+
+    def _rejections_counted(self, state, method):
+        operations = self._operations
+        @wraps(method)
+        def counted(*args, **kwargs):
+            attempted = state.active_faller is not None
+            moved = method(*args, **kwargs)
+            if attempted and moved is False:
+                operations['rejected_move'] += 1
+            return moved
+        return counted
+
+
+class MetricsRegistry:
+    """
+        Class holding the metrics of every game instrumented in this process
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._games = []
+        self._lock = threading.Lock()
+
+    @property
+    def games(self) -> tuple:
+        """
+            View of the metrics of each game tracked, in the order they were tracked
+            :rtype: tuple of GameMetrics
+        """
+        return tuple(self._games)
+
+    def track(self, loop) -> GameMetrics:
+        """
+            Instrument a game loop and keep its metrics
+            :arg loop: the loop to instrument
+            :arg type: ColumnsLoopLogic
+            :returns: the metrics of the loop
+            :rtype: GameMetrics
+        """
+        with self._lock:
+            metrics = GameMetrics(f'game{len(self._games) + 1}')
+            self._games.append(metrics)
+        metrics.instrument(loop)
+        return metrics
+
+    def export(self) -> str:
+        """
+            Render the metrics of every game tracked in the Prometheus text exposition format
+            :returns: the exposition
+            :rtype: str
+        """
+        lines = [
+                '# HELP columns_phase_seconds Time spent in each phase of a game',
+                '# TYPE columns_phase_seconds histogram'
+                ]
+        for metrics in self.games:
+            for phase, histogram in metrics.phases.items():
+                labels = f'game="{metrics.game}",phase="{phase}"'
+                for bound, count in histogram.buckets:
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f'columns_phase_seconds_bucket{{{labels},le="{le}"}} {count}')
+                lines.append(f'columns_phase_seconds_sum{{{labels}}} {histogram.sum!r}')
+                lines.append(f'columns_phase_seconds_count{{{labels}}} {histogram.count}')
+        lines.extend([
+                '# HELP columns_board_operations_total Operations made on the board of a game',
+                '# TYPE columns_board_operations_total counter'
+                ])
+        for metrics in self.games:
+            for operation, count in metrics.operations.items():
+                lines.append(f'columns_board_operations_total{{game="{metrics.game}",operation="{operation}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str) -> None:
+        """
+            Atomically replace a file with the current exposition, for a textfile collector to scrape
+            :arg path: path of the file written
+            :arg type: str
+            :returns: nothing
+            :rtype: None
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile('w', dir=directory, delete=False) as textfile:
+            textfile.write(self.export())
+        os.replace(textfile.name, path)
+
+    def write_periodically(self, path: str, interval: float = 5.0) -> threading.Thread:
+        """
+            Rewrite a textfile every interval seconds from a daemon thread
+            :arg path: path of the file written
+            :arg interval: seconds between writes
+            :arg type: str
+            :arg type: float
+            :returns: the writing thread
+            :rtype: threading.Thread
+        """
+        def write():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.write_textfile(path)
+                except OSError:
+                    LOGGER.exception('Could not write metrics to %s', path)
+        writer = threading.Thread(target=write, name='columns-metrics-writer', daemon=True)
+        writer.start()
+        return writer
+
+    def serve(self, port: int, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """
+            Serve the exposition over HTTP from a daemon thread
+            :arg port: port listened on, 0 picks a free port
+            :arg host: address listened on
+            :arg type: int
+            :arg type: str
+            :returns: the server, its server_address holds the port picked
+            :rtype: ThreadingHTTPServer
+        """
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.export().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                LOGGER.debug(format, *args)
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name='columns-metrics-server', daemon=True).start()
+        return server
+
+
+METRICS = MetricsRegistry()
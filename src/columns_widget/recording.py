@@ -0,0 +1,187 @@
+"""
+    :module_name: recording
+    :module_summary: append-only binary logs of the starting state and inputs of columns games
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+import logging
+import os
+import struct
+import threading
+from functools import wraps
+
+from .metrics import FALLER_MOVES
+
+LOGGER = logging.getLogger(__name__)
+
+LOG_MAGIC = b'CLOG'
+LOG_VERSION = 2
+# magic, version, flags, length of the snapshot of the starting state that follows
+LOG_HEADER = struct.Struct('<4sBBI')
+# ticks run before the input, then the index of the input in FALLER_MOVES
+LOG_EVENT = struct.Struct('<IB')
+# input code of the event closing a log, stamped with the ticks run when the game stopped
+LOG_END = 255
+# the game spread clearing and collapsing across ticks
+PHASED = 1
+
+
+class LogWriter:
+    """
+        Class appending the inputs given to a game to a binary log, each stamped with the ticks run before it.
+        The log starts with a snapshot of the game's state, which holds the seed of its fallers, so playing
+        the inputs back from that snapshot always plays the same game
+    """
+
+    def __init__(self, stream, state, phased: bool = False):
+        """
+            :arg stream: binary stream the log is written to
+            :arg state: the state of the game recorded, before any input is given
+            :arg phased: the game spreads clearing and collapsing across ticks
+            :arg type: file
+            :arg type: ColumnsGameState
+            :arg type: bool
+        """
+        self._stream = stream
+        self._state = state
+        self._ticks = 0
+        self._ended = False
+        snapshot = state.snapshot()
+        stream.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, PHASED if phased else 0, len(snapshot)) + snapshot)
+        stream.flush()
+
+    @property
+    def ticks(self) -> int:
+        """
+            View of the number of ticks run since the log started
+            :rtype: int
+        """
+        return self._ticks
+
+    @property
+    def ended(self) -> bool:
+        """
+            View of whether the log has been closed
+            :rtype: bool
+        """
+        return self._ended
+
+    def attach(self, loop) -> None:
+        """
+            Record the inputs given to the state of a loop and count the ticks the loop runs
+            :arg loop: the loop to record
+            :arg type: ColumnsLoopLogic
+            :returns: nothing
+            :rtype: None
+        """
+        state = loop.state
+        for code, move in enumerate(FALLER_MOVES):
+            setattr(state, move, self._recorded(code, getattr(state, move)))
+        loop.tick = self._counted(loop.tick)
+
+    def record(self, code: int) -> None:
+        """
+            Append an input to the log, stamped with the ticks run so far
+            :arg code: index of the input in FALLER_MOVES
+            :arg type: int
+            :returns: nothing
+            :rtype: None
+        """
+        if self._ended:
+            return
+        self._stream.write(LOG_EVENT.pack(self._ticks, code))
+        self._stream.flush()
+
+    def end(self) -> None:
+        """
+            Close the log with the number of ticks run, later inputs are not recorded
+            :returns: nothing
+            :rtype: None
+        """
+        if self._ended:
+            return
+        self.record(LOG_END)
+        self._ended = True
+        self._stream.close()
+
+    def _recorded(self, code: int, move):
+        @wraps(move)
+        def recorded(*args, **kwargs):
+            self.record(code)
+            return move(*args, **kwargs)
+        return recorded
+
+    def _counted(self, tick):
+        @wraps(tick)
+        def counted(*args, **kwargs):
+            tick(*args, **kwargs)
+            self._ticks += 1
+            if self._state.gameover():
+                self.end()
+        return counted
+
+
+class GameRecorder:
+    """
+        Class writing a log of every game played in this process to a directory
+    """
+    SUFFIX = '.clog'
+
+    def __init__(self):
+        self.enabled = False
+        self._directory = None
+        self._writers = []
+        self._lock = threading.Lock()
+
+    @property
+    def writers(self) -> tuple:
+        """
+            View of the writer of each game recorded, in the order they were recorded
+            :rtype: tuple of LogWriter
+        """
+        return tuple(self._writers)
+
+    def enable(self, directory: str) -> None:
+        """
+            Start recording every game loop built from now on
+            :arg directory: directory the logs are written to, created if missing
+            :arg type: str
+            :returns: nothing
+            :rtype: None
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self.enabled = True
+
+    def record(self, loop, phased: bool = False) -> LogWriter:
+        """
+            Start logging a game loop, named after the seed of its fallers
+            :arg loop: the loop to record, before any input is given
+            :arg phased: the loop spreads clearing and collapsing across ticks
+            :arg type: ColumnsLoopLogic
+            :arg type: bool
+            :returns: the writer of the game's log
+            :rtype: LogWriter
+        """
+        with self._lock:
+            path = os.path.join(
+                    self._directory,
+                    f'{loop.state.fallers.seed}-{os.getpid()}-{len(self._writers) + 1}{self.SUFFIX}'
+                    )
+            writer = LogWriter(open(path, 'wb'), loop.state, phased)
+            self._writers.append(writer)
+        writer.attach(loop)
+        LOGGER.info('Recording game to %s', path)
+        return writer
+
+    def close(self) -> None:
+        """
+            End the log of every game still being recorded
+            :returns: nothing
+            :rtype: None
+        """
+        for writer in self.writers:
+            writer.end()
+
+
+RECORDER = GameRecorder()
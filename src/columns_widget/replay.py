@@ -0,0 +1,143 @@
+"""
+    :module_name: replay
+    :module_summary: playback of columns game logs, headlessly at full speed or in real time through a view
+    :module_author: Nathan Mendoza (nathancm@uci.edu)
+"""
+
+import logging
+from collections import namedtuple, deque
+
+from .columns import ColumnsGameState, ColumnsGameLoop
+from .headless import HeadlessGameLoop, PhasedHeadlessGameLoop, ColumnsInput, INPUT_ACTIONS
+from .metrics import FALLER_MOVES
+from .recording import LOG_MAGIC, LOG_VERSION, LOG_HEADER, LOG_EVENT, LOG_END, PHASED
+
+LOGGER = logging.getLogger(__name__)
+
+ReplayLog = namedtuple('ReplayLog', ['snapshot', 'phased', 'events', 'end'])
+
+MOVE_INPUTS = {
+        'shift_faller_left': ColumnsInput.SHIFT_LEFT,
+        'shift_faller_right': ColumnsInput.SHIFT_RIGHT,
+        'rotate_faller_up': ColumnsInput.ROTATE_UP,
+        'rotate_faller_down': ColumnsInput.ROTATE_DOWN,
+        'hard_drop_faller': ColumnsInput.HARD_DROP
+        }
+CODE_INPUTS = {code: MOVE_INPUTS[move] for code, move in enumerate(FALLER_MOVES)}
+
+
+def read_log(stream) -> ReplayLog:
+    """
+        Read a log written by a LogWriter. A log cut short, as by a crash, is read up to its last whole event
+        :arg stream: binary stream the log is read from
+        :arg type: file
+        :returns: the starting snapshot, whether the game was phased, each (tick, input) and the ticks run
+            when the log was closed, None if it never was
+        :rtype: ReplayLog
+        :raises: ValueError if the stream does not hold a log of this version
+    """
+    data = stream.read()
+    if len(data) < LOG_HEADER.size:
+        raise ValueError('Log is missing its header')
+    magic, version, flags, length = LOG_HEADER.unpack_from(data)
+    if magic != LOG_MAGIC or version != LOG_VERSION:
+        raise ValueError(f'Not a version {LOG_VERSION} columns log')
+    offset = LOG_HEADER.size + length
+    snapshot = data[LOG_HEADER.size:offset]
+    events = []
+    end = None
+    for tick, code in LOG_EVENT.iter_unpack(data[offset:len(data) - (len(data) - offset) % LOG_EVENT.size]):
+        if code == LOG_END:
+            end = tick
+            break
+        events.append((tick, CODE_INPUTS[code]))
+    return ReplayLog(snapshot, bool(flags & PHASED), tuple(events), end)
+
+
+class ReplaySource:
+    """
+        Class giving a headless loop the inputs of a log at the ticks they were given
+    """
+
+    def __init__(self, events: tuple):
+        """
+            :arg events: the (tick, input) of each input, in the order they were given
+            :arg type: tuple
+        """
+        self._events = deque(events)
+
+    @property
+    def remaining(self) -> int:
+        """
+            View of the number of inputs not given yet
+            :rtype: int
+        """
+        return len(self._events)
+
+    def __call__(self, loop) -> list:
+        """
+            Take the inputs given before the next tick of a loop
+            :arg loop: the loop asking for inputs
+            :arg type: HeadlessGameLoop
+            :returns: the inputs
+            :rtype: list of ColumnsInput
+        """
+        events = self._events
+        inputs = []
+        while events and events[0][0] <= loop.ticks:
+            inputs.append(events.popleft()[1])
+        return inputs
+
+
+def play_back(log: ReplayLog) -> HeadlessGameLoop:
+    """
+        Play a log back headlessly as fast as possible, from its starting snapshot until the tick the log was
+        closed at, or until the game is over or its last input was given if the log was never closed
+        :arg log: the log to play back
+        :arg type: ReplayLog
+        :returns: the loop that played the log, its state is the state the game finished in
+        :rtype: HeadlessGameLoop
+    """
+    source = ReplaySource(log.events)
+    loop_type = PhasedHeadlessGameLoop if log.phased else HeadlessGameLoop
+    loop = loop_type(ColumnsGameState.restore(log.snapshot), input_source=source)
+    if log.end is not None:
+        loop.run(log.end)
+    else:
+        while (source.remaining or not loop.ticks) and loop.step():
+            pass
+    LOGGER.debug('Played back %d ticks', loop.ticks)
+    return loop
+
+
+class ReplayGameLoop(ColumnsGameLoop):
+    """
+        Game loop logic for columns that gives the inputs of a log at the ticks they were given,
+        so a logged game can be watched in real time. A log of a game that was not phased resolves
+        each landing within the tick it lands on, as the HeadlessGameLoop that played it did
+    """
+
+    def __init__(self, state, view, delay, events: tuple = (), phased: bool = True):
+        super().__init__(state, view, delay)
+        self._events = deque(events)
+        self._phased = phased
+        self._ticks = 0
+
+    @property
+    def ticks(self) -> int:
+        """
+            View of the number of ticks run
+            :rtype: int
+        """
+        return self._ticks
+
+    def tick(self):
+        while self._events and self._events[0][0] <= self._ticks:
+            INPUT_ACTIONS[self._events.popleft()[1]](self.state)
+        self._ticks += 1
+        if self._phased:
+            super().tick()
+            return
+        self.state.drop_faller()
+        if not self.state.active_faller:
+            self.state.resolve()
@@ -0,0 +1,113 @@
+"""Tests for columns boards"""
+
+import pytest
+
+from tilematch_tools.core import BoardFactory, TileBuilder
+from tilematch_tools.model import NullTile
+from tilematch_tools.model.exceptions import IllegalTileMovementException, InvalidBoardPositionError
+from columns_widget.game_model import (CompactColumnsBoard,
+                                       ColumnsBoard,
+                                       ColumnsTile,
+                                       ColumnsColor,
+                                       AbsoluteDescent,
+                                       ThreeFoldNorth
+                                       )
+
+class TestCompactColumnsBoard:
+    def setup_method(self):
+        init_tiles = [
+                TileBuilder().add_position(1, 1).add_color(ColumnsColor.RED).construct(ColumnsTile),
+                TileBuilder().add_position(1, 2).add_color(ColumnsColor.RED).construct(ColumnsTile),
+                TileBuilder().add_position(1, 3).add_color(ColumnsColor.RED).construct(ColumnsTile),
+                TileBuilder().add_position(4, 6).add_color(ColumnsColor.BLUE).construct(ColumnsTile)
+                ]
+        self.board = BoardFactory.create_board_with_tiles(
+                CompactColumnsBoard,
+                ColumnsBoard.COLUMNS_BOARD_WIDTH,
+                ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+                init_tiles
+                )
+
+    def test_board_stores_one_byte_per_cell(self):
+        assert len(self.board.cells) == ColumnsBoard.COLUMNS_BOARD_WIDTH * ColumnsBoard.COLUMNS_BOARD_HEIGHT
+        assert self.board.cells.itemsize == 1
+
+    def test_placed_tiles_are_viewed_with_their_color(self):
+        tile = self.board.tile_at(4, 6)
+        assert isinstance(tile, ColumnsTile)
+        assert tile.color == ColumnsColor.BLUE
+        assert (tile.position.x, tile.position.y) == (4, 6)
+
+    def test_empty_cells_are_viewed_as_null_tiles(self):
+        assert isinstance(self.board.tile_at(5, 5), NullTile)
+
+    def test_cannot_place_onto_an_occupied_cell(self):
+        with pytest.raises(IllegalTileMovementException):
+            self.board.place_tile(TileBuilder().add_position(4, 6).add_color(ColumnsColor.RED).construct(ColumnsTile))
+
+    @pytest.mark.parametrize('x, y', [(0, 1), (1, 0), (8, 1), (1, 14)])
+    def test_positions_off_the_board_are_invalid(self, x, y):
+        with pytest.raises(InvalidBoardPositionError):
+            self.board.tile_at(x, y)
+
+    def test_iteration_covers_every_cell(self):
+        assert len(list(self.board)) == ColumnsBoard.COLUMNS_BOARD_WIDTH * ColumnsBoard.COLUMNS_BOARD_HEIGHT
+
+    def test_tiles_move_on_compact_board(self):
+        AbsoluteDescent().move(self.board, self.board.tile_at(4, 6))
+        assert isinstance(self.board.tile_at(4, 6), NullTile)
+        assert self.board.tile_at(4, 1).color == ColumnsColor.BLUE
+
+    def test_match_rules_work_on_compact_board(self):
+        assert ThreeFoldNorth().check_match(self.board, 1, 1) is not None
+
+@pytest.mark.parametrize('board_type', [ColumnsBoard, CompactColumnsBoard])
+def test_can_hold_follows_occupancy(board_type):
+    board = BoardFactory.create_board_with_tiles(
+            board_type,
+            ColumnsBoard.COLUMNS_BOARD_WIDTH,
+            ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+            [TileBuilder().add_position(2, 1).add_color(ColumnsColor.RED).construct(ColumnsTile)]
+            )
+    assert not board.can_hold(2, 1)
+    assert board.can_hold(2, 2)
+    assert board.can_hold(2, ColumnsBoard.COLUMNS_BOARD_HEIGHT + 1)
+    assert not any(board.can_hold(x, y) for x, y in [(0, 1), (ColumnsBoard.COLUMNS_BOARD_WIDTH + 1, 1), (2, 0)])
+    board.place_tile(NullTile(**{'position': (2, 1), 'color': 'gray'}))
+    assert board.can_hold(2, 1)
+
+@pytest.mark.parametrize('board_type', [ColumnsBoard, CompactColumnsBoard])
+def test_column_heights_follow_placements_clears_and_collapses(board_type):
+    board = BoardFactory.create_board_with_tiles(
+            board_type,
+            ColumnsBoard.COLUMNS_BOARD_WIDTH,
+            ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+            [TileBuilder().add_position(3, y).add_color(ColumnsColor.RED).construct(ColumnsTile) for y in (1, 2, 5)]
+            )
+    assert [board.column_height(x) for x in (2, 3)] == [0, 3]
+    board.place_tile(NullTile(**{'position': (3, 2), 'color': 'gray'}))
+    board.place_tile(NullTile(**{'position': (3, 2), 'color': 'gray'}))
+    assert board.column_height(3) == 2
+    board.compact_column(3)
+    assert board.column_height(3) == 2
+    assert not board.can_hold(3, 2) and board.can_hold(3, 3)
+
+@pytest.mark.parametrize('board_type', [ColumnsBoard, CompactColumnsBoard])
+def test_version_grows_with_every_change(board_type):
+    board = BoardFactory.create_board_with_tiles(
+            board_type,
+            ColumnsBoard.COLUMNS_BOARD_WIDTH,
+            ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+            [TileBuilder().add_position(3, y).add_color(ColumnsColor.RED).construct(ColumnsTile) for y in (1, 4)]
+            )
+    versions = [board.version]
+    board.compact_column(3)
+    versions.append(board.version)
+    board.compact_column(3)
+    assert board.version == versions[-1]
+    board.place_tile(NullTile(**{'position': (3, 2), 'color': 'gray'}))
+    versions.append(board.version)
+    board.tile_at(3, 1)
+    board.can_hold(3, 2)
+    assert board.version == versions[-1]
+    assert versions == sorted(set(versions))
@@ -3,7 +3,8 @@
 import pytest
 
 from tilematch_tools.model.tiles import Tile, TileShape, TileGroup
-from columns_widget.game_model import ColumnsColor, ColumnsTile, ColumnsFaller
+from tilematch_tools.core import BoardFactory, TileBuilder
+from columns_widget.game_model import ColumnsColor, ColumnsTile, ColumnsFaller, CompactFaller, ColumnsBoard
 
 class TestColumnsColor:
     def test_color_count_is_six(self):
@@ -48,3 +49,59 @@ class TestColumnsFaller:
 
     def test_faller_contains_three_tiles(self):
         assert self.the_faller.size == 3
+
+    def test_faller_has_no_instance_dict(self):
+        assert not hasattr(self.the_faller, '__dict__')
+
+    def test_faller_positions_are_cached_until_moved(self):
+        positions = self.the_faller.positions
+        assert self.the_faller.positions is positions
+        for y, tile in enumerate(self.the_faller.members, 1):
+            tile.position = (1, y)
+        self.the_faller.moved()
+        assert self.the_faller.positions == ((1, 1), (1, 2), (1, 3))
+
+class TestCompactFaller:
+    def setup_method(self):
+        self.board = BoardFactory.create_board(ColumnsBoard, ColumnsBoard.COLUMNS_BOARD_WIDTH, ColumnsBoard.COLUMNS_BOARD_HEIGHT)
+        self.the_faller = CompactFaller(descent_file=2, codes=(1, 2, 3))
+
+    def test_compact_faller_has_no_instance_dict(self):
+        assert not hasattr(self.the_faller, '__dict__')
+
+    def test_compact_faller_starts_staged(self):
+        assert self.the_faller.positions == ((2, CompactFaller.STAGED), (2, CompactFaller.STAGED + 1), (2, CompactFaller.STAGED + 2))
+
+    def test_rotation_matches_shuffling_members(self):
+        self.the_faller.rotate(-1)
+        assert self.the_faller.codes == (3, 1, 2)
+        self.the_faller.rotate(1)
+        self.the_faller.rotate(1)
+        assert self.the_faller.codes == (2, 3, 1)
+
+    def test_moves_leave_the_board_untouched(self):
+        changes = self.board.track_changes()
+        while self.the_faller.can_fall(self.board):
+            self.the_faller.fall()
+        self.the_faller.shift(1)
+        self.the_faller.rotate(1)
+        assert not changes
+        assert self.the_faller.row == 1
+
+    def test_shifts_are_blocked_by_tiles_and_edges(self):
+        self.the_faller.fall()
+        assert not self.the_faller.can_shift(self.board, -2)
+        self.board.place_tile(TileBuilder().add_position(3, ColumnsBoard.COLUMNS_BOARD_HEIGHT).add_color(ColumnsColor.RED).construct(ColumnsTile))
+        assert not self.the_faller.can_shift(self.board, 1)
+        assert self.the_faller.can_shift(self.board, -1)
+
+    def test_landing_places_visible_members(self):
+        self.the_faller.fall()
+        assert self.the_faller.land(self.board)
+        assert self.board.tile_at(2, ColumnsBoard.COLUMNS_BOARD_HEIGHT).color == ColumnsColor.RED
+
+    def test_landing_on_the_board_places_every_member(self):
+        while self.the_faller.can_fall(self.board):
+            self.the_faller.fall()
+        assert not self.the_faller.land(self.board)
+        assert [self.board.tile_at(2, y).color for y in (1, 2, 3)] == [ColumnsColor.RED, ColumnsColor.ORANGE, ColumnsColor.YELLOW]
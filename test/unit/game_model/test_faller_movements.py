@@ -4,7 +4,7 @@ import pytest
 
 from tilematch_tools import BoardFactory, NullTile, TileBuilder
 
-from columns_widget.game_model import FallerShiftRight, FallerShiftLeft, FallerShuffleUp, FallerShuffleDown, ColumnsBoard, ColumnsTile, ColumnsColor, ColumnsFaller
+from columns_widget.game_model import FallerShiftRight, FallerShiftLeft, FallerShuffleUp, FallerShuffleDown, FallerHardDrop, FallerDescent, ColumnsBoard, ColumnsTile, ColumnsColor, ColumnsFaller
 
 class TestFallerShiftMovement:
     def setup_method(self):
@@ -25,6 +25,7 @@ class TestFallerShiftMovement:
     def test_single_successful_shift_in_descent_file(self, shifter, result_file):
         shifter.move(self.board, self.faller)
         assert all(tile.position.x == result_file for tile in self.faller.members)
+        assert self.faller.descent_file == result_file
 
     @pytest.mark.parametrize('shifter, result_file', [
         (FallerShiftRight(), 7),
@@ -79,6 +80,27 @@ class TestFallerShiftMovement:
 
         assert all(tile.position.x == result_file for tile in self.faller.members)
 
+    @pytest.mark.parametrize('shifter, block_file', [
+        (FallerShiftRight(), 5),
+        (FallerShiftLeft(), 3)
+    ])
+    def test_can_apply_has_no_side_effects(self, shifter, block_file):
+        positions = self.faller.positions
+        assert shifter.can_apply(self.board, self.faller)
+        self.board.place_tile(TileBuilder().add_position(block_file, 6).add_color(ColumnsColor.RED).construct(ColumnsTile))
+        assert not shifter.can_apply(self.board, self.faller)
+        assert self.faller.positions == positions
+        assert all(self.board.tile_at(x, y) is tile for (x, y), tile in zip(positions, self.faller.members))
+
+    @pytest.mark.parametrize('shifter, block_file', [
+        (FallerShiftRight(), 5),
+        (FallerShiftLeft(), 3)
+    ])
+    def test_blocked_move_reports_it_was_not_applied(self, shifter, block_file):
+        self.board.place_tile(TileBuilder().add_position(block_file, 7).add_color(ColumnsColor.RED).construct(ColumnsTile))
+        assert not shifter.move(self.board, self.faller)
+        assert all(tile.position.x == 4 for tile in self.faller.members)
+
 @pytest.fixture
 def upward():
     return FallerShuffleUp()
@@ -128,3 +150,51 @@ class TestFallerShuffleMovement:
             downward.move(self.board, self.faller, self.board, self.faller) # listed twice for post move callback
 
         assert self.faller.members == init_state
+
+    def test_shuffles_can_always_apply(self, upward, downward):
+        assert upward.can_apply(self.board, self.faller)
+        assert downward.can_apply(self.board, self.faller)
+
+
+class TestFallerHardDropMovement:
+    def setup_method(self):
+        self.faller = ColumnsFaller()
+        for y, tile in enumerate(self.faller.members, 5):
+            tile.position = (4, y)
+        self.board = BoardFactory.create_board_with_tiles(
+                ColumnsBoard,
+                ColumnsBoard.COLUMNS_BOARD_WIDTH,
+                ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+                [*self.faller.members, TileBuilder().add_position(4, 1).add_color(ColumnsColor.RED).construct(ColumnsTile)]
+                )
+
+    def test_members_drop_onto_cells_other_members_leave(self):
+        assert FallerHardDrop((2, 3, 4)).move(self.board, self.faller)
+        assert self.faller.positions == ((4, 2), (4, 3), (4, 4))
+        assert [self.board.tile_at(4, y) for y in (2, 3, 4)] == self.faller.members
+        assert isinstance(self.board.tile_at(4, 5), NullTile)
+        assert self.board.column_height(4) == 4
+
+    def test_cannot_drop_into_occupied_cells(self):
+        assert not FallerHardDrop((1, 2, 3)).move(self.board, self.faller)
+        assert self.faller.positions == ((4, 5), (4, 6), (4, 7))
+
+
+class TestFallerDescentMovement:
+    def setup_method(self):
+        self.faller = ColumnsFaller(descent_file=4)
+        self.board = BoardFactory.create_board(ColumnsBoard, ColumnsBoard.COLUMNS_BOARD_WIDTH, ColumnsBoard.COLUMNS_BOARD_HEIGHT)
+
+    def test_staged_members_enter_the_board_one_at_a_time(self):
+        top = ColumnsBoard.COLUMNS_BOARD_HEIGHT
+        for entered in range(1, 4):
+            assert FallerDescent().move(self.board, self.faller)
+            assert self.faller.positions[:entered] == tuple((4, top - entered + 1 + i) for i in range(entered))
+            assert all(y == top + 1 for _, y in self.faller.positions[entered:])
+        assert self.board.column_height(4) == 3
+
+    def test_positions_follow_the_members_without_being_told(self):
+        for _ in range(5):
+            FallerDescent().move(self.board, self.faller)
+        assert self.faller.positions == tuple((tile.position.x, tile.position.y) for tile in self.faller.members)
+        assert isinstance(self.board.tile_at(4, ColumnsBoard.COLUMNS_BOARD_HEIGHT), NullTile)
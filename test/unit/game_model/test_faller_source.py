@@ -0,0 +1,62 @@
+"""Tests for the faller queue"""
+
+import pytest
+
+from columns_widget.game_model import FallerQueue, ColumnsFaller, CompactFaller, ColumnsColor, ColumnsBoard
+
+def described(faller):
+    return faller.descent_file, tuple(tile.color for tile in faller.members)
+
+class TestFallerQueue:
+    def test_same_seed_gives_same_fallers(self):
+        first, second = FallerQueue(seed=42), FallerQueue(seed=42)
+        assert [described(first.pop()) for _ in range(200)] == [described(second.pop()) for _ in range(200)]
+
+    def test_different_seeds_give_different_fallers(self):
+        first, second = FallerQueue(seed=1), FallerQueue(seed=2)
+        assert [described(first.pop()) for _ in range(20)] != [described(second.pop()) for _ in range(20)]
+
+    @pytest.mark.parametrize('lookahead', [1, 3, 5])
+    def test_lookahead_keeps_upcoming_fallers_ready(self, lookahead):
+        queue = FallerQueue(seed=7, lookahead=lookahead)
+        upcoming = queue.upcoming
+        assert len(upcoming) == lookahead
+        assert queue.peek() is upcoming[0]
+        assert queue.pop() is upcoming[0]
+        assert queue.upcoming[:-1] == upcoming[1:]
+
+    def test_generated_fallers_are_staged_columns_fallers(self):
+        queue = FallerQueue(seed=3)
+        for _ in range(100):
+            faller = queue.pop()
+            assert isinstance(faller, ColumnsFaller)
+            assert 1 <= faller.descent_file <= ColumnsBoard.COLUMNS_BOARD_WIDTH
+            assert all(tile.color in ColumnsColor for tile in faller.members)
+            assert all(tile.position.y == ColumnsFaller.STAGED for tile in faller.members)
+
+    def test_drawn_counts_fallers_taken(self):
+        queue = FallerQueue(seed=3)
+        for _ in range(5):
+            queue.pop()
+        assert queue.drawn == 5
+
+    @pytest.mark.parametrize('drawn', [0, 10, FallerQueue.BATCH - 2, FallerQueue.BATCH * 3])
+    def test_resumed_queue_continues_the_sequence(self, drawn):
+        queue = FallerQueue(seed=11, lookahead=2)
+        for _ in range(drawn):
+            queue.pop()
+        upcoming = tuple((faller.descent_file, faller.codes) for faller in queue.upcoming)
+        resumed = FallerQueue(seed=11, lookahead=2, drawn=drawn, upcoming=upcoming)
+        assert resumed.drawn == drawn
+        assert [described(queue.pop()) for _ in range(150)] == [described(resumed.pop()) for _ in range(150)]
+
+    @pytest.mark.parametrize('faller_type', [ColumnsFaller, CompactFaller])
+    def test_fallers_are_staged_above_the_board_they_fall_onto(self, faller_type):
+        queue = FallerQueue(seed=5, width=200, height=400, faller_type=faller_type)
+        files = set()
+        for _ in range(300):
+            faller = queue.pop()
+            files.add(faller.descent_file)
+            assert min(y for _, y in faller.positions) == 401
+        assert max(files) > ColumnsBoard.COLUMNS_BOARD_WIDTH
+        assert files <= set(range(1, 201))
@@ -0,0 +1,165 @@
+"""Tests for columns matchers"""
+
+import random
+
+import pytest
+
+from tilematch_tools.core import BoardFactory, TileBuilder
+from tilematch_tools.model import NullTile
+from columns_widget.game_model import (ColumnsBoard,
+                                       CompactColumnsBoard,
+                                       ColumnsTile,
+                                       ColumnsColor,
+                                       AbsoluteDescent,
+                                       FullScanMatcher,
+                                       DirtyRegionMatcher,
+                                       BitboardMatcher,
+                                       ThreeFoldNorth,
+                                       ThreeFoldEast,
+                                       ThreeFoldSouth,
+                                       ThreeFoldWest,
+                                       ThreeFoldNorthEast,
+                                       ThreeFoldSouthEast,
+                                       ThreeFoldSouthWest,
+                                       ThreeFoldNorthWest
+                                       )
+
+match_rules = [
+        ThreeFoldNorth,
+        ThreeFoldSouth,
+        ThreeFoldEast,
+        ThreeFoldWest,
+        ThreeFoldNorthWest,
+        ThreeFoldNorthEast,
+        ThreeFoldSouthWest,
+        ThreeFoldSouthEast
+        ]
+
+def random_tiles(rng, count, width=ColumnsBoard.COLUMNS_BOARD_WIDTH, height=ColumnsBoard.COLUMNS_BOARD_HEIGHT):
+    colors = [ColumnsColor.RED, ColumnsColor.BLUE, ColumnsColor.GREEN]
+    positions = rng.sample(
+            [
+                (x, y)
+                for x in range(1, width + 1)
+                for y in range(1, height + 1)
+            ],
+            count
+            )
+    return [
+            TileBuilder().add_position(x, y).add_color(rng.choice(colors)).construct(ColumnsTile)
+            for x, y in positions
+            ]
+
+def located(matcher):
+    return [(type(rule), x, y) for rule, x, y in matcher.locate(match_rules)]
+
+def clear_and_collapse(board, matches):
+    for rule, x, y in matches:
+        for cx, cy in rule.cells(x, y):
+            board.place_tile(NullTile(**{'position': (cx, cy), 'color': '#D3D3D3'}))
+    for tile in list(board):
+        AbsoluteDescent().move(board, tile)
+
+class TestDirtyRegionMatcher:
+    @pytest.mark.parametrize('seed', range(10))
+    def test_dirty_region_matcher_agrees_with_full_scan(self, seed):
+        rng = random.Random(seed)
+        board = BoardFactory.create_board_with_tiles(
+                ColumnsBoard,
+                ColumnsBoard.COLUMNS_BOARD_WIDTH,
+                ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+                random_tiles(rng, 40)
+                )
+        full = FullScanMatcher(board)
+        dirty = DirtyRegionMatcher(board)
+
+        for _ in range(5):
+            expected = located(full)
+            matches = dirty.locate(match_rules)
+            assert [(type(rule), x, y) for rule, x, y in matches] == expected
+            clear_and_collapse(board, matches)
+
+    def test_nothing_changed_means_nothing_to_check(self):
+        board = BoardFactory.create_board(ColumnsBoard, ColumnsBoard.COLUMNS_BOARD_WIDTH, ColumnsBoard.COLUMNS_BOARD_HEIGHT)
+        dirty = DirtyRegionMatcher(board)
+        dirty.locate(match_rules)
+        assert not dirty.changed
+        assert dirty.locate(match_rules) == []
+
+    def test_placed_tiles_are_tracked(self):
+        board = BoardFactory.create_board(ColumnsBoard, ColumnsBoard.COLUMNS_BOARD_WIDTH, ColumnsBoard.COLUMNS_BOARD_HEIGHT)
+        dirty = DirtyRegionMatcher(board)
+        dirty.locate(match_rules)
+        for y in range(1, 4):
+            board.place_tile(TileBuilder().add_position(2, y).add_color(ColumnsColor.RED).construct(ColumnsTile))
+
+        assert dirty.changed == {(2, 1), (2, 2), (2, 3)}
+        assert [(type(rule), x, y) for rule, x, y in dirty.locate(match_rules)] == [
+                (ThreeFoldNorth, 2, 1),
+                (ThreeFoldSouth, 2, 3)
+                ]
+
+
+    @pytest.mark.parametrize('seed', range(10))
+    def test_matches_are_found_until_they_are_cleared(self, seed):
+        board = BoardFactory.create_board_with_tiles(
+                ColumnsBoard,
+                ColumnsBoard.COLUMNS_BOARD_WIDTH,
+                ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+                random_tiles(random.Random(seed), 40)
+                )
+        full = FullScanMatcher(board)
+        dirty = DirtyRegionMatcher(board)
+        expected = located(full)
+        assert located(dirty) == expected
+        assert located(dirty) == expected
+
+    def test_each_rule_set_agrees_with_full_scan(self):
+        board = BoardFactory.create_board_with_tiles(
+                ColumnsBoard,
+                ColumnsBoard.COLUMNS_BOARD_WIDTH,
+                ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+                random_tiles(random.Random(3), 40)
+                )
+        full = FullScanMatcher(board)
+        dirty = DirtyRegionMatcher(board)
+        for rules in ([ThreeFoldNorth], [ThreeFoldEast], match_rules, [ThreeFoldNorth]):
+            assert [(type(rule), x, y) for rule, x, y in dirty.locate(rules)] == \
+                    [(type(rule), x, y) for rule, x, y in full.locate(rules)]
+
+
+class TestBitboardMatcher:
+    @pytest.mark.parametrize('seed, board_type', [
+        (seed, board_type)
+        for seed in range(10)
+        for board_type in (ColumnsBoard, CompactColumnsBoard)
+    ])
+    def test_bitboard_matcher_agrees_with_full_scan(self, seed, board_type):
+        board = BoardFactory.create_board_with_tiles(
+                board_type,
+                ColumnsBoard.COLUMNS_BOARD_WIDTH,
+                ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+                random_tiles(random.Random(seed), 50)
+                )
+        assert located(BitboardMatcher(board)) == located(FullScanMatcher(board))
+
+    @pytest.mark.parametrize('board_type', [ColumnsBoard, CompactColumnsBoard])
+    def test_large_boards_agree_with_full_scan(self, board_type):
+        board = BoardFactory.create_board_with_tiles(board_type, 60, 90, random_tiles(random.Random(11), 2000, 60, 90))
+        expected = located(FullScanMatcher(board))
+        assert located(BitboardMatcher(board)) == expected
+        assert located(DirtyRegionMatcher(board)) == expected
+
+    def test_streaks_do_not_wrap_around_edges(self):
+        tiles = [
+                TileBuilder().add_position(6, 1).add_color(ColumnsColor.RED).construct(ColumnsTile),
+                TileBuilder().add_position(7, 1).add_color(ColumnsColor.RED).construct(ColumnsTile),
+                TileBuilder().add_position(1, 2).add_color(ColumnsColor.RED).construct(ColumnsTile)
+                ]
+        board = BoardFactory.create_board_with_tiles(
+                CompactColumnsBoard,
+                ColumnsBoard.COLUMNS_BOARD_WIDTH,
+                ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+                tiles
+                )
+        assert located(BitboardMatcher(board)) == []
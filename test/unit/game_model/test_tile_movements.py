@@ -6,7 +6,9 @@ from tilematch_tools.core import BoardFactory, TileBuilder
 from tilematch_tools.model import NullTile
 from columns_widget.game_model import (SingleStepDescent,
                                        AbsoluteDescent,
+                                       ColumnGravity,
                                        ColumnsBoard,
+                                       CompactColumnsBoard,
                                        ColumnsTile,
                                        ColumnsColor
                                        )
@@ -65,3 +67,58 @@ class TestColumnsTileMovement:
 
         assert isinstance(self.board.tile_at(x, y), ColumnsTile)
 
+    def test_can_apply_reports_blocked_descents(self, fall):
+        assert fall.can_apply(self.board, self.board.tile_at(4, 4))
+        assert not fall.can_apply(self.board, self.board.tile_at(4, 1))
+        assert not fall.can_apply(self.board, self.board.tile_at(3, 1))
+        self.board.place_tile(TileBuilder().add_position(4, 3).add_color(ColumnsColor.RED).construct(ColumnsTile))
+        assert not fall.can_apply(self.board, self.board.tile_at(4, 4))
+        assert isinstance(self.board.tile_at(4, 4), ColumnsTile)
+
+
+class TestColumnGravity:
+    def setup_method(self):
+        self.init_tiles = [
+                TileBuilder().add_position(2, 1).add_color(ColumnsColor.RED).construct(ColumnsTile),
+                TileBuilder().add_position(2, 4).add_color(ColumnsColor.YELLOW).construct(ColumnsTile),
+                TileBuilder().add_position(2, 9).add_color(ColumnsColor.GREEN).construct(ColumnsTile),
+                TileBuilder().add_position(5, 6).add_color(ColumnsColor.BLUE).construct(ColumnsTile)
+                ]
+
+    @pytest.mark.parametrize('board_type', [ColumnsBoard, CompactColumnsBoard])
+    def test_gravity_compacts_every_column(self, board_type):
+        board = BoardFactory.create_board_with_tiles(
+                board_type,
+                ColumnsBoard.COLUMNS_BOARD_WIDTH,
+                ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+                self.init_tiles
+                )
+        gravity = ColumnGravity()
+        moves = gravity.apply(board)
+
+        assert moves == [((2, 4), (2, 2)), ((2, 9), (2, 3)), ((5, 6), (5, 1))]
+        assert gravity.heights == [0, 3, 0, 0, 1, 0, 0]
+        assert [board.tile_at(2, y).color for y in range(1, 4)] == [ColumnsColor.RED, ColumnsColor.YELLOW, ColumnsColor.GREEN]
+        assert board.tile_at(5, 1).color == ColumnsColor.BLUE
+        assert all(isinstance(board.tile_at(x, y), NullTile) for (x, y), _ in moves)
+
+    def test_settled_board_does_not_move(self):
+        board = BoardFactory.create_board_with_tiles(
+                ColumnsBoard,
+                ColumnsBoard.COLUMNS_BOARD_WIDTH,
+                ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+                self.init_tiles[:1]
+                )
+        assert ColumnGravity().apply(board) == []
+
+    def test_gravity_only_sweeps_the_columns_given(self):
+        board = BoardFactory.create_board_with_tiles(
+                ColumnsBoard,
+                ColumnsBoard.COLUMNS_BOARD_WIDTH,
+                ColumnsBoard.COLUMNS_BOARD_HEIGHT,
+                self.init_tiles
+                )
+        gravity = ColumnGravity()
+        assert gravity.apply(board, {5}) == [((5, 6), (5, 1))]
+        assert gravity.heights == [1]
+        assert board.tile_at(2, 9).color == ColumnsColor.GREEN
@@ -0,0 +1,45 @@
+"""Tests for shared null tiles and tile pools"""
+
+import pytest
+
+from tilematch_tools.model import NullTile
+from columns_widget.game_model import null_tile, TilePool, ColumnsTile, ColumnsColor
+
+class TestNullTile:
+    def test_null_tiles_are_shared_per_position(self):
+        assert null_tile(2, 3) is null_tile(2, 3)
+        assert null_tile(2, 3) is not null_tile(3, 2)
+
+    def test_null_tile_is_at_its_position(self):
+        tile = null_tile(4, 5)
+        assert isinstance(tile, NullTile)
+        assert (tile.position.x, tile.position.y) == (4, 5)
+
+class TestTilePool:
+    def setup_method(self):
+        self.pool = TilePool(ColumnsTile)
+
+    def test_empty_pool_builds_tiles(self):
+        tile = self.pool.acquire(1, 2, ColumnsColor.RED)
+        assert (tile.position.x, tile.position.y, tile.color) == (1, 2, ColumnsColor.RED)
+        assert (self.pool.built, self.pool.reused) == (1, 0)
+
+    def test_released_tiles_are_reused_for_their_color(self):
+        tile = self.pool.acquire(1, 2, ColumnsColor.RED)
+        self.pool.release(tile)
+        assert self.pool.acquire(3, 4, ColumnsColor.BLUE) is not tile
+        reused = self.pool.acquire(5, 6, ColumnsColor.RED)
+        assert reused is tile
+        assert (reused.position.x, reused.position.y) == (5, 6)
+
+    def test_releasing_twice_keeps_one_copy(self):
+        tile = self.pool.acquire(1, 2, ColumnsColor.RED)
+        self.pool.release(tile)
+        self.pool.release(tile)
+        assert self.pool.acquire(1, 1, ColumnsColor.RED) is tile
+        assert self.pool.acquire(1, 1, ColumnsColor.RED) is not tile
+
+    def test_null_tiles_are_not_pooled(self):
+        self.pool.release(null_tile(1, 1))
+        self.pool.acquire(1, 1, ColumnsColor.RED)
+        assert self.pool.reused == 0
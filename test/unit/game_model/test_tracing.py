@@ -0,0 +1,51 @@
+"""Tests for game event tracing"""
+
+import io
+
+import pytest
+
+from columns_widget import ColumnsGameFactory
+from columns_widget.game_model import TRACER, Tracer, TraceKind
+from columns_widget.headless import HeadlessGameLoop
+
+@pytest.fixture
+def tracer():
+    yield TRACER
+    TRACER.disable()
+
+class TestTracer:
+    def test_tracer_is_disabled_by_default(self):
+        assert not Tracer().enabled
+
+    def test_ring_buffer_keeps_the_most_recent_events(self):
+        tracer = Tracer(3)
+        tracer.enable()
+        for i in range(5):
+            tracer.record(TraceKind.MOVE, i)
+        assert [event.seq for event in tracer.events] == [2, 3, 4]
+        assert [event.data for event in tracer.events] == [(2,), (3,), (4,)]
+
+    def test_dump_writes_one_line_per_event(self):
+        tracer = Tracer()
+        tracer.enable()
+        tracer.record(TraceKind.CLEAR, ((1, 1), (1, 2), (1, 3)))
+        tracer.record(TraceKind.FALLER_CYCLE, 0, 1)
+        stream = io.StringIO()
+        tracer.dump(stream)
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 2
+        assert 'clear' in lines[0] and 'faller_cycle' in lines[1]
+
+    def test_game_records_nothing_while_disabled(self, tracer):
+        tracer.enable(16)
+        tracer.disable()
+        HeadlessGameLoop(ColumnsGameFactory.create_state(seed=1)).run(100)
+        assert not tracer.events
+
+    def test_trace_is_dumped_to_sink_at_game_over(self, tracer):
+        sink = io.StringIO()
+        tracer.enable(64, sink)
+        HeadlessGameLoop(ColumnsGameFactory.create_state(seed=1)).run()
+        kinds = {event.kind for event in tracer.events}
+        assert TraceKind.FALLER_CYCLE in kinds and TraceKind.MOVE in kinds
+        assert len(sink.getvalue().splitlines()) == len(tracer.events) == 64
@@ -0,0 +1,32 @@
+"""Tests for batch columns games"""
+
+import io
+import json
+
+from columns_widget.batch import run_batch, play_game, BatchSummary, ResultWriter, GameResult
+
+class TestBatch:
+    def test_results_do_not_depend_on_worker_count(self):
+        seeds = range(6)
+        alone = list(run_batch(seeds, workers=1, max_ticks=300))
+        pooled = list(run_batch(seeds, workers=2, max_ticks=300))
+        assert alone == pooled
+
+    def test_results_come_back_in_seed_order(self):
+        assert [result.seed for result in run_batch([5, 3, 9], workers=2, max_ticks=50)] == [5, 3, 9]
+
+    def test_summary_aggregates_results(self):
+        summary = BatchSummary()
+        summary.add(GameResult(0, 9, 4, 1, 1, 100))
+        summary.add(GameResult(1, 27, 6, 3, 2, 300))
+        stats = summary.statistics()
+        assert summary.count == 2
+        assert stats['points'] == {'mean': 18.0, 'stdev': 9.0, 'min': 9, 'max': 27, 'total': 36}
+
+    def test_results_stream_as_csv_and_jsonl(self):
+        result = play_game(7, max_ticks=50)
+        as_csv, as_jsonl = io.StringIO(), io.StringIO()
+        ResultWriter(as_csv, 'csv').write(result)
+        ResultWriter(as_jsonl, 'jsonl').write(result)
+        assert as_csv.getvalue().splitlines()[0] == ','.join(GameResult._fields)
+        assert GameResult(**json.loads(as_jsonl.getvalue())) == result
@@ -0,0 +1,98 @@
+"""Tests for the batched NumPy backend"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from tilematch_tools.core import BoardFactory
+from columns_widget import ColumnsGameFactory
+from columns_widget.game_model import CompactColumnsBoard, CompactFaller, FallerQueue, FullScanMatcher, ColumnGravity
+from columns_widget.game_model.columns_tile import COLOR_CODES
+from columns_widget.headless import HeadlessGameLoop
+from columns_widget.batched import BatchedColumns, MATCH_RULES, INPUT_CODES, NO_INPUT, find_matches, collapse
+
+CODE_INPUTS = {code: action for action, code in INPUT_CODES.items()}
+
+def random_cells(seed, shape, colors=3):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, colors + 1, size=shape).astype(np.uint8)
+
+def compact_board(cells):
+    board = BoardFactory.create_board(CompactColumnsBoard, cells.shape[1], cells.shape[0])
+    board.load_cells(cells.tobytes())
+    return board
+
+def board_codes(state):
+    board = state.board
+    return np.array([
+        [COLOR_CODES.get(board.tile_at(x, y).color, 0) for x in range(1, board.num_cols + 1)]
+        for y in range(1, board.num_rows + 1)
+        ], dtype=np.uint8)
+
+class TestBatchedRules:
+    @pytest.mark.parametrize('shape', [(13, 7), (5, 3), (2, 9), (30, 40)])
+    def test_find_matches_locates_what_a_full_scan_locates(self, shape):
+        cells = random_cells(sum(shape), (20, *shape))
+        matched, counts = find_matches(cells)
+        for k in range(len(cells)):
+            located = FullScanMatcher(compact_board(cells[k])).locate(list(MATCH_RULES))
+            expected = np.zeros(shape, dtype=bool)
+            for rule, x, y in located:
+                for cx, cy in rule.cells(x, y):
+                    expected[cy - 1, cx - 1] = True
+            assert counts[k] == len(located)
+            assert (matched[k] == expected).all()
+
+    def test_collapse_compacts_like_column_gravity(self):
+        cells = random_cells(1, (20, 13, 7))
+        expected = []
+        for board_cells in cells:
+            board = compact_board(board_cells)
+            ColumnGravity().apply(board)
+            expected.append(np.frombuffer(board.cells.tobytes(), dtype=np.uint8).reshape(board_cells.shape))
+        collapse(cells)
+        assert (cells == np.array(expected)).all()
+
+
+class TestBatchedColumns:
+    @pytest.mark.parametrize('width, height', [(7, 13), (4, 6), (12, 9)])
+    def test_batched_games_play_like_headless_games(self, width, height):
+        seeds = range(8)
+        states = [ColumnsGameFactory.create_state(seed=seed, width=width, height=height) for seed in seeds]
+        loops = [HeadlessGameLoop(state) for state in states]
+        batch = BatchedColumns(seeds, width, height)
+        rng = random.Random(width * height)
+        for _ in range(3_000):
+            actions = [rng.choice([NO_INPUT, *CODE_INPUTS]) for _ in seeds]
+            for loop, action in zip(loops, actions):
+                if action != NO_INPUT:
+                    loop.press(CODE_INPUTS[action])
+                loop.step()
+            batch.step(actions)
+
+        for k, (state, loop) in enumerate(zip(states, loops)):
+            assert (batch.cells[k] == board_codes(state)).all()
+            assert (batch.points[k], batch.fallers_placed[k], batch.gameover[k], batch.ticks[k]) == \
+                    (state.points, state.fallers_placed, state.gameover(), loop.ticks)
+            assert (batch.matches[k], batch.longest_chain[k]) == (loop.matches, loop.longest_chain)
+
+    def test_fallers_are_drawn_like_their_queue_across_batches(self):
+        seeds = (7, 9)
+        batch = BatchedColumns(seeds, 5, 8)
+        queues = [FallerQueue(seed, width=5, faller_type=CompactFaller, height=8) for seed in seeds]
+        games = np.arange(len(seeds))
+        for _ in range(3 * FallerQueue.BATCH):
+            batch._spawn(games)
+            for k, queue in enumerate(queues):
+                faller, upcoming = queue.pop(), queue.peek()
+                assert (batch.faller_files[k], tuple(batch.faller_codes[k])) == (faller.descent_file, faller.codes)
+                assert (batch.next_files[k], tuple(batch.next_codes[k])) == (upcoming.descent_file, upcoming.codes)
+
+    def test_run_stops_once_every_game_is_over(self):
+        batch = BatchedColumns(range(16))
+        steps = batch.run(100_000)
+        assert batch.gameover.all()
+        assert steps == batch.ticks.max()
+        assert not batch.step().any()
@@ -0,0 +1,37 @@
+"""Tests for the benchmark suite"""
+
+import io
+
+import pytest
+
+from columns_widget import bench
+
+def baseline(**medians):
+    return {'machine': {}, 'results': {name: {'median_ns': median} for name, median in medians.items()}}
+
+class TestBench:
+    def test_every_benchmark_runs(self):
+        result = bench.run_benchmarks(bench.benchmarks(matcher='dirty'), rounds=1)
+        assert len(result['results']) == len(bench.benchmarks(matcher='dirty'))
+        assert all(timing['median_ns'] > 0 for timing in result['results'].values())
+
+    def test_only_filters_benchmarks(self):
+        result = bench.run_benchmarks(bench.benchmarks(), rounds=1, only='find_matches')
+        assert result['results'] and all(name.startswith('find_matches') for name in result['results'])
+
+    def test_baseline_round_trips_through_json(self):
+        stream = io.StringIO()
+        bench.save_baseline(baseline(a=10.0), stream)
+        stream.seek(0)
+        assert bench.load_baseline(stream) == baseline(a=10.0)
+
+    def test_compare_flags_slowdowns_beyond_threshold(self):
+        comparisons = bench.compare(baseline(a=100, b=100, c=100), baseline(a=105, b=125, d=1))
+        assert [comparison.name for comparison in comparisons] == ['a', 'b']
+        assert [comparison.name for comparison in bench.regressions(comparisons, 0.10)] == ['b']
+        assert bench.regressions(comparisons, 0.30) == []
+
+    def test_memory_profile_measures_boards_and_fallers(self):
+        profile = bench.memory_profile(10)
+        assert profile['ColumnsFaller'] > 0
+        assert profile['CompactColumnsBoard[dense]'] < profile['ColumnsBoard[dense]']
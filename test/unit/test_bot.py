@@ -0,0 +1,56 @@
+"""Tests for the placement search bot"""
+
+import pytest
+
+from tilematch_tools.core import BoardFactory, TileBuilder
+from columns_widget import ColumnsGameFactory
+from columns_widget.columns import ColumnsGameState
+from columns_widget.game_model import ColumnsBoard, ColumnsScoring, ColumnsTile, ColumnsColor, FallerQueue
+from columns_widget.headless import HeadlessGameLoop
+from columns_widget.bot import PlacementBot, placements, points
+
+@pytest.fixture
+def state():
+    board = BoardFactory.create_board(ColumnsBoard, ColumnsBoard.COLUMNS_BOARD_WIDTH, ColumnsBoard.COLUMNS_BOARD_HEIGHT)
+    for y in (1, 2):
+        board.place_tile(TileBuilder().add_position(7, y).add_color(ColumnsColor.RED).construct(ColumnsTile))
+    queue = FallerQueue(seed=0, upcoming=((4, (1, 2, 3)),))
+    state = ColumnsGameState(board, ColumnsScoring(), fallers=queue)
+    state.cycle_fallers()
+    return state
+
+class TestPlacementBot:
+    def test_placements_skip_rotations_repeating_colors(self, state):
+        assert len(placements(state)) == 3 * ColumnsBoard.COLUMNS_BOARD_WIDTH
+        same = ColumnsGameState(state.board, ColumnsScoring(), fallers=FallerQueue(seed=0, upcoming=((4, (1, 1, 1)),)))
+        same.cycle_fallers()
+        assert len(placements(same)) == ColumnsBoard.COLUMNS_BOARD_WIDTH
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_bot_finds_the_placement_that_scores(self, state, workers):
+        snapshot = state.snapshot()
+        with PlacementBot(heuristics=((points, 1.0),), workers=workers) as bot:
+            placement = bot.decide(state)
+        assert (placement.column, placement.rotation) == (7, 0)
+        assert placement.value > 0
+        assert bot.evaluations == len(placements(state))
+        assert state.snapshot() == snapshot
+
+    def test_deeper_search_scores_more_states(self, state):
+        bot = PlacementBot(plies=2)
+        bot.decide(state)
+        assert bot.evaluations > len(placements(state))
+
+    def test_bot_plays_as_an_input_source(self):
+        state = ColumnsGameFactory.create_state(seed=3)
+        bot = PlacementBot()
+        HeadlessGameLoop(state, input_source=bot).run(300)
+        assert state.fallers_placed > 5
+        assert bot.rate > 0
+
+    def test_bot_reused_for_a_new_game_places_its_first_faller(self):
+        bot = PlacementBot()
+        for _ in range(2):
+            loop = HeadlessGameLoop(ColumnsGameFactory.create_state(seed=3), input_source=bot)
+            loop.step()
+            assert bot(loop)
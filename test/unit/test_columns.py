@@ -0,0 +1,247 @@
+"""Tests for ColumnsGameState"""
+
+import pytest
+
+from tilematch_tools.core import BoardFactory, TileBuilder
+from tilematch_tools.model import NullTile
+from columns_widget import ColumnsGameFactory
+from columns_widget.columns import ColumnsGameState, PhasedLoopLogic, ColumnsPhase
+from columns_widget.headless import HeadlessGameLoop, random_input_source
+from columns_widget.game_model import (ColumnsBoard, ColumnsTile, ColumnsColor, ColumnsScoring, ChainScoring, FallerQueue,
+                                       FullScanMatcher, ThreeFoldNorth, ThreeFoldEast)
+
+def chain_scored(seed):
+    board = BoardFactory.create_board(ColumnsBoard, ColumnsBoard.COLUMNS_BOARD_WIDTH, ColumnsBoard.COLUMNS_BOARD_HEIGHT)
+    return ColumnsGameState(board, ChainScoring(), fallers=FallerQueue(seed=seed))
+
+def stack(state, x, colors):
+    for y, color in enumerate(colors, 1):
+        state.board.place_tile(TileBuilder().add_position(x, y).add_color(color).construct(ColumnsTile))
+
+class TestResolve:
+    @pytest.fixture(params=[{}, {'compact': True}, {'matcher': 'bitboard'}])
+    def state(self, request):
+        return ColumnsGameFactory.create_state(seed=1, **request.param)
+
+    def test_resolving_a_board_without_matches_does_nothing(self, state):
+        stack(state, 1, [ColumnsColor.RED, ColumnsColor.BLUE])
+        resolution = state.resolve()
+        assert not resolution
+        assert resolution.chain_depth == 0
+        assert state.points == 0
+
+    def test_collapse_that_makes_a_match_deepens_the_chain(self, state):
+        stack(state, 1, [ColumnsColor.BLUE, ColumnsColor.RED, ColumnsColor.RED, ColumnsColor.RED,
+                         ColumnsColor.BLUE, ColumnsColor.BLUE])
+        resolution = state.resolve()
+        assert resolution.chain_depth == 2
+        first, second = resolution.steps
+        assert first.cleared == ((1, 2), (1, 3), (1, 4))
+        assert first.moved == (((1, 5), (1, 2)), ((1, 6), (1, 3)))
+        assert second.cleared == ((1, 1), (1, 2), (1, 3))
+        assert second.points == first.points
+        assert resolution.points == state.points == first.points + second.points
+        assert all(isinstance(state.board.tile_at(1, y), NullTile) for y in range(1, 7))
+
+    def test_chain_scoring_multiplies_a_pass_by_its_depth(self):
+        state = chain_scored(seed=1)
+        stack(state, 1, [ColumnsColor.BLUE, ColumnsColor.RED, ColumnsColor.RED, ColumnsColor.RED,
+                         ColumnsColor.BLUE, ColumnsColor.BLUE])
+        first, second = state.resolve().steps
+        assert second.points == 2 * first.points
+        assert state.points == 3 * first.points
+
+    def test_resolution_leaves_no_matches(self, state):
+        stack(state, 2, [ColumnsColor.GREEN] * 4)
+        state.resolve()
+        assert not state.find_matches(state.match_rules)
+
+
+class CountingMatcher(FullScanMatcher):
+    def __init__(self, board):
+        super().__init__(board)
+        self.scans = 0
+
+    def locate(self, match_rules):
+        self.scans += 1
+        return super().locate(match_rules)
+
+
+class TestMemoizedQueries:
+    @pytest.fixture
+    def state(self):
+        board = BoardFactory.create_board(ColumnsBoard, ColumnsBoard.COLUMNS_BOARD_WIDTH, ColumnsBoard.COLUMNS_BOARD_HEIGHT)
+        return ColumnsGameState(board, ColumnsScoring(), CountingMatcher, FallerQueue(seed=1))
+
+    def test_board_is_scanned_again_only_once_it_changes(self, state):
+        stack(state, 1, [ColumnsColor.RED, ColumnsColor.BLUE])
+        assert not state.find_matches(state.match_rules)
+        assert not state.find_matches(state.match_rules)
+        assert not state.resolve()
+        assert state._matcher.scans == 1
+        stack(state, 4, [ColumnsColor.GREEN] * 3)
+        matches = state.find_matches(state.match_rules)
+        assert matches and len(state.find_matches(state.match_rules)) == len(matches)
+        assert state._matcher.scans == 2
+        assert len(state.find_matches(state.match_rules[:1])) == 1
+        assert state._matcher.scans == 3
+
+    @pytest.mark.parametrize('matcher', ['dirty', 'bitboard', 'full'])
+    def test_each_rule_set_agrees_with_a_full_scan_at_one_version(self, matcher):
+        state = ColumnsGameFactory.create_state(seed=1, matcher=matcher)
+        stack(state, 1, [ColumnsColor.GREEN] * 3)
+        for x in (3, 4, 5):
+            stack(state, x, [ColumnsColor.BLUE])
+        full = FullScanMatcher(state.board)
+        version = state.board.version
+        for rules in ([ThreeFoldNorth], [ThreeFoldEast], state.match_rules, [ThreeFoldNorth]):
+            found = [(type(match_rule), x, y) for match_rule, x, y in full.locate(rules)]
+            assert found
+            assert len(state.find_matches(rules)) == len(found)
+            assert [(type(match_rule), x, y) for match_rule, x, y in state._locate(rules)] == found
+        assert state.board.version == version
+
+    def test_landing_row_follows_the_board_and_the_faller(self, state):
+        state.cycle_fallers()
+        file = state.active_faller.descent_file
+        assert state.landing_row() == 1
+        stack(state, file, [ColumnsColor.RED, ColumnsColor.BLUE])
+        assert state.landing_row() == 3
+        state.shift_faller_left() or state.shift_faller_right()
+        assert state.landing_row() == 1
+
+
+class PhasedDriver(PhasedLoopLogic):
+    def __init__(self, state):
+        self.state = state
+
+    def cycle(self):
+        self.tick()
+        self.settle()
+
+    def settle(self):
+        matches = self.find_matches(self.state.match_rules)
+        if matches:
+            self.clear_matches(matches)
+        self.clean_up_state()
+
+class TestPhasedLoopLogic:
+    @pytest.fixture(params=[ColumnsGameFactory.create_state, chain_scored])
+    def new_state(self, request):
+        return request.param
+
+    @pytest.fixture
+    def landed(self, new_state):
+        state = new_state(seed=1)
+        stack(state, 1, [ColumnsColor.BLUE, ColumnsColor.RED, ColumnsColor.RED, ColumnsColor.RED,
+                         ColumnsColor.BLUE, ColumnsColor.BLUE])
+        return state, PhasedDriver(state)
+
+    def test_clearing_and_collapsing_take_a_tick_each(self, landed):
+        state, loop = landed
+        loop.settle()
+        assert state.phase == ColumnsPhase.CLEARING
+        assert sorted(state.cleared) == [(1, 2), (1, 3), (1, 4)]
+        assert isinstance(state.board.tile_at(1, 3), NullTile)
+
+        loop.cycle()
+        assert state.phase == ColumnsPhase.CLEARING
+        assert sorted(state.cleared) == [(1, 1), (1, 2), (1, 3)]
+
+        loop.cycle()
+        assert state.phase == ColumnsPhase.FALLING
+        assert state.active_faller is None
+        assert all(isinstance(state.board.tile_at(1, y), NullTile) for y in range(1, 7))
+
+        loop.cycle()
+        assert state.active_faller is not None
+
+    def test_chains_score_like_resolve(self, new_state, landed):
+        state, loop = landed
+        loop.settle()
+        loop.cycle()
+        loop.cycle()
+        resolved = new_state(seed=1)
+        stack(resolved, 1, [ColumnsColor.BLUE, ColumnsColor.RED, ColumnsColor.RED, ColumnsColor.RED,
+                            ColumnsColor.BLUE, ColumnsColor.BLUE])
+        assert state.points == resolved.resolve().points
+
+    def test_faller_is_not_drawn_while_clearing(self, landed):
+        state, loop = landed
+        loop.settle()
+        loop.cycle()
+        assert state.active_faller is None
+        assert state.fallers.drawn == 0
+
+
+class TestSnapshot:
+    @pytest.fixture(params=[{}, {'compact': True}, {'matcher': 'bitboard', 'lookahead': 3}])
+    def options(self, request):
+        return request.param
+
+    @staticmethod
+    def played(options, ticks):
+        state = ColumnsGameFactory.create_state(seed=2, **options)
+        loop = HeadlessGameLoop(state, input_source=random_input_source(2))
+        loop.run(ticks)
+        return state
+
+    @staticmethod
+    def board(state):
+        return [repr(state.board.tile_at(x, y)) for y in range(1, 14) for x in range(1, 8)]
+
+    def test_snapshot_is_small(self, options):
+        assert len(self.played(options, 200).snapshot()) < 256
+
+    def test_restored_state_matches_the_original(self, options):
+        state = self.played(options, 200)
+        restored = ColumnsGameState.restore(state.snapshot())
+        assert type(restored) is type(state)
+        assert restored.snapshot() == state.snapshot()
+        assert self.board(restored) == self.board(state)
+        assert (restored.points, restored.fallers_placed, restored.gameover()) == \
+                (state.points, state.fallers_placed, state.gameover())
+        assert getattr(restored.active_faller, 'positions', None) == getattr(state.active_faller, 'positions', None)
+
+    def test_chain_scoring_is_restored(self):
+        state = chain_scored(seed=2)
+        HeadlessGameLoop(state, input_source=random_input_source(2)).run(50)
+        restored = ColumnsGameState.restore(state.snapshot())
+        assert isinstance(restored._scoring, ChainScoring)
+        assert restored.snapshot() == state.snapshot()
+        assert not isinstance(ColumnsGameState.restore(self.played({}, 50).snapshot())._scoring, ChainScoring)
+
+    def test_shifted_faller_is_restored_in_its_file(self):
+        state = ColumnsGameFactory.create_state(seed=2)
+        state.cycle_fallers()
+        state.drop_faller()
+        state.shift_faller_left() or state.shift_faller_right()
+        restored = ColumnsGameState.restore(state.snapshot())
+        assert restored.active_faller.positions == state.active_faller.positions
+        assert self.board(restored) == self.board(state)
+
+    def test_restored_state_plays_on_like_the_original(self, options):
+        state = self.played(options, 150)
+        restored = ColumnsGameState.restore(state.snapshot())
+        for each in (state, restored):
+            HeadlessGameLoop(each, input_source=random_input_source(3)).run(500)
+        assert restored.snapshot() == state.snapshot()
+
+    def test_clone_shares_nothing_with_the_original(self, options):
+        state = self.played(options, 100)
+        clone = state.clone()
+        snapshot = state.snapshot()
+        HeadlessGameLoop(clone, input_source=random_input_source(4)).run(100)
+        assert state.snapshot() == snapshot
+
+    def test_truncated_snapshots_are_rejected(self):
+        with pytest.raises(ValueError):
+            ColumnsGameState.restore(self.played({}, 10).snapshot()[:-1])
+
+    @pytest.mark.parametrize('compact', [False, True])
+    def test_boards_wider_and_taller_than_a_byte_round_trip(self, compact):
+        state = ColumnsGameFactory.create_state(seed=5, compact=compact, width=300, height=260)
+        HeadlessGameLoop(state, input_source=random_input_source(5)).run(800)
+        restored = ColumnsGameState.restore(state.snapshot())
+        assert (restored.board.num_cols, restored.board.num_rows, restored.fallers.height) == (300, 260, 260)
+        assert restored.snapshot() == state.snapshot()
@@ -0,0 +1,76 @@
+"""Tests for the vectorized columns environment"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from columns_widget.batched import BatchedColumns, NO_INPUT, HARD_DROP
+from columns_widget.env import ColumnsVectorEnv, ACTIONS, FALLER_FIELDS
+
+HARD_DROP_ACTION = ACTIONS.index(HARD_DROP)
+
+class TestColumnsVectorEnv:
+    def test_step_needs_a_reset(self):
+        with pytest.raises(RuntimeError):
+            ColumnsVectorEnv(2).step([0, 0])
+
+    def test_observations_are_compact_arrays(self):
+        env = ColumnsVectorEnv(4, width=5, height=8)
+        observations, info = env.reset()
+        assert observations['board'].shape == (4, 8, 5) and observations['board'].dtype == np.uint8
+        assert observations['faller'].shape == (4, len(FALLER_FIELDS))
+        assert list(info['seeds']) == [0, 1, 2, 3]
+        observations, *_ = env.step(np.zeros(4, dtype=int))
+        assert (observations['faller'][:, 1] == 9).all()
+
+    def test_hard_drop_lands_where_falling_would(self):
+        dropped, fallen = BatchedColumns(range(6)), BatchedColumns(range(6))
+        dropped.step()
+        dropped.step([HARD_DROP] * 6)
+        assert (dropped.fallers_placed == 1).all()
+        while not (fallen.fallers_placed == 1).all():
+            fallen.step([NO_INPUT] * 6)
+        assert (dropped.cells == fallen.cells).all()
+
+    def test_rewards_add_up_to_the_points_of_each_episode(self):
+        env = ColumnsVectorEnv(16, width=4, height=6)
+        env.reset()
+        returns = np.zeros(16, dtype=np.int64)
+        finished = []
+        for _ in range(2_000):
+            _, rewards, terminated, truncated, info = env.step(env.sample_actions())
+            returns += rewards
+            assert not truncated.any()
+            if info:
+                assert terminated[info['finished']].all()
+                assert (returns[info['finished']] == info['episode_points']).all()
+                returns[info['finished']] = 0
+                finished.extend(info['episode_seeds'])
+        assert env.episodes == len(finished) > 16
+        assert len(set(finished)) == len(finished)
+        assert env.steps == 16 * 2_000
+        assert env.steps_per_second > 0
+
+    def test_restarted_games_play_their_new_seed(self):
+        env = ColumnsVectorEnv(3, seed=10, width=4, height=6)
+        env.reset()
+        while not env.episodes:
+            _, _, _, _, info = env.step([HARD_DROP_ACTION] * 3)
+        game, seed = info['finished'][0], 13
+        fresh = BatchedColumns([seed], 4, 6)
+        for _ in range(4):
+            env.step([HARD_DROP_ACTION] * 3)
+            fresh.step([HARD_DROP])
+        assert (env.batch.cells[game] == fresh.cells[0]).all()
+        assert env.batch.points[game] == fresh.points[0]
+
+    def test_episodes_are_truncated_after_the_tick_limit(self):
+        env = ColumnsVectorEnv(2, max_episode_ticks=5)
+        env.reset()
+        for _ in range(4):
+            _, _, terminated, truncated, _ = env.step([0, 0])
+            assert not truncated.any()
+        _, _, terminated, truncated, info = env.step([0, 0])
+        assert truncated.all() and not terminated.any()
+        assert (info['episode_ticks'] == 5).all()
+        assert (env.batch.ticks == 0).all()
@@ -0,0 +1,87 @@
+"""Tests for the columns view"""
+
+from tilematch_tools.core import TileBuilder
+from tilematch_tools.view.board_view import BoundingBox
+from columns_widget import ColumnsGameFactory
+from columns_widget.columns import PhasedLoopLogic
+from columns_widget.game_model import ColumnsTile, ColumnsColor
+from columns_widget.game_view import CanvasCells, phase_cells, phase_text, CLEARING_FILL, COLLAPSED_OUTLINE
+
+class RecordingCanvas:
+    def __init__(self):
+        self.calls = []
+
+    def create_rectangle(self, *bounds, **options):
+        self.calls.append(('create_rectangle', bounds, options))
+        return len(self.calls)
+
+    def itemconfig(self, item, **options):
+        self.calls.append(('itemconfig', item, options))
+
+class TestCanvasCells:
+    def setup_method(self):
+        self.canvas = RecordingCanvas()
+        self.cells = CanvasCells(self.canvas)
+        self.cells.create((1, 1), BoundingBox(0, 0, 30, 30), 'gray')
+        self.cells.start_frame()
+
+    def test_unchanged_colors_are_not_redrawn(self):
+        assert not self.cells.paint((1, 1), 'gray', 'black')
+        assert self.cells.calls == 0
+        assert len(self.canvas.calls) == 1
+
+    def test_changed_colors_are_drawn_once(self):
+        assert self.cells.paint((1, 1), 'red', 'black')
+        assert not self.cells.paint((1, 1), 'red', 'black')
+        assert self.cells.calls == 1
+        assert self.canvas.calls[-1] == ('itemconfig', 1, {'fill': 'red', 'outline': 'black', 'width': 1})
+
+    def test_each_frame_counts_its_own_calls(self):
+        self.cells.paint((1, 1), 'red', 'black')
+        self.cells.start_frame()
+        self.cells.paint((1, 1), 'blue', 'black')
+        assert self.cells.calls == 1
+
+
+class PhasedDriver(PhasedLoopLogic):
+    def __init__(self, state):
+        self.state = state
+
+    def cycle(self):
+        self.tick()
+        self.settle()
+
+    def settle(self):
+        matches = self.find_matches(self.state.match_rules)
+        if matches:
+            self.clear_matches(matches)
+        self.clean_up_state()
+
+class TestPhaseDrawing:
+    def setup_method(self):
+        self.state = ColumnsGameFactory.create_state(seed=1)
+        colors = [ColumnsColor.BLUE, ColumnsColor.RED, ColumnsColor.RED, ColumnsColor.RED,
+                  ColumnsColor.BLUE, ColumnsColor.BLUE]
+        for y, color in enumerate(colors, 1):
+            self.state.board.place_tile(TileBuilder().add_position(1, y).add_color(color).construct(ColumnsTile))
+        self.loop = PhasedDriver(self.state)
+
+    def test_nothing_is_drawn_for_a_falling_game(self):
+        assert phase_cells(self.state) == {}
+        assert phase_text(self.state) == ''
+
+    def test_cleared_cells_are_drawn_while_clearing(self):
+        self.loop.settle()
+        assert phase_cells(self.state) == {cell: (CLEARING_FILL, 'black') for cell in [(1, 2), (1, 3), (1, 4)]}
+        assert phase_text(self.state) == 'Clearing'
+
+    def test_cells_collapsed_into_are_drawn_while_collapsing(self):
+        self.loop.settle()
+        self.loop.tick()
+        assert phase_cells(self.state) == {
+                (1, 2): (ColumnsColor.BLUE, COLLAPSED_OUTLINE),
+                (1, 3): (ColumnsColor.BLUE, COLLAPSED_OUTLINE)
+                }
+        assert phase_text(self.state) == 'Collapsing'
+        self.loop.settle()
+        assert phase_text(self.state) == 'Clearing x2'
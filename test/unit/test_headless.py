@@ -0,0 +1,111 @@
+"""Tests for headless columns"""
+
+import pytest
+
+from columns_widget import ColumnsGameFactory, ColumnsGame
+from columns_widget.headless import HeadlessGameLoop, ColumnsInput, random_input_source
+
+def play(seed, **options):
+    state = ColumnsGameFactory.create_state(seed=seed, **options)
+    loop = HeadlessGameLoop(state)
+    loop.run(10_000)
+    return state, loop
+
+class TestHeadlessGameLoop:
+    def test_game_runs_until_game_over(self):
+        state, loop = play(1)
+        assert state.gameover()
+        assert not loop.step()
+
+    def test_virtual_clock_advances_one_tick_per_step(self):
+        _, loop = play(2)
+        assert loop.clock.now == loop.ticks * ColumnsGame.TICK
+
+    @pytest.mark.parametrize('options', [{}, {'compact': True}, {'matcher': 'bitboard'}])
+    def test_same_seed_plays_the_same_game(self, options):
+        first, first_loop = play(3, **options)
+        second, second_loop = play(3, **options)
+        assert (first_loop.ticks, first.points, first.fallers_placed) == \
+                (second_loop.ticks, second.points, second.fallers_placed)
+
+    @pytest.mark.parametrize('seed', [7, 8])
+    def test_compact_fallers_play_the_same_game_as_tile_fallers(self, seed):
+        def outcome(compact):
+            state = ColumnsGameFactory.create_state(compact=compact, seed=seed)
+            loop = HeadlessGameLoop(state, input_source=random_input_source(seed))
+            loop.run(10_000)
+            return loop.ticks, state.points, state.fallers_placed, loop.matches, [repr(tile) for tile in state.board]
+        assert outcome(True) == outcome(False)
+
+    def test_game_stops_at_max_ticks(self):
+        state = ColumnsGameFactory.create_state(seed=4)
+        assert HeadlessGameLoop(state).run(5) == 5
+
+    def test_pressed_inputs_move_the_active_faller(self):
+        state = ColumnsGameFactory.create_state(seed=5)
+        loop = HeadlessGameLoop(state)
+        loop.step()
+        start = state.active_faller.descent_file
+        shift, expected = (ColumnsInput.SHIFT_LEFT, start - 1) if start > 1 else (ColumnsInput.SHIFT_RIGHT, start + 1)
+        loop.press(shift)
+        loop.step()
+        assert all(tile.position.x == expected for tile in state.active_faller.members)
+
+    def test_cleared_tiles_are_reused_by_later_fallers(self):
+        state, _ = play(6)
+        assert state.fallers.pool.reused > 0
+
+
+class TestBoardSizes:
+    @pytest.mark.parametrize('compact', [False, True])
+    @pytest.mark.parametrize('width, height', [(3, 4), (12, 5), (9, 30)])
+    def test_game_over_follows_the_board_height(self, compact, width, height):
+        state, loop = play(9, compact=compact, width=width, height=height)
+        assert state.gameover()
+        assert 1 <= state.prev_faller.descent_file <= width
+        assert max(y for _, y in state.prev_faller.positions) > height
+        assert all(y <= height for _, y in state.board.occupied)
+
+    @pytest.mark.parametrize('compact', [False, True])
+    def test_stress_sized_board_stays_playable(self, compact):
+        state = ColumnsGameFactory.create_state(seed=10, compact=compact, matcher='bitboard', width=200, height=400)
+        loop = HeadlessGameLoop(state, input_source=random_input_source(10))
+        loop.run(5_000)
+        assert not state.gameover()
+        assert state.fallers_placed >= 5
+        assert all(1 <= x <= 200 and 1 <= y <= 400 for x, y in state.board.occupied)
+        assert any(y == 1 for _, y in state.board.occupied)
+
+
+class TestHardDrop:
+    @pytest.mark.parametrize('compact', [False, True])
+    def test_hard_dropped_faller_lands_where_falling_lands_it(self, compact):
+        dropped = ColumnsGameFactory.create_state(seed=11, compact=compact)
+        fallen = ColumnsGameFactory.create_state(seed=11, compact=compact)
+        dropped_loop, fallen_loop = HeadlessGameLoop(dropped), HeadlessGameLoop(fallen)
+        for _ in range(4):
+            dropped_loop.step()
+            dropped_loop.press(ColumnsInput.HARD_DROP)
+            dropped_loop.step()
+            placed = fallen.fallers_placed
+            while fallen.fallers_placed == placed:
+                fallen_loop.step()
+            fallen_loop.step()
+        assert dropped.fallers_placed == fallen.fallers_placed == 4
+        assert [repr(tile) for tile in dropped.board] == [repr(tile) for tile in fallen.board]
+
+    @pytest.mark.parametrize('compact', [False, True])
+    def test_landing_preview_shows_where_the_faller_lands(self, compact):
+        state = ColumnsGameFactory.create_state(seed=12, compact=compact)
+        loop = HeadlessGameLoop(state)
+        loop.step()
+        loop.step()
+        faller = state.active_faller
+        assert state.landing_row() == 1
+        assert state.landing_preview == tuple(
+                ((faller.descent_file, y), color) for y, color in zip((1, 2, 3), faller.colors)
+                )
+        assert state.hard_drop_faller()
+        assert not state.hard_drop_faller()
+        assert state.landing_preview == ()
+        assert not state.faller_can_fall()
@@ -0,0 +1,65 @@
+"""Tests for game metrics"""
+
+import pytest
+
+from columns_widget import ColumnsGameFactory
+from columns_widget.headless import HeadlessGameLoop, ColumnsInput
+from columns_widget.metrics import Histogram, MetricsRegistry, METRICS
+
+class TestHistogram:
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram((1, 2))
+        for value in (0.5, 1, 1.5, 3):
+            histogram.observe(value)
+        assert histogram.buckets == ((1, 2), (2, 3), (float('inf'), 4))
+        assert histogram.count == 4
+        assert histogram.sum == 6
+
+class TestGameMetrics:
+    @pytest.fixture
+    def played(self):
+        registry = MetricsRegistry()
+        loop = HeadlessGameLoop(ColumnsGameFactory.create_state(seed=1))
+        metrics = registry.track(loop)
+        loop.run(4)
+        loop.press(*[ColumnsInput.SHIFT_LEFT] * 8)
+        loop.run()
+        return registry, loop, metrics
+
+    def test_every_tick_is_timed(self, played):
+        _, loop, metrics = played
+        assert metrics.phases['tick'].count == loop.ticks
+
+    def test_board_operations_are_counted(self, played):
+        _, _, metrics = played
+        assert metrics.operations['tile_at'] > 0
+        assert metrics.operations['place_tile'] > 0
+
+    def test_only_moves_of_a_faller_the_board_rejects_are_counted(self):
+        loop = HeadlessGameLoop(ColumnsGameFactory.create_state(seed=1))
+        metrics = MetricsRegistry().track(loop)
+        loop.press(ColumnsInput.SHIFT_LEFT, ColumnsInput.ROTATE_UP)
+        loop.step()
+        assert metrics.operations['rejected_move'] == 0
+        steps = loop.state.active_faller.descent_file - 1
+        loop.press(*[ColumnsInput.SHIFT_LEFT] * (steps + 3))
+        loop.step()
+        assert metrics.operations['rejected_move'] == 3
+
+    def test_export_is_prometheus_text(self, played):
+        registry, _, metrics = played
+        exposition = registry.export()
+        assert '# TYPE columns_phase_seconds histogram' in exposition
+        assert f'columns_phase_seconds_count{{game="game1",phase="tick"}} {metrics.phases["tick"].count}' in exposition
+        assert 'columns_phase_seconds_bucket{game="game1",phase="tick",le="+Inf"}' in exposition
+        assert 'columns_board_operations_total{game="game1",operation="rejected_move"}' in exposition
+
+    def test_textfile_holds_the_export(self, played, tmp_path):
+        registry, _, _ = played
+        path = tmp_path / 'columns.prom'
+        registry.write_textfile(str(path))
+        assert path.read_text() == registry.export()
+
+    def test_games_are_not_tracked_unless_enabled(self):
+        HeadlessGameLoop(ColumnsGameFactory.create_state(seed=1))
+        assert not METRICS.enabled and not METRICS.games
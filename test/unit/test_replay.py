@@ -0,0 +1,90 @@
+"""Tests for replay logs"""
+
+import pytest
+
+from columns_widget import ColumnsGameFactory
+from columns_widget.headless import HeadlessGameLoop, PhasedHeadlessGameLoop, ColumnsInput, random_input_source
+from columns_widget.recording import LogWriter, GameRecorder
+from columns_widget.columns import ColumnsGameState
+from columns_widget.replay import read_log, play_back, ReplayGameLoop
+
+def record(path, loop_type = HeadlessGameLoop, ticks = 2000, **options):
+    state = ColumnsGameFactory.create_state(seed=5, **options)
+    loop = loop_type(state, input_source=random_input_source(5))
+    writer = LogWriter(open(path, 'wb'), state, loop_type is PhasedHeadlessGameLoop)
+    writer.attach(loop)
+    loop.run(ticks)
+    writer.end()
+    with open(path, 'rb') as log:
+        return loop, read_log(log)
+
+class KeylessView:
+    def bind_key(self, key, event):
+        pass
+
+def watch(log, ticks):
+    loop = ReplayGameLoop(ColumnsGameState.restore(log.snapshot), KeylessView(), 0, log.events, log.phased)
+    while loop.ticks < ticks and not loop.state.gameover():
+        loop.tick()
+        matches = loop.find_matches(loop.state.match_rules)
+        loop.clear_matches(matches)
+        loop.clean_up_state()
+    return loop
+
+class TestReplay:
+    @pytest.mark.parametrize('loop_type, options', [
+        (HeadlessGameLoop, {}),
+        (HeadlessGameLoop, {'compact': True}),
+        (PhasedHeadlessGameLoop, {})
+        ])
+    def test_log_plays_back_to_the_same_final_state(self, tmp_path, loop_type, options):
+        loop, log = record(tmp_path / 'game.clog', loop_type, **options)
+        replayed = play_back(log)
+        assert type(replayed) is loop_type
+        assert replayed.ticks == loop.ticks == log.end
+        assert replayed.state.snapshot() == loop.state.snapshot()
+        assert play_back(log).state.snapshot() == replayed.state.snapshot()
+
+    @pytest.mark.parametrize('loop_type, options', [
+        (HeadlessGameLoop, {}),
+        (HeadlessGameLoop, {'compact': True}),
+        (PhasedHeadlessGameLoop, {})
+        ])
+    def test_log_watched_in_real_time_reaches_the_same_final_state(self, tmp_path, loop_type, options):
+        loop, log = record(tmp_path / 'game.clog', loop_type, **options)
+        watched = watch(log, log.end)
+        assert watched.ticks == loop.ticks
+        assert watched.state.snapshot() == loop.state.snapshot()
+
+    def test_log_holds_every_input_with_its_tick(self, tmp_path):
+        loop, log = record(tmp_path / 'game.clog', ticks=50)
+        assert [tick for tick, _ in log.events] == list(range(50))
+        assert all(action in ColumnsInput for _, action in log.events)
+        assert log.end == 50
+
+    def test_log_cut_short_keeps_its_whole_events(self, tmp_path):
+        path = tmp_path / 'game.clog'
+        _, log = record(path, ticks=50)
+        path.write_bytes(path.read_bytes()[:-8])
+        with open(path, 'rb') as cut:
+            cut_log = read_log(cut)
+        assert cut_log.end is None
+        assert cut_log.events == log.events[:-1]
+
+    def test_other_files_are_rejected(self, tmp_path):
+        path = tmp_path / 'game.clog'
+        path.write_bytes(b'not a log at all')
+        with pytest.raises(ValueError):
+            with open(path, 'rb') as log:
+                read_log(log)
+
+    def test_recorder_writes_a_log_per_game(self, tmp_path):
+        recorder = GameRecorder()
+        recorder.enable(tmp_path)
+        for seed in (1, 2):
+            loop = HeadlessGameLoop(ColumnsGameFactory.create_state(seed=seed))
+            recorder.record(loop)
+            loop.run(20)
+        recorder.close()
+        assert len(list(tmp_path.glob('*' + GameRecorder.SUFFIX))) == 2
+        assert all(writer.ended for writer in recorder.writers)